@@ -8,6 +8,7 @@
 from .materials import *
 from .elements import *
 from .rotor import *
+from .cache import *
 
 # TODO add setup.py
 
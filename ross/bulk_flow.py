@@ -0,0 +1,643 @@
+"""Bulk-flow gas seals.
+
+This module calculates the leakage and the frequency dependent stiffness
+and damping coefficients of annular gas seals (smooth or with honeycomb /
+hole-pattern stators) with the isothermal bulk-flow model of Kleynhans and
+Childs. The film is described by the axial and circumferential velocities
+(u, w) and the pressure p averaged across the clearance h:
+
+.. math::
+
+    \\frac{\\partial}{\\partial t}\\left[\\rho (h + H_d)\\right] +
+    \\frac{\\partial (\\rho u h)}{\\partial z} +
+    \\frac{1}{R}\\frac{\\partial (\\rho w h)}{\\partial \\theta} = 0
+
+    \\rho h \\frac{D u}{D t} = -h \\frac{\\partial p}{\\partial z} - \\tau_z
+
+    \\rho h \\frac{D w}{D t} = -\\frac{h}{R}
+    \\frac{\\partial p}{\\partial \\theta} - \\tau_\\theta
+
+with the density of an ideal gas at the reservoir temperature, the
+effective cell depth of the stator H_d = cell_vol_to_area_ratio / gamma
+(the convention of IsotSealElement.effective_acoustic_velocity) and the
+wall shear stresses of the Hirs turbulence model (f = n Re^m on the
+stator and on the rotor).
+
+The zeroth order (centered) solution is found by shooting on the leakage.
+The first order equations for a circular whirl of the rotor are linear
+ordinary differential equations in z, which are integrated for all speeds
+and whirl frequencies at once. The swirl makes both problems stiff at low
+leakage, so the steps are exponential integrators with a fixed step.
+"""
+import numpy as np
+from scipy.linalg import expm
+
+from ross.cache import content_hash
+from ross.elements import IsotSealElement
+
+__all__ = ['BulkFlowSeal']
+
+Rg = 8.3144598  # joule / (kelvin mole)
+
+# factor from the SI unit to the unit used by IsotSealElement
+element_units = {
+    'seal_diameter': 1e3,  # mm
+    'seal_length': 1e3,  # mm
+    'inlet_clearance': 1e3,  # mm
+    'exit_clearance': 1e3,  # mm
+    'cell_vol_to_area_ratio': 1e3,  # mm
+    'p_supply': 1e-5,  # bar
+    'p_exit': 1e-5,  # bar
+}
+parameters = [
+    'seal_diameter', 'seal_length', 'inlet_clearance', 'exit_clearance',
+    'p_supply', 'p_exit', 'reservoir_temperature', 'molecular_weight',
+    'absolute_viscosity', 'compressibility_factor', 'cell_vol_to_area_ratio',
+    'inlet_preswirl_ratio', 'entrance_loss_coefficient',
+    'exit_recovery_factor', 'turbulence_coef_ns', 'turbulence_coef_ms',
+    'turbulence_coef_nr', 'turbulence_coef_mr', 'number_integr_steps',
+    'tolerance_percentage',
+]
+
+
+class BulkFlowSeal:
+    """Annular gas seal solved with the isothermal bulk-flow model.
+
+    The parameters have the names of the IsotSealElement attributes, but
+    in SI units (see from_element).
+
+    Parameters
+    ----------
+    seal_diameter, seal_length : float
+        Rotor diameter and seal length (m).
+    inlet_clearance, exit_clearance : float
+        Radial clearance at the inlet and exit (m), linearly tapered.
+    p_supply, p_exit : float
+        Reservoir and sump pressures (Pa).
+    reservoir_temperature : float
+        Gas temperature (C).
+    molecular_weight : float
+        Gas molecular weight (g/mol).
+    absolute_viscosity : float
+        Gas viscosity (Pa.s).
+    compressibility_factor : float, optional
+        Default is 1.
+    cell_vol_to_area_ratio : float, optional
+        Cell volume per unit area of a honeycomb or hole-pattern stator (m).
+        Default is 0 (smooth seal).
+    inlet_preswirl_ratio : float, optional
+        Circumferential velocity at the inlet as a fraction of the rotor
+        surface velocity. Default is 0.
+    entrance_loss_coefficient : float, optional
+        Default is 0.1.
+    exit_recovery_factor : float, optional
+        Fraction of the exit dynamic pressure recovered. Default is 0.
+    turbulence_coef_ns, turbulence_coef_ms : float, optional
+        Hirs coefficients of the stator (f = ns Re^ms).
+        Defaults are 0.079 and -0.25 (Blasius).
+    turbulence_coef_nr, turbulence_coef_mr : float, optional
+        Hirs coefficients of the rotor. Defaults are 0.079 and -0.25.
+    number_integr_steps : int, optional
+        Number of integration steps along the seal. Default is 100.
+    tolerance_percentage : float, optional
+        Tolerance of the leakage iteration (%). Default is 1e-4.
+    gamma : float, optional
+        The cells store gas as a layer with the effective depth
+        cell_vol_to_area_ratio / gamma, as in
+        IsotSealElement.effective_acoustic_velocity. Default is 0.69.
+    cache : ross.ResultsCache, optional
+        Cache used to store the results for each speed, keyed on the seal
+        parameters and whirl frequencies. Default is None.
+
+    Examples
+    --------
+    >>> seal = BulkFlowSeal(seal_diameter=0.1143, seal_length=0.0857,
+    ...                     inlet_clearance=0.2e-3, exit_clearance=0.2e-3,
+    ...                     p_supply=70e5, p_exit=35e5,
+    ...                     reservoir_temperature=17.8, molecular_weight=28.96,
+    ...                     absolute_viscosity=1.8e-5,
+    ...                     cell_vol_to_area_ratio=1.6e-3,
+    ...                     inlet_preswirl_ratio=0.5)
+    >>> coefficients = seal.coefficients([1000, 2000])
+    >>> coefficients['kxx'].shape
+    (2, 1)
+    >>> bool((coefficients['cxx'] > 0).all())
+    True
+    """
+
+    def __init__(self, seal_diameter, seal_length, inlet_clearance,
+                 exit_clearance, p_supply, p_exit, reservoir_temperature,
+                 molecular_weight, absolute_viscosity, compressibility_factor=1,
+                 cell_vol_to_area_ratio=0, inlet_preswirl_ratio=0,
+                 entrance_loss_coefficient=0.1, exit_recovery_factor=0,
+                 turbulence_coef_ns=0.079, turbulence_coef_ms=-0.25,
+                 turbulence_coef_nr=0.079, turbulence_coef_mr=-0.25,
+                 number_integr_steps=100, tolerance_percentage=1e-4,
+                 gamma=0.69, cache=None):
+        if not p_supply > p_exit > 0:
+            raise ValueError('The supply pressure must be higher than the '
+                             'exit pressure.')
+
+        self.seal_diameter = seal_diameter
+        self.seal_length = seal_length
+        self.inlet_clearance = inlet_clearance
+        self.exit_clearance = exit_clearance
+        self.p_supply = p_supply
+        self.p_exit = p_exit
+        self.reservoir_temperature = reservoir_temperature
+        self.molecular_weight = molecular_weight
+        self.absolute_viscosity = absolute_viscosity
+        self.compressibility_factor = compressibility_factor
+        self.cell_vol_to_area_ratio = cell_vol_to_area_ratio
+        self.gamma = gamma
+        self.inlet_preswirl_ratio = inlet_preswirl_ratio
+        self.entrance_loss_coefficient = entrance_loss_coefficient
+        self.exit_recovery_factor = exit_recovery_factor
+        self.turbulence_coef_ns = turbulence_coef_ns
+        self.turbulence_coef_ms = turbulence_coef_ms
+        self.turbulence_coef_nr = turbulence_coef_nr
+        self.turbulence_coef_mr = turbulence_coef_mr
+        self.number_integr_steps = int(number_integr_steps)
+        self.tolerance_percentage = tolerance_percentage
+        self.cache = cache
+
+    def __repr__(self):
+        return (f'{self.__class__.__name__}('
+                f'seal_diameter={self.seal_diameter}, '
+                f'seal_length={self.seal_length}, '
+                f'inlet_clearance={self.inlet_clearance}, '
+                f'p_supply={self.p_supply}, p_exit={self.p_exit})')
+
+    @classmethod
+    def from_element(cls, seal, cache=None):
+        """Seal with the physical parameters of an IsotSealElement.
+
+        The element parameters are in the units of the XLTRC (ISOTSEAL)
+        input: lengths in mm, pressures in bar, temperature in C and
+        molecular weight in g/mol. Parameters that are None in the element
+        get the default values.
+
+        Parameters
+        ----------
+        seal : ross.elements.IsotSealElement
+        cache : ross.ResultsCache, optional
+
+        Returns
+        -------
+        seal : BulkFlowSeal
+        """
+        kwargs = {}
+        for parameter in parameters:
+            value = getattr(seal, parameter)
+            if value is not None:
+                kwargs[parameter] = value / element_units.get(parameter, 1)
+
+        return cls(cache=cache, **kwargs)
+
+    def model_hash(self):
+        """Content hash of the seal used as a key by the cache."""
+        return content_hash(self.__class__.__name__,
+                            {p: getattr(self, p)
+                             for p in parameters + ['gamma']})
+
+    @property
+    def _a2(self):
+        """Square of the isothermal speed of sound (p / rho)."""
+        T = self.reservoir_temperature + 273.15
+        return (self.compressibility_factor * Rg * T
+                / (self.molecular_weight / 1000))
+
+    def _clearance(self, z):
+        L = self.seal_length
+        h = self.inlet_clearance + (self.exit_clearance
+                                    - self.inlet_clearance) * z / L
+        return h, (self.exit_clearance - self.inlet_clearance) / L
+
+    def _shear(self, p, u, w, h, speed):
+        """Wall shear stresses and their derivatives.
+
+        Returns the stresses (tau_z, tau_theta) and their derivatives with
+        respect to p, u, w and h.
+        """
+        mu = self.absolute_viscosity
+        rho = p / self._a2
+        wr = w - speed * self.seal_diameter / 2
+        us = np.sqrt(u ** 2 + w ** 2)
+        ur = np.sqrt(u ** 2 + wr ** 2)
+
+        # sigma = rho f U / 2, with f = n (2 h rho U / mu) ** m
+        ns, ms = self.turbulence_coef_ns, self.turbulence_coef_ms
+        nr, mr = self.turbulence_coef_nr, self.turbulence_coef_mr
+        ss = ns / 2 * rho * us * (2 * h * rho * us / mu) ** ms
+        sr = nr / 2 * rho * ur * (2 * h * rho * ur / mu) ** mr
+        ds = {'p': ss * (1 + ms) / p, 'u': ss * (1 + ms) * u / us ** 2,
+              'w': ss * (1 + ms) * w / us ** 2, 'h': ss * ms / h}
+        dr = {'p': sr * (1 + mr) / p, 'u': sr * (1 + mr) * u / ur ** 2,
+              'w': sr * (1 + mr) * wr / ur ** 2, 'h': sr * mr / h}
+
+        tau_z = u * (ss + sr)
+        tau_t = ss * w + sr * wr
+        dtau_z = {q: u * (ds[q] + dr[q]) for q in 'puwh'}
+        dtau_t = {q: w * ds[q] + wr * dr[q] for q in 'puwh'}
+        dtau_z['u'] = dtau_z['u'] + ss + sr
+        dtau_t['w'] = dtau_t['w'] + ss + sr
+
+        return tau_z, tau_t, dtau_z, dtau_t
+
+    def _zeroth_derivatives(self, z, p, w, m, speed):
+        """Derivatives dp/dz and dw/dz of the centered seal."""
+        a2 = self._a2
+        h, dh = self._clearance(z)
+        rho = p / a2
+        u = m / (rho * h)
+        tau_z, tau_t, _, _ = self._shear(p, u, w, h, speed)
+
+        dp = -(tau_z - rho * u ** 2 * dh) / (h * (1 - u ** 2 / a2))
+        dw = -tau_t / m
+        # the flow chokes (nan) if any stage of the integration is sonic
+        dp = np.where((p > 0) & (u ** 2 < a2), dp, np.nan)
+
+        return dp, dw
+
+    def _swirl_rate(self, z, p, w, m, speed):
+        """Decay rate of the swirl, minus d(dw/dz)/dw."""
+        h, _ = self._clearance(z)
+        u = m * self._a2 / (p * h)
+        _, _, _, dtau_t = self._shear(p, u, w, h, speed)
+        return dtau_t['w'] / m
+
+    def _integrate_zeroth(self, m, speed):
+        """Zeroth order solution at 2 * number_integr_steps + 1 nodes.
+
+        m and speed are arrays with the mass flow per unit circumference
+        and the speed. Returns z, p and w (nodes first), and a mask that is
+        False where the flow chokes in the seal.
+
+        The swirl relaxes to its equilibrium within a length m / (d tau_t /
+        dw), which is much shorter than a step at low leakage, so each step
+        is an exponential Runge-Kutta step (ETDRK4, Cox and Matthews) with
+        the linearized swirl decay integrated exactly. It is the classical
+        Runge-Kutta step for the pressure.
+        """
+        a2 = self._a2
+        xi = self.entrance_loss_coefficient
+        n = 2 * self.number_integr_steps
+        z = np.linspace(0, self.seal_length, n + 1)
+        dz = z[1]
+
+        # entrance loss p_supply - p = (1 + xi) rho u ** 2 / 2
+        h0 = self.inlet_clearance
+        discriminant = self.p_supply ** 2 - 2 * (1 + xi) * m ** 2 * a2 / h0 ** 2
+        valid = discriminant >= 0
+        p = (self.p_supply + np.sqrt(np.where(valid, discriminant, 0))) / 2
+        w = np.broadcast_to(self.inlet_preswirl_ratio * speed
+                            * self.seal_diameter / 2, p.shape)
+        y = np.stack([p, w])
+
+        # contour integrals avoid the cancellation of the phi functions
+        # for small steps (Kassam and Trefethen)
+        r = np.exp(1j * np.pi * (np.arange(1, 33) - 0.5) / 32)
+
+        def phi(f, x):
+            return dz * f(x[..., None] + r).mean(-1).real
+
+        P = np.empty((n + 1,) + p.shape)
+        W = np.empty((n + 1,) + p.shape)
+        P[0], W[0] = p, w
+        with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+            for i in range(n):
+                L = np.stack([np.zeros_like(p),
+                              -self._swirl_rate(z[i], *y, m, speed)])
+                x = L * dz
+                E, E2 = np.exp(x), np.exp(x / 2)
+                Q = phi(lambda x: (np.exp(x / 2) - 1) / x, x)
+                f1 = phi(lambda x: (-4 - x + np.exp(x) * (4 - 3 * x + x ** 2))
+                         / x ** 3, x)
+                f2 = phi(lambda x: (2 + x + np.exp(x) * (x - 2)) / x ** 3, x)
+                f3 = phi(lambda x: (-4 - 3 * x - x ** 2 + np.exp(x) * (4 - x))
+                         / x ** 3, x)
+
+                def nonlinear(z, y):
+                    return (np.stack(self._zeroth_derivatives(z, *y, m, speed))
+                            - L * y)
+
+                Ny = nonlinear(z[i], y)
+                a = E2 * y + Q * Ny
+                Na = nonlinear(z[i] + dz / 2, a)
+                b = E2 * y + Q * Na
+                Nb = nonlinear(z[i] + dz / 2, b)
+                c = E2 * a + Q * (2 * Nb - Ny)
+                Nc = nonlinear(z[i + 1], c)
+                y = E * y + f1 * Ny + 2 * f2 * (Na + Nb) + f3 * Nc
+                p, w = y
+
+                h, _ = self._clearance(z[i + 1])
+                u2 = (m * a2 / (p * h)) ** 2
+                valid &= np.isfinite(p) & (p > 0) & (u2 < a2)
+                P[i + 1], W[i + 1] = p, w
+
+        return z, P, W, valid
+
+    def _exit_residual(self, z, P, m):
+        """Exit pressure with the recovery minus the sump pressure."""
+        a2 = self._a2
+        p = P[-1]
+        h, _ = self._clearance(z[-1])
+        rho = p / a2
+        u = m / (rho * h)
+        return p + self.exit_recovery_factor * rho * u ** 2 / 2 - self.p_exit
+
+    def _zeroth(self, speeds, max_iter=100):
+        """Centered seal solution for each speed.
+
+        The leakage is found for all speeds at once by false position
+        (Illinois), with bisection while the higher leakage chokes the flow.
+        A higher leakage gives a lower exit pressure.
+        """
+        a2 = self._a2
+        xi = self.entrance_loss_coefficient
+        tol = self.tolerance_percentage / 100
+        dp = self.p_supply - self.p_exit
+
+        # highest leakage with a real inlet pressure
+        m_max = self.p_supply * self.inlet_clearance / np.sqrt(2 * (1 + xi) * a2)
+        lower, f_lower = np.zeros_like(speeds), np.full_like(speeds, dp)
+        upper, f_upper = np.full_like(speeds, m_max), np.full_like(speeds, np.nan)
+        side = np.zeros(speeds.shape, dtype=int)
+        for _ in range(max_iter):
+            with np.errstate(invalid='ignore', divide='ignore'):
+                m = (lower * f_upper - upper * f_lower) / (f_upper - f_lower)
+            m = np.where(np.isfinite(m) & (m > lower) & (m < upper), m,
+                         (lower + upper) / 2)
+            z, P, W, valid = self._integrate_zeroth(m, speeds)
+            f = np.where(valid, self._exit_residual(z, P, m), np.nan)
+            if ((abs(f) <= tol * dp) | ((upper - lower) <= tol * upper)).all():
+                break
+
+            high = f > 0
+            # halve the residual of an end point kept twice
+            f_upper = np.where(high & (side == 1), f_upper / 2, f_upper)
+            f_lower = np.where(~high & (side == -1), f_lower / 2, f_lower)
+            side = np.where(high, 1, -1)
+            lower, f_lower = np.where(high, m, lower), np.where(high, f, f_lower)
+            upper, f_upper = np.where(high, upper, m), np.where(high, f_upper, f)
+        else:
+            raise ValueError(f'The leakage did not converge in {max_iter} '
+                             f'iterations.')
+
+        m = np.where(np.isfinite(f), m, lower)
+        z, P, W, valid = self._integrate_zeroth(m, speeds)
+        residual = self._exit_residual(z, P, m)
+        if not (abs(residual) <= 1e-3 * dp).all():
+            h, _ = self._clearance(z[:, None])
+            mach = (m * np.sqrt(a2) / (P * h)).max(0)
+            if (mach[abs(residual) > 1e-3 * dp] > 0.9).any():
+                raise ValueError('The flow is choked at the seal exit, which '
+                                 'is not supported by the model.')
+            raise ValueError('The exit pressure did not converge to the '
+                             'sump pressure.')
+
+        return z, P, W, m
+
+    def _first(self, speeds, frequencies):
+        """Leakage and rotordynamic impedance for each speed and frequency.
+
+        The rotor whirls in a circular orbit with radius r and frequency
+        Omega (positive for forward whirl), so h = h0 - r cos(theta - Omega t)
+        and the first order variables are q1(z) exp(i (theta - Omega t)).
+        Returns the results of the zeroth order and the impedance
+        D = -(Fx + i Fy) / r with shape (speeds, frequencies).
+        """
+        a2 = self._a2
+        R = self.seal_diameter / 2
+        # effective depth of the gas stored in the cells
+        Hd = self.cell_vol_to_area_ratio / self.gamma
+        xi = self.entrance_loss_coefficient
+        recovery = self.exit_recovery_factor
+
+        z, P, W, m = self._zeroth(speeds)
+        h, dh = self._clearance(z[:, None])
+        rho = P / a2
+        U = m / (rho * h)
+        dP, dW = self._zeroth_derivatives(z[:, None], P, W, m, speeds)
+        drho = dP / a2
+        dU = -U * (dP / P + dh / h)
+        tau_z, tau_t, dtau_z, dtau_t = self._shear(P, U, W, h, speeds)
+
+        # nodes, speeds, frequencies
+        p, w, u, rho, drho, dp, dw, du, h = [
+            x[:, :, None] for x in (P, W, U, rho, drho, dP, dW, dU, h)]
+        dtau_z = {q: v[:, :, None] for q, v in dtau_z.items()}
+        dtau_t = {q: v[:, :, None] for q, v in dtau_t.items()}
+        Omega = frequencies[None]
+        gamma = 1j * (w / R - Omega)
+        h1 = -1
+
+        # M q1' = N q1 + b, with q1 = (p1, u1, w1) and rho1 = p1 / a2
+        zero = np.zeros_like(gamma)
+        M = np.stack([
+            np.stack(np.broadcast_arrays(u * h / a2, rho * h, 0 * h), -1),
+            np.stack(np.broadcast_arrays(h, rho * h * u, 0 * h), -1),
+            np.stack(np.broadcast_arrays(0 * h, 0 * h, rho * h * u), -1),
+        ], -2)
+        N = -np.stack([
+            np.stack([(du * h + u * dh) / a2
+                      + 1j * (w / R - Omega) * h / a2 - 1j * Omega * Hd / a2,
+                      zero + drho * h + rho * dh,
+                      zero + 1j * rho * h / R], -1),
+            np.stack([zero + h * u * du / a2 + dtau_z['p'],
+                      rho * h * (gamma + du) + dtau_z['u'],
+                      zero + dtau_z['w']], -1),
+            np.stack([zero + h * u * dw / a2 + 1j * h / R + dtau_t['p'],
+                      zero + rho * h * dw + dtau_t['u'],
+                      rho * h * gamma + dtau_t['w']], -1),
+        ], -2)
+        b = -h1 * np.stack([
+            -1j * Omega * rho + drho * u + rho * du + 1j * rho * w / R,
+            zero + rho * u * du + dp + dtau_z['h'],
+            zero + rho * u * dw + dtau_t['h'],
+        ], -1)
+
+        Minv = np.linalg.inv(M)
+        A = Minv @ N
+        B = (Minv @ b[..., None])[..., 0]
+
+        # particular (column 0) and homogeneous (column 1) solutions of
+        # X' = G X, with X = (p1, u1, w1, int p1 dz, 1); the equations are
+        # as stiff as the swirl, so each step is the exponential of the
+        # fourth order Magnus expansion
+        G = np.zeros(A.shape[:-2] + (5, 5), dtype=np.complex128)
+        G[..., :3, :3] = A
+        G[..., :3, 4] = B
+        G[..., 3, 0] = 1
+
+        # inlet: w1 = 0 and the perturbed entrance loss
+        c = (1 + xi) * u[0] ** 2 / (2 * a2)
+        X = np.zeros(gamma.shape[1:] + (5, 2), dtype=np.complex128)
+        X[..., 4, 0] = 1
+        X[..., 0, 1] = -(1 + xi) * rho[0] * u[0]
+        X[..., 1, 1] = 1 + c
+        dz = 2 * z[1]
+        for j in range(self.number_integr_steps):
+            G0, G1, G2 = G[2 * j], G[2 * j + 1], G[2 * j + 2]
+            magnus = (dz / 6 * (G0 + 4 * G1 + G2)
+                      - dz ** 2 / 12 * (G0 @ G2 - G2 @ G0))
+            X = expm(magnus) @ X
+        Y = X[..., :4, :]
+
+        # exit: perturbed recovery at the sump pressure
+        exit_condition = np.stack(np.broadcast_arrays(
+            1 + recovery * u[-1] ** 2 / (2 * a2), recovery * rho[-1] * u[-1],
+            0 * u[-1]), -1)
+        Y_p, Y_h = Y[..., 0], Y[..., 1]
+        alpha = (-(exit_condition * Y_p[..., :3]).sum(-1)
+                 / (exit_condition * Y_h[..., :3]).sum(-1))
+        integral = Y_p[..., 3] + alpha * Y_h[..., 3]
+
+        # Fx + i Fy = -pi R conj(int p1 dz) for h1 = -1
+        D = np.pi * R * np.conj(integral)
+
+        return z, P, W, m, D
+
+    def _operating_points(self, speeds, frequencies):
+        """Results for each speed, without the cache."""
+        a2 = self._a2
+        mu = self.absolute_viscosity
+        R = self.seal_diameter / 2
+
+        if frequencies is None:
+            # the coefficients are even in the whirl frequency
+            Omega = abs(speeds[:, None])
+        else:
+            if not (frequencies >= 0).all():
+                raise ValueError(f'Whirl frequencies must not be negative, '
+                                 f'got {frequencies[frequencies < 0]}.')
+            Omega = np.broadcast_to(frequencies, (len(speeds),
+                                                  len(frequencies)))
+        # static coefficients from a whirl much slower than the flow
+        Omega = np.maximum(Omega, 1e-6 * np.sqrt(a2) / self.seal_length)
+
+        z, P, W, m, D = self._first(speeds, np.concatenate([Omega, -Omega], 1))
+        forward, backward = np.split(D, 2, axis=1)
+        K = (forward + backward).real / 2
+        k = -(forward + backward).imag / 2
+        C = (forward - backward).imag / (2 * Omega)
+        c = (forward - backward).real / (2 * Omega)
+
+        h = self.exit_clearance
+        rho = P[-1] / a2
+        u = m / (rho * h)
+        results = []
+        for i, speed in enumerate(speeds):
+            results.append({
+                'kxx': K[i], 'kxy': k[i], 'cxx': C[i], 'cxy': c[i],
+                'seal_leakage': 2 * np.pi * R * m[i],
+                'exit_axial_mach_number': u[i] / np.sqrt(a2),
+                'exit_axial_reynolds_number': 2 * m[i] / mu,
+                'exit_circumferential_reynolds_number':
+                    2 * rho[i] * h * abs(W[-1, i] - speed * R) / mu,
+            })
+
+        return results
+
+    def coefficients(self, speeds, frequencies=None):
+        """Leakage and coefficients for each speed and whirl frequency.
+
+        Parameters
+        ----------
+        speeds : array
+            Rotor speeds (rad/s).
+        frequencies : array, optional
+            Whirl frequencies (rad/s). Default is the speed (synchronous
+            coefficients). A zero frequency gives the static limit.
+
+        Returns
+        -------
+        coefficients : dict
+            Dictionary with kxx, kxy, cxx and cxy with shape
+            (speeds, frequencies), and seal_leakage (kg/s),
+            exit_axial_mach_number, exit_axial_reynolds_number and
+            exit_circumferential_reynolds_number for each speed. The
+            seal is isotropic (kyy = kxx and kyx = -kxy).
+        """
+        speeds = np.atleast_1d(np.asarray(speeds, dtype=np.float64))
+        if frequencies is not None:
+            frequencies = np.atleast_1d(np.asarray(frequencies,
+                                                   dtype=np.float64))
+
+        results = [None] * len(speeds)
+        keys = [None] * len(speeds)
+        if self.cache is not None:
+            model_hash = self.model_hash()
+            for i, speed in enumerate(speeds):
+                keys[i] = self.cache.key(model_hash, 'coefficients',
+                                         float(speed), frequencies)
+                try:
+                    results[i] = self.cache[keys[i]]
+                except KeyError:
+                    pass
+
+        # speeds not found in the cache are solved together
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            solved = self._operating_points(speeds[missing], frequencies)
+            for i, result in zip(missing, solved):
+                results[i] = result
+                if self.cache is not None:
+                    self.cache[keys[i]] = result
+
+        return {name: np.array([result[name] for result in results])
+                for name in results[0]}
+
+    def seal_element(self, n, speeds, speed=None, frequencies=None):
+        """Seal element with the synchronous coefficients for a speed range.
+
+        Parameters
+        ----------
+        n : int
+            Node in which the seal will be inserted.
+        speeds : array
+            Speeds (rad/s) in which the coefficients are calculated.
+        speed : float, optional
+            Operating speed (rad/s) of the leakage, exit numbers and
+            frequency dependent coefficients. Default is the highest speed.
+        frequencies : array, optional
+            Whirl frequencies (rad/s) of the frequency dependent
+            coefficients (kxx_fd, ...) at the operating speed.
+
+        Returns
+        -------
+        seal : ross.elements.IsotSealElement
+        """
+        speeds = np.asarray(speeds, dtype=np.float64)
+        if speed is None:
+            speed = speeds.max()
+
+        synchronous = self.coefficients(speeds)
+        kxx, kxy, cxx, cxy = [synchronous[name][:, 0]
+                              for name in ['kxx', 'kxy', 'cxx', 'cxy']]
+        operating = self.coefficients(speed)
+        kwargs = {name: float(operating[name][0]) for name in [
+            'seal_leakage', 'exit_axial_mach_number',
+            'exit_axial_reynolds_number',
+            'exit_circumferential_reynolds_number']}
+        kwargs['wfr'] = float(operating['kxy'][0, 0]
+                              / (operating['cxx'][0, 0] * speed))
+        if frequencies is not None:
+            fd = self.coefficients(speed, frequencies)
+            k_fd, c_fd = fd['kxx'][0], fd['cxx'][0]
+            kc_fd, cc_fd = fd['kxy'][0], fd['cxy'][0]
+            kwargs.update(kxx_fd=k_fd, kyy_fd=k_fd, kxy_fd=kc_fd,
+                          kyx_fd=-kc_fd, cxx_fd=c_fd, cyy_fd=c_fd,
+                          cxy_fd=cc_fd, cyx_fd=-cc_fd,
+                          w_fd=np.asarray(frequencies, dtype=np.float64))
+
+        for parameter in parameters:
+            kwargs[parameter] = (getattr(self, parameter)
+                                 * element_units.get(parameter, 1))
+        # IsotSealElement speed is in rpm
+        kwargs['speed'] = speed * 30 / np.pi
+
+        return IsotSealElement(n, kxx=kxx, kyy=kxx, kxy=kxy, kyx=-kxy,
+                               cxx=cxx, cyy=cxx, cxy=cxy, cyx=-cxy, w=speeds,
+                               **kwargs)
@@ -0,0 +1,239 @@
+"""Cache module.
+
+This module defines a persistent on-disk cache used to store the
+results of rotor analyses. Results are keyed by a content hash of the
+rotor model and of the analysis arguments, so an unchanged model
+returns the stored results instead of calculating them again.
+"""
+import os
+import glob
+import pickle
+import hashlib
+import inspect
+import tempfile
+import functools
+import numpy as np
+
+__all__ = ["ResultsCache"]
+
+
+def _update_hash(hasher, obj, _depth=0):
+    """Feed an object to a hashlib object.
+
+    Numbers, strings, arrays, lists, dicts and the attributes of objects
+    (e.g. elements, materials and bearing coefficients) are considered.
+    Callables (e.g. interpolation splines) are derived data and are skipped.
+    """
+    if _depth > 20:
+        raise ValueError("Object is too deep to be hashed.")
+
+    if obj is None or isinstance(obj, (bool, int, float, complex, str, bytes, np.generic)):
+        hasher.update(f"{type(obj).__name__}:{obj!r};".encode())
+    elif isinstance(obj, np.ndarray):
+        hasher.update(f"ndarray:{obj.dtype}:{obj.shape};".encode())
+        if obj.dtype == object:
+            for item in obj.ravel():
+                _update_hash(hasher, item, _depth + 1)
+        else:
+            hasher.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, (list, tuple)):
+        hasher.update(f"{type(obj).__name__}:{len(obj)};".encode())
+        for item in obj:
+            _update_hash(hasher, item, _depth + 1)
+    elif isinstance(obj, dict):
+        hasher.update(f"dict:{len(obj)};".encode())
+        for k in sorted(obj, key=str):
+            if callable(obj[k]):
+                continue
+            _update_hash(hasher, str(k), _depth + 1)
+            _update_hash(hasher, obj[k], _depth + 1)
+    elif hasattr(obj, "__dict__") and not callable(obj):
+        hasher.update(f"object:{obj.__class__.__name__};".encode())
+        _update_hash(hasher, vars(obj), _depth + 1)
+    else:
+        hasher.update(f"{type(obj).__name__};".encode())
+
+
+def content_hash(*objs):
+    """Content hash (sha256 hex digest) for the objects provided.
+
+    Examples
+    --------
+    >>> content_hash(1, 'a', [1., 2.]) == content_hash(1, 'a', [1., 2.])
+    True
+    >>> content_hash(np.array([1., 2.])) == content_hash(np.array([1., 3.]))
+    False
+    """
+    hasher = hashlib.sha256()
+    for obj in objs:
+        _update_hash(hasher, obj)
+
+    return hasher.hexdigest()
+
+
+class ResultsCache:
+    """Results cache.
+
+    Class used to store analysis results in a local directory.
+    Each entry is a file named after its key. When the total size of the
+    directory exceeds max_size, the least recently used entries are
+    removed.
+
+    Parameters
+    ----------
+    directory : str, optional
+        Directory where the results are stored.
+        Default is ~/.ross/cache.
+    max_size : int, optional
+        Maximum size of the cache in bytes.
+        Default is 1e9 (1 GB).
+
+    Attributes
+    ----------
+    hits : int
+        Number of results returned from the cache.
+    misses : int
+        Number of results not found in the cache.
+
+    Examples
+    --------
+    >>> from ross.rotor import rotor_example
+    >>> import tempfile
+    >>> rotor = rotor_example()
+    >>> rotor.cache = ResultsCache(tempfile.mkdtemp())
+    >>> camp0 = rotor.campbell(np.linspace(0, 400, 11))
+    >>> camp1 = rotor.campbell(np.linspace(0, 400, 11))
+    >>> rotor.cache.hits
+    1
+    """
+
+    suffix = ".pck"
+
+    def __init__(self, directory=None, max_size=1e9):
+        if directory is None:
+            directory = os.path.join(os.path.expanduser("~"), ".ross", "cache")
+
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}"
+            f"(directory={self.directory!r}, max_size={self.max_size:.0f})"
+        )
+
+    def _file(self, key):
+        return os.path.join(self.directory, key + self.suffix)
+
+    @staticmethod
+    def key(*args):
+        """Key for an entry based on the content of args."""
+        from ross import __version__
+
+        return content_hash(__version__, *args)
+
+    def __contains__(self, key):
+        return os.path.isfile(self._file(key))
+
+    def __getitem__(self, key):
+        file = self._file(key)
+        try:
+            with open(file, "rb") as f:
+                value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            self.misses += 1
+            raise KeyError(key)
+
+        # update access time used by the lru eviction
+        os.utime(file)
+        self.hits += 1
+
+        return value
+
+    def __setitem__(self, key, value):
+        # write to a temporary file first so that other processes never
+        # read a partially written entry
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(value, f)
+        os.replace(tmp, self._file(key))
+
+        self._evict()
+
+    def __delitem__(self, key):
+        try:
+            os.remove(self._file(key))
+        except FileNotFoundError:
+            raise KeyError(key)
+
+    def entries(self):
+        """List with (modification time, size, file) for each entry."""
+        entries = []
+        for file in glob.glob(os.path.join(self.directory, "*" + self.suffix)):
+            try:
+                stat = os.stat(file)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, file))
+
+        return entries
+
+    @property
+    def size(self):
+        """Total size of the cache in bytes."""
+        return sum(size for _, size, _ in self.entries())
+
+    def _evict(self):
+        """Remove least recently used entries until size <= max_size."""
+        entries = sorted(self.entries())
+        size = sum(s for _, s, _ in entries)
+
+        for _, s, file in entries:
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(file)
+            except FileNotFoundError:
+                pass
+            size -= s
+
+    def clear(self):
+        """Remove all entries."""
+        for _, _, file in self.entries():
+            os.remove(file)
+
+
+def cached(method):
+    """Decorator used to cache the results of rotor analyses.
+
+    If the rotor has a cache (rotor.cache is not None), the results are
+    stored with a key based on rotor.model_hash(), the method name and
+    the arguments (including default values).
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = getattr(self, "cache", None)
+        if cache is None:
+            return method(self, *args, **kwargs)
+
+        arguments = signature.bind(self, *args, **kwargs)
+        arguments.apply_defaults()
+        arguments = dict(arguments.arguments)
+        arguments.pop("self")
+
+        key = cache.key(self.model_hash(), method.__name__, arguments)
+        try:
+            return cache[key]
+        except KeyError:
+            results = method(self, *args, **kwargs)
+            cache[key] = results
+
+        return results
+
+    return wrapper
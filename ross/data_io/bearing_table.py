@@ -0,0 +1,208 @@
+"""Bearing coefficient tables.
+
+A table holds the coefficients of many bearings, each with one or more
+cases (e.g. load and temperature), as columns with one row per speed::
+
+    bearing, load, temperature, w, kxx, kyy, kxy, kyx, cxx, cyy, cxy, cyx
+
+The bearing column (names) is optional and any column other than w and
+the coefficients is a case parameter. Constant coefficients are stored in
+one row with w = nan.
+
+Tables are dicts of 1d arrays, stored as .csv files, for the exchange with
+other programs, or as .npz files (see ross.data_io.npz), which are faster
+to read and can be memory-mapped.
+"""
+import numpy as np
+from ross.data_io.npz import save_npz, load_npz
+
+__all__ = ['bearing_table', 'save_bearing_table', 'load_bearing_table',
+           'select_bearing']
+
+coefficients = ['kxx', 'kyy', 'kxy', 'kyx', 'cxx', 'cyy', 'cxy', 'cyx']
+
+
+def bearing_table(bearing, name=None, **case):
+    """Table with the coefficients of a bearing element.
+
+    Parameters
+    ----------
+    bearing : BearingElement
+        Bearing or seal element.
+    name : str, optional
+        Bearing name. If None, the table has no bearing column.
+    **case
+        Case parameters (e.g. load=1e3, temperature=50).
+
+    Returns
+    -------
+    table : dict
+        Dictionary with the columns.
+
+    Examples
+    --------
+    >>> from ross.elements import BearingElement
+    >>> bearing = BearingElement(0, kxx=[1e6, 2e6, 3e6, 4e6], cxx=1e3,
+    ...                          w=[0, 100, 200, 300])
+    >>> table = bearing_table(bearing, 'nde', load=500)
+    >>> table['load']
+    array([ 500.,  500.,  500.,  500.])
+    """
+    w = bearing.kxx.w
+    w = np.array([np.nan] if w is None else w, dtype=np.float64)
+
+    table = {}
+    if name is not None:
+        table['bearing'] = np.full(len(w), name)
+    for parameter, value in case.items():
+        table[parameter] = np.full(len(w), value, dtype=np.float64)
+    table['w'] = w
+    for coefficient in coefficients:
+        values = np.asarray(getattr(bearing, coefficient).coefficient,
+                            dtype=np.float64)
+        table[coefficient] = np.broadcast_to(values, w.shape)
+
+    return table
+
+
+def _concatenate(tables):
+    if isinstance(tables, dict):
+        tables = [tables]
+
+    columns = list(tables[0])
+    for table in tables[1:]:
+        if set(table) != set(columns):
+            raise ValueError('Tables must have the same columns.')
+
+    return {column: np.concatenate([np.asarray(table[column])
+                                    for table in tables])
+            for column in columns}
+
+
+def save_bearing_table(file, tables):
+    """Save bearing coefficient tables.
+
+    Parameters
+    ----------
+    file : str
+        File path name. Tables are stored as csv if the name ends with
+        .csv and as binary .npz otherwise.
+    tables : dict, list
+        Table or list of tables with the same columns, which are
+        concatenated (see bearing_table).
+    """
+    table = _concatenate(tables)
+
+    if file.endswith('.csv'):
+        import pandas as pd
+
+        pd.DataFrame(table).to_csv(file, index=False)
+        return
+
+    arrays = {column: np.asarray(values, dtype=np.float64)
+              for column, values in table.items() if column != 'bearing'}
+    metadata = {'format': 'ross.BearingTable', 'version': 1,
+                'columns': list(table), 'bearings': []}
+    if 'bearing' in table:
+        names, codes = np.unique(table['bearing'], return_inverse=True)
+        arrays['bearing'] = codes.astype(np.int32)
+        metadata['bearings'] = names.tolist()
+
+    save_npz(file, arrays, metadata)
+
+
+def load_bearing_table(file, mmap_mode=None):
+    """Load bearing coefficient tables.
+
+    Parameters
+    ----------
+    file : str
+        File path name (.csv or .npz).
+    mmap_mode : str, optional
+        If not None, the columns of .npz files are memory-mapped with this
+        mode (e.g. 'r').
+
+    Returns
+    -------
+    table : dict
+        Dictionary with the columns.
+    """
+    if file.endswith('.csv'):
+        import pandas as pd
+
+        df = pd.read_csv(file, dtype={'bearing': str})
+        return {column: (df[column].to_numpy(dtype=str) if column == 'bearing'
+                         else df[column].to_numpy(dtype=np.float64))
+                for column in df.columns}
+
+    arrays, metadata = load_npz(file, mmap_mode=mmap_mode)
+    if metadata.get('format') != 'ross.BearingTable':
+        raise ValueError(f'{file} is not a bearing table file.')
+
+    if 'bearing' in arrays:
+        arrays['bearing'] = np.array(metadata['bearings'])[arrays['bearing']]
+
+    return {column: arrays[column] for column in metadata['columns']}
+
+
+def select_bearing(table, bearing=None, **case):
+    """Coefficients of one bearing and case of a table.
+
+    Parameters
+    ----------
+    table : dict
+        Table (see load_bearing_table).
+    bearing : str, optional
+        Bearing name. Needed if the table has more than one bearing.
+    **case
+        Values of the case parameters (e.g. load=1e3, temperature=50).
+        Needed for the parameters with more than one value for the bearing.
+
+    Returns
+    -------
+    kwargs : dict
+        Dictionary with w and the coefficients sorted by speed, which can be
+        passed to BearingElement.
+
+    Examples
+    --------
+    >>> from ross.elements import BearingElement
+    >>> bearing = BearingElement(0, kxx=[1e6, 2e6, 3e6, 4e6], cxx=1e3,
+    ...                          w=[0, 100, 200, 300])
+    >>> table = bearing_table(bearing, 'nde', load=500)
+    >>> select_bearing(table, 'nde', load=500)['kxx']
+    array([ 1000000.,  2000000.,  3000000.,  4000000.])
+    """
+    w = np.asarray(table['w'])
+    mask = np.ones(len(w), dtype=bool)
+    if bearing is not None:
+        mask &= np.asarray(table['bearing']) == bearing
+    for parameter, value in case.items():
+        mask &= np.asarray(table[parameter]) == value
+
+    index = np.flatnonzero(mask)
+    if len(index) == 0:
+        raise ValueError(f'No coefficients for bearing {bearing} and '
+                         f'case {case}.')
+    index = index[np.argsort(w[index], kind='stable')]
+
+    keys = [column for column in table
+            if column not in coefficients and column != 'w']
+    for column in keys:
+        if len(np.unique(np.asarray(table[column])[index])) > 1:
+            raise ValueError(f'More than one {column} for bearing {bearing} '
+                             f'and case {case}, select one with {keys}.')
+
+    if np.isnan(w[index]).all() and len(index) == 1:
+        kwargs = {c: float(table[c][index[0]]) for c in coefficients}
+        kwargs['w'] = None
+        return kwargs
+
+    if (np.diff(w[index]) == 0).any() or np.isnan(w[index]).any():
+        raise ValueError(f'More than one case for bearing {bearing} and case '
+                         f'{case}, select one with {keys}.')
+
+    kwargs = {c: np.asarray(table[c])[index] for c in coefficients}
+    kwargs['w'] = w[index]
+
+    return kwargs
@@ -0,0 +1,310 @@
+"""Fleet import.
+
+This module imports the rotor models of a fleet of machines. Each machine
+is described by a yaml manifest that points to its XLTRC workbooks and
+bearing coefficient files, for example::
+
+    rotor: bcl306c_rotor.xls
+    bearings:
+      - n: 8
+        file: bcl306c_brg_nte.xls
+      - n: 49
+        file: bcl306c_brg_te.xls
+        sheet_name: XLTFPBrg
+      - n: 20
+        file: bcl306c_seal.yaml
+        class: SealElement
+    config:
+      rated_w: 1152
+      n_eigen: 16
+
+Paths are relative to the manifest. Optional keys are name (default is
+the manifest file name), shaft_sheet (default 'Model') and disks_sheet
+(default 'More', null if the machine has no disks).
+
+Machines are loaded and validated in parallel processes and stored in a
+ModelStore, from which a rotor is loaded without reading the workbooks.
+"""
+import os
+import glob
+import tempfile
+import numpy as np
+import yaml
+from concurrent.futures import ProcessPoolExecutor
+
+import ross.elements as elements
+from ross.elements import ShaftElement, LumpedDiskElement, BearingElement
+from ross.rotor import Rotor
+from ross.data_io.read_xl import XLTRCWorkbook
+
+__all__ = ['ModelStore', 'load_machine', 'validate_rotor', 'import_fleet']
+
+
+class ModelStore:
+    """Store of rotor models.
+
+    Rotors are stored in a directory as .npz files (see Rotor.save) named
+    after the machine.
+
+    Parameters
+    ----------
+    directory : str
+        Directory where the models are stored.
+
+    Examples
+    --------
+    >>> from ross.rotor import rotor_example
+    >>> store = ModelStore(tempfile.mkdtemp())
+    >>> store['example'] = rotor_example()
+    >>> store.names()
+    ['example']
+    >>> np.allclose(store['example'].wn, rotor_example().wn)
+    True
+    """
+
+    suffix = '.npz'
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(self.directory, exist_ok=True)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(directory={self.directory!r})'
+
+    def _file(self, name):
+        return os.path.join(self.directory, name + self.suffix)
+
+    def __contains__(self, name):
+        return os.path.isfile(self._file(name))
+
+    def __getitem__(self, name):
+        if name not in self:
+            raise KeyError(name)
+
+        return Rotor.load(self._file(name))
+
+    def __setitem__(self, name, rotor):
+        # write to a temporary file first so that other processes never
+        # read a partially written model
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        os.close(fd)
+        try:
+            rotor.save(tmp)
+            os.replace(tmp, self._file(name))
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+    def __delitem__(self, name):
+        try:
+            os.remove(self._file(name))
+        except FileNotFoundError:
+            raise KeyError(name)
+
+    def __iter__(self):
+        return iter(self.names())
+
+    def __len__(self):
+        return len(self.names())
+
+    def names(self):
+        """Sorted list with the names of the stored machines."""
+        files = glob.glob(os.path.join(self.directory, '*' + self.suffix))
+        return sorted(os.path.basename(file)[:-len(self.suffix)]
+                      for file in files)
+
+
+def _bearing_class(name):
+    bearing_class = getattr(elements, name, None)
+    if not (isinstance(bearing_class, type)
+            and issubclass(bearing_class, BearingElement)):
+        raise ValueError(f'{name} is not a bearing or seal element.')
+
+    return bearing_class
+
+
+def _machine_name(manifest):
+    return os.path.splitext(os.path.basename(manifest))[0]
+
+
+def load_machine(manifest, sidecar=False):
+    """Load a rotor from a machine manifest.
+
+    Each workbook is parsed once, even if more than one element is loaded
+    from it (see XLTRCWorkbook).
+
+    Parameters
+    ----------
+    manifest : str
+        Yaml manifest file (see the module documentation).
+    sidecar : bool, optional
+        If True, the parsed workbooks are kept in sidecar files
+        (see XLTRCWorkbook). Default is False.
+
+    Returns
+    -------
+    name : str
+        Machine name.
+    rotor : ross.rotor.Rotor
+    """
+    with open(manifest, 'r') as f:
+        machine = yaml.safe_load(f)
+
+    directory = os.path.dirname(os.path.abspath(manifest))
+    workbooks = {}
+
+    def workbook(file):
+        path = os.path.join(directory, file)
+        if path not in workbooks:
+            workbooks[path] = XLTRCWorkbook(path, sidecar=sidecar)
+        return workbooks[path]
+
+    rotor_workbook = workbook(machine['rotor'])
+    shaft_elements = ShaftElement.load_from_xltrc(
+        rotor_workbook, machine.get('shaft_sheet', 'Model'))
+
+    disks_sheet = machine.get('disks_sheet', 'More')
+    disk_elements = []
+    if disks_sheet is not None:
+        disk_elements = LumpedDiskElement.load_from_xltrc(rotor_workbook,
+                                                          disks_sheet)
+
+    bearing_seal_elements = []
+    for bearing in machine.get('bearings', []):
+        bearing_class = _bearing_class(bearing.get('class', 'BearingElement'))
+        file = bearing['file']
+        if file.endswith(('.yaml', '.yml')):
+            element = bearing_class.load_from_yaml(
+                bearing['n'], os.path.join(directory, file))
+        else:
+            element = bearing_class.load_from_xltrc(
+                bearing['n'], workbook(file),
+                bearing.get('sheet_name', 'XLUseKCM'))
+        bearing_seal_elements.append(element)
+
+    rotor = Rotor(shaft_elements, disk_elements, bearing_seal_elements,
+                  **machine.get('config', {}))
+
+    return machine.get('name', _machine_name(manifest)), rotor
+
+
+def validate_rotor(rotor):
+    """Check a rotor model for inconsistent data.
+
+    Parameters
+    ----------
+    rotor : ross.rotor.Rotor
+
+    Returns
+    -------
+    problems : list
+        List with a description of each problem found. Empty if the
+        model is valid.
+
+    Examples
+    --------
+    >>> from ross.rotor import rotor_example
+    >>> validate_rotor(rotor_example())
+    []
+    """
+    problems = []
+
+    shaft = np.array([[sh.L, sh.i_d, sh.o_d, sh.material.rho, sh.material.E]
+                      for sh in rotor.shaft_elements], dtype=np.float64)
+    L, i_d, o_d, rho, E = shaft.T
+    checks = [(~np.isfinite(shaft).all(axis=1), 'non finite properties'),
+              (L <= 0, 'non positive length'),
+              ((i_d < 0) | (o_d <= i_d), 'outer diameter <= inner diameter'),
+              ((rho <= 0) | (E <= 0), 'non positive density or modulus')]
+    for invalid, message in checks:
+        for i in np.flatnonzero(invalid):
+            problems.append(f'shaft element {i}: {message}')
+
+    last_node = len(rotor.nodes) - 1
+    for kind, elements_ in [('disk', rotor.disk_elements),
+                            ('bearing', rotor.bearing_seal_elements)]:
+        for i, element in enumerate(elements_):
+            if not 0 <= element.n <= last_node:
+                problems.append(f'{kind} element {i}: node {element.n} '
+                                f'is not in the shaft (0 to {last_node})')
+
+    for i, disk in enumerate(rotor.disk_elements):
+        if not (disk.m >= 0 and disk.Id >= 0 and disk.Ip >= 0):
+            problems.append(f'disk element {i}: negative or non finite '
+                            f'mass or inertia')
+
+    for i, bearing in enumerate(rotor.bearing_seal_elements):
+        coefficients = np.array(
+            [getattr(bearing, c).coefficient for c in
+             ['kxx', 'kyy', 'kxy', 'kyx', 'cxx', 'cyy', 'cxy', 'cyx']],
+            dtype=np.float64)
+        if not np.isfinite(coefficients).all():
+            problems.append(f'bearing element {i}: non finite coefficients')
+        if (coefficients[:2] < 0).any():
+            problems.append(f'bearing element {i}: negative direct stiffness')
+
+    if not np.isfinite(rotor.wn).all():
+        problems.append('non finite natural frequencies')
+
+    return problems
+
+
+def _import_machine(manifest, directory, sidecar):
+    """Load, validate and store one machine (runs in a worker process)."""
+    name = _machine_name(manifest)
+    try:
+        name, rotor = load_machine(manifest, sidecar=sidecar)
+        problems = validate_rotor(rotor)
+        if not problems:
+            ModelStore(directory)[name] = rotor
+    except Exception as exc:
+        problems = [f'{type(exc).__name__}: {exc}']
+
+    return name, problems
+
+
+def import_fleet(directory, store, pattern='*.yaml', max_workers=None,
+                 sidecar=False):
+    """Import the machines of a directory to a model store.
+
+    Each machine manifest found in the directory is loaded and validated
+    in a separate process. Valid machines are stored, so that later they
+    can be loaded from the store without reading the workbooks.
+
+    Parameters
+    ----------
+    directory : str
+        Directory with the machine manifests.
+    store : ModelStore, str
+        Model store or the directory of the store.
+    pattern : str, optional
+        Pattern used to find the manifests. Default is '*.yaml'.
+    max_workers : int, optional
+        Number of processes. If 1, machines are imported in the current
+        process. Default is the number of processors.
+    sidecar : bool, optional
+        If True, parsed workbooks are kept in sidecar files, so a new
+        import of unchanged workbooks does not parse them again.
+        Default is False.
+
+    Returns
+    -------
+    problems : dict
+        Dictionary with the problems (list of str) of each machine that
+        was not stored.
+    """
+    if not isinstance(store, ModelStore):
+        store = ModelStore(store)
+
+    manifests = sorted(glob.glob(os.path.join(directory, pattern)))
+    args = (manifests,
+            [store.directory] * len(manifests),
+            [sidecar] * len(manifests))
+
+    if max_workers == 1:
+        results = list(map(_import_machine, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_import_machine, *args))
+
+    return {name: problems for name, problems in results if problems}
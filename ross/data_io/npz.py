@@ -0,0 +1,114 @@
+"""Binary storage using numpy .npz files.
+
+Arrays are stored uncompressed, so each one can be loaded alone or
+memory-mapped, and metadata is stored as a json string. No pickle is
+used, so the files do not depend on the classes' implementation.
+"""
+import json
+import struct
+import zipfile
+import numpy as np
+
+__all__ = ['save_npz', 'load_npz', 'memmap_npz']
+
+
+def _json_default(obj):
+    """Convert numpy objects so that they can be serialized by json."""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f'Object of type {obj.__class__.__name__} '
+                    f'is not JSON serializable')
+
+
+def save_npz(file, arrays, metadata):
+    """Save arrays and metadata to a .npz file.
+
+    Parameters
+    ----------
+    file : str
+        File path name. The name is used as is (no .npz suffix is added).
+    arrays : dict
+        Dictionary with the arrays.
+    metadata : dict
+        Dictionary with json serializable values.
+    """
+    metadata = np.array(json.dumps(metadata, default=_json_default))
+    # a file object is used to avoid the .npz suffix added by np.savez
+    with open(file, 'wb') as f:
+        np.savez(f, metadata=metadata, **arrays)
+
+
+def memmap_npz(file, name, mode='r'):
+    """Memory-map an array stored in a .npz file.
+
+    Parameters
+    ----------
+    file : str
+        File path name.
+    name : str
+        Array name.
+    mode : str, optional
+        Mode used to open the memmap. Default is 'r'.
+
+    Returns
+    -------
+    array : np.memmap
+    """
+    with zipfile.ZipFile(file) as zf:
+        info = zf.getinfo(name + '.npy')
+    if info.compress_type != zipfile.ZIP_STORED:
+        raise ValueError(f'Array {name} is compressed and cannot be mapped.')
+
+    with open(file, 'rb') as f:
+        # skip the zip local file header
+        f.seek(info.header_offset)
+        header = f.read(30)
+        name_length, extra_length = struct.unpack('<HH', header[26:30])
+        f.seek(info.header_offset + 30 + name_length + extra_length)
+
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+
+    if dtype.hasobject:
+        raise ValueError(f'Array {name} has objects and cannot be mapped.')
+
+    return np.memmap(file, dtype=dtype, mode=mode, shape=shape,
+                     order='F' if fortran_order else 'C', offset=offset)
+
+
+def load_npz(file, names=None, mmap_mode=None):
+    """Load arrays and metadata from a .npz file.
+
+    Parameters
+    ----------
+    file : str
+        File path name.
+    names : list, optional
+        Names of the arrays that will be loaded. Default is all arrays.
+    mmap_mode : str, optional
+        If not None, arrays are memory-mapped with this mode (e.g. 'r').
+
+    Returns
+    -------
+    arrays : dict
+        Dictionary with the arrays.
+    metadata : dict
+        Dictionary with the metadata.
+    """
+    with np.load(file, allow_pickle=False) as npz:
+        metadata = json.loads(str(npz['metadata']))
+        if names is None:
+            names = [name for name in npz.files if name != 'metadata']
+        if mmap_mode is None:
+            arrays = {name: npz[name] for name in names}
+
+    if mmap_mode is not None:
+        arrays = {name: memmap_npz(file, name, mmap_mode) for name in names}
+
+    return arrays, metadata
@@ -1,21 +1,166 @@
+import os
+import tempfile
+import zipfile
 import pandas as pd
 import numpy as np
 import yaml
+from ross.data_io.npz import save_npz, load_npz
 from ross.materials import Material
 
-__all__ = ['load_bearing_seals_from_xltrc', 'load_disks_from_xltrc',
-           'load_shaft_from_xltrc']
+__all__ = ['XLTRCWorkbook', 'load_bearing_seals_from_xltrc',
+           'load_disks_from_xltrc', 'load_shaft_from_xltrc']
+
+
+class XLTRCWorkbook:
+    """XLTRC workbook.
+
+    The workbook is opened once and each sheet is parsed only on its first
+    use, so that the shaft, disks and bearings of a machine can be loaded
+    from the same file without parsing it again. The load_from_xltrc
+    methods of the elements accept a workbook instead of a file name.
+
+    Parameters
+    ----------
+    file : str
+        File path name.
+    sidecar : bool, optional
+        If True, the parsed sheets are also stored in a .npz file next
+        to the workbook (file + '.npz'). The sidecar is used while the
+        modification time and size of the workbook do not change.
+        Default is False.
+
+    Examples
+    --------
+    >>> import os
+    >>> from ross.elements import ShaftElement, LumpedDiskElement
+    >>> file = os.path.join(os.path.dirname(__file__), '..', 'tests', 'data',
+    ...                     'xl_rotor.xls')
+    >>> workbook = XLTRCWorkbook(file)
+    >>> shaft = ShaftElement.load_from_xltrc(workbook)
+    >>> disks = LumpedDiskElement.load_from_xltrc(workbook)
+    >>> len(shaft), len(disks)
+    (93, 7)
+    """
+
+    sidecar_suffix = '.npz'
+
+    def __init__(self, file, sidecar=False):
+        self.file = file
+        self.sidecar = sidecar
+        self._excel = None
+        self._sheets = {}
+
+        if sidecar:
+            self._load_sidecar()
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.file!r})'
+
+    @property
+    def sidecar_file(self):
+        return self.file + self.sidecar_suffix
+
+    def _stamp(self):
+        stat = os.stat(self.file)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load_sidecar(self):
+        try:
+            arrays, metadata = load_npz(self.sidecar_file)
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            return
+
+        if tuple(metadata['stamp']) != self._stamp():
+            return
+        for i, sheet in enumerate(metadata['sheets']):
+            columns = {j: (arrays[f'sheet{i}_{j}'] if column is None
+                           else pd.Series(column['values'],
+                                          dtype=column['dtype']))
+                       for j, column in enumerate(sheet['values'])}
+            df = pd.DataFrame(columns, index=pd.RangeIndex(sheet['rows']))
+            df.columns = sheet['columns']
+            self._sheets[sheet['name']] = df
+
+    def _save_sidecar(self):
+        # numeric columns are stored as arrays and the other columns
+        # (strings mixed with numbers) as json, so no pickle is needed
+        arrays = {}
+        sheets = []
+        for i, (name, df) in enumerate(self._sheets.items()):
+            values = []
+            for j in range(df.shape[1]):
+                column = df.iloc[:, j]
+                if (isinstance(column.dtype, np.dtype)
+                        and not column.dtype.hasobject):
+                    arrays[f'sheet{i}_{j}'] = column.to_numpy()
+                    values.append(None)
+                else:
+                    values.append({'dtype': str(column.dtype),
+                                   'values': column.tolist()})
+            sheets.append({'name': name, 'columns': list(df.columns),
+                           'rows': len(df), 'values': values})
+
+        # write to a temporary file first so that other processes never
+        # read a partially written sidecar
+        directory = os.path.dirname(os.path.abspath(self.sidecar_file))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        os.close(fd)
+        try:
+            save_npz(tmp, arrays, {'stamp': self._stamp(), 'sheets': sheets})
+        except TypeError:
+            # cells that json cannot store (e.g. dates) are only kept in
+            # memory
+            os.remove(tmp)
+            return
+        os.replace(tmp, self.sidecar_file)
+
+    def sheet(self, sheet_name=0):
+        """Parsed sheet.
+
+        Parameters
+        ----------
+        sheet_name : str, int, optional
+            Sheet name or position. Default is the first sheet.
+
+        Returns
+        -------
+        df : pandas.DataFrame
+            Sheet as read by pandas.read_excel.
+        """
+        try:
+            return self._sheets[sheet_name]
+        except KeyError:
+            pass
+
+        if self._excel is None:
+            self._excel = pd.ExcelFile(self.file)
+        df = self._excel.parse(sheet_name)
+        self._sheets[sheet_name] = df
+
+        if self.sidecar:
+            self._save_sidecar()
+
+        return df
+
+
+def _sheet(file, sheet_name=0):
+    """Sheet from a file name or from an XLTRCWorkbook."""
+    if not isinstance(file, XLTRCWorkbook):
+        file = XLTRCWorkbook(file)
+
+    return file.sheet(sheet_name)
 
 
 def table_limits_xltrc(df, start_col=0):
-    """Find where table starts for xl files."""
-    for i, row in df.iterrows():
-        if row.iloc[start_col] == 'Speed':
-            start = i
-    for i in range(start, 100):
-        if pd.isna(df.iloc[i, start_col]):
-            end = i - 1
-            break
+    """Find where table starts for xl files.
+
+    The table starts at the last 'Speed' cell of the column and ends at
+    the row before the first empty cell after it.
+    """
+    column = df.iloc[:, start_col]
+    start = np.flatnonzero((column == 'Speed').to_numpy())[-1]
+    empty = np.flatnonzero(column.isna().to_numpy()[start:])
+    end = start + empty[0] - 1 if len(empty) else len(column) - 1
 
     return start, end
 
@@ -41,10 +186,12 @@ def load_bearing_seals_from_yaml(file):
     Examples
     --------
     """
+    # the safe loader only creates basic types (the C version if available)
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
     with open(file, 'r') as f:
-        coefficients = yaml.load(f)
+        coefficients = yaml.load(f, Loader=loader)
 
-    coefficients = {k: np.array(v) for k, v in coefficients.items()}
+    coefficients = {k: np.asarray(v) for k, v in coefficients.items()}
 
     return coefficients
 
@@ -59,8 +206,8 @@ def load_bearing_seals_from_xltrc(file, sheet_name='XLUseKCM'):
     ----------
     n: int
         Node in which the bearing will be inserted.
-    file : str
-        File path name.
+    file : str, XLTRCWorkbook
+        File path name or workbook.
     sheet_name : str
         Bearing sheet name. Default is 'XLUseKCM'.
 
@@ -77,7 +224,7 @@ def load_bearing_seals_from_xltrc(file, sheet_name='XLUseKCM'):
     if sheet_name == 'XLLaby':
         return load_from_excel_laby(file)
 
-    df = pd.read_excel(file, sheet_name=sheet_name)
+    df = _sheet(file, sheet_name)
 
     col_start = 0
 
@@ -87,7 +234,8 @@ def load_bearing_seals_from_xltrc(file, sheet_name='XLUseKCM'):
     table_start, table_end = table_limits_xltrc(df, col_start)
     table_start = table_start + 2
 
-    df_bearing = pd.DataFrame(df.iloc[table_start:, col_start:])
+    # copies, since the sheets are cached and converted below
+    df_bearing = df.iloc[table_start:, col_start:].copy()
     if sheet_name == 'XLTFPBrg':
         df_bearing = df_bearing.iloc[:10]
     df_bearing = df_bearing.rename(columns=df.loc[table_start - 2])
@@ -116,19 +264,15 @@ def load_bearing_seals_from_xltrc(file, sheet_name='XLUseKCM'):
 
 
 def load_from_excel_laby(file):
-    df = pd.read_excel(file)
+    df = _sheet(file)
     table_start, table_end = table_limits_xltrc(df)
 
-    df_seal = pd.DataFrame(df.iloc[table_start + 2:table_end, :9])
-    df_seal = df_seal.rename(columns=df.iloc[table_start, :9])
+    names = df.iloc[table_start, :9]
+    values = df.iloc[table_start + 2:table_end, :9].to_numpy(dtype=np.float64)
 
-    kwargs = {}
-    for k, v in df_seal.to_dict().items():
-        if k == 'Speed':
-            kwargs['w'] = (2 * np.pi / 60) * \
-                          np.fromiter(v.values(), dtype=np.float)
-        else:
-            kwargs[k.lower()] = np.fromiter(v.values(), dtype=np.float)
+    kwargs = {('w' if name == 'Speed' else name.lower()): column
+              for name, column in zip(names, values.T)}
+    kwargs['w'] = (2 * np.pi / 60) * kwargs['w']
 
     return kwargs
 
@@ -141,8 +285,8 @@ def load_disks_from_xltrc(file, sheet_name='More'):
 
     Parameters
     ----------
-    file : str
-        File path name.
+    file : str, XLTRCWorkbook
+        File path name or workbook.
     sheet_name : str
         Masses sheet name. Default is 'More'.
 
@@ -154,9 +298,10 @@ def load_disks_from_xltrc(file, sheet_name='More'):
     Examples
     --------
     """
-    df = pd.read_excel(file, sheet_name=sheet_name)
+    df = _sheet(file, sheet_name)
 
-    df_masses = pd.DataFrame(df.iloc[4:, :4])
+    # copies, since the sheets are cached and converted below
+    df_masses = df.iloc[4:, :4].copy()
     df_masses = df_masses.rename(columns=df.iloc[1, 1:4])
     df_masses = df_masses.rename(columns={' Added Mass & Inertia': 'n'})
 
@@ -177,8 +322,8 @@ def load_shaft_from_xltrc(file, sheet_name='Model'):
 
     Parameters
     ----------
-    file : str
-        File path name.
+    file : str, XLTRCWorkbook
+        File path name or workbook.
     sheet_name : str
         Shaft sheet name. Default is 'Model'.
 
@@ -190,13 +335,14 @@ def load_shaft_from_xltrc(file, sheet_name='Model'):
     Examples
     --------
     """
-    df = pd.read_excel(file, sheet_name=sheet_name)
+    df = _sheet(file, sheet_name)
 
-    geometry = pd.DataFrame(df.iloc[19:])
+    # copies, since the sheets are cached and converted below
+    geometry = df.iloc[19:].copy()
     geometry = geometry.rename(columns=df.loc[18])
     geometry = geometry.dropna(thresh=3)
 
-    material = df.iloc[3:13, 9:15]
+    material = df.iloc[3:13, 9:15].copy()
     material = material.rename(columns=df.iloc[0])
     material = material.dropna(axis=0, how='all')
 
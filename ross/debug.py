@@ -11,6 +11,7 @@ from copy import copy
 from datetime import datetime
 from tqdm import tqdm
 from scipy.stats import norm
+from ross.data_io.read_xl import XLTRCWorkbook
 
 dis_folder = '/home/raphael/dissertacao/'
 folder = dis_folder + '/modelo_xltrc/analise_xltrc2/injection_bcl306c_ge_brg_coefs/'
@@ -26,13 +27,19 @@ bearing_nte_file = folder + 'bcl306c_brg_te_maxclr.xls'
 geseal_file = folder + 'bcl306c_honeycomb.xls'
 isotseal_file = folder + 'bcl306c_honeycomb_iso.xls'
 
-shaft = lr.ShaftElement.load_from_xltrc(rotor_file)
+# each workbook is parsed once and kept in a sidecar file
+rotor_workbook = XLTRCWorkbook(rotor_file, sidecar=True)
+bearing_te_workbook = XLTRCWorkbook(bearing_te_file, sidecar=True)
+bearing_nte_workbook = (bearing_te_workbook if bearing_nte_file == bearing_te_file
+                        else XLTRCWorkbook(bearing_nte_file, sidecar=True))
 
-bearing0 = lr.BearingElement.load_from_xltrc(8, bearing_nte_file)
-bearing1 = lr.BearingElement.load_from_xltrc(49, bearing_te_file)
+shaft = lr.ShaftElement.load_from_xltrc(rotor_workbook)
+
+bearing0 = lr.BearingElement.load_from_xltrc(8, bearing_nte_workbook)
+bearing1 = lr.BearingElement.load_from_xltrc(49, bearing_te_workbook)
 bearings = [bearing0, bearing1]
 
-disks = lr.LumpedDiskElement.load_from_xltrc(rotor_file)
+disks = lr.LumpedDiskElement.load_from_xltrc(rotor_workbook)
 
 rotor = lr.Rotor(shaft, disks, bearing_seal_elements=bearings, rated_w=1152, n_eigen=16)
 
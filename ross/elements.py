@@ -1,15 +1,5 @@
 import warnings
 import numpy as np
-import pandas as pd
-import scipy.interpolate as interpolate
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-from ross.data_io.read_xl import (
-    load_bearing_seals_from_yaml,
-    load_bearing_seals_from_xltrc,
-    load_disks_from_xltrc,
-    load_shaft_from_xltrc,
-)
 
 
 __all__ = [
@@ -33,7 +23,9 @@ class Element:
 
         A pandas series with the element properties as variables.
         """
-        attributes = self.__dict__
+        import pandas as pd
+
+        attributes = dict(self.__dict__)
         attributes["type"] = self.__class__.__name__
         return pd.Series(attributes)
 
@@ -371,6 +363,8 @@ class ShaftElement(Element):
         ax : matplotlib axes
             Returns the axes object with the plot.
         """
+        import matplotlib.patches as mpatches
+
         position_u = [position, self.i_d]  # upper
         position_l = [position, -self.o_d]  # lower
         width = self.L
@@ -483,16 +477,18 @@ class ShaftElement(Element):
     @classmethod
     def load_from_xltrc(cls, file, sheet_name="Model"):
         # TODO docstrings should be here not in the io module
+        from ross.data_io.read_xl import load_shaft_from_xltrc
+
         geometry, materials = load_shaft_from_xltrc(file, sheet_name)
         shaft = [
-            ShaftElement(
-                el.length,
-                el.id_Left,
-                el.od_Left,
-                materials[el.matnum],
-                n=el.elemnum - 1,
+            ShaftElement(L, i_d, o_d, materials[matnum], n=elemnum - 1)
+            for L, i_d, o_d, matnum, elemnum in zip(
+                geometry["length"].to_numpy(dtype=float),
+                geometry["id_Left"].to_numpy(dtype=float),
+                geometry["od_Left"].to_numpy(dtype=float),
+                geometry["matnum"].to_numpy(dtype=int).tolist(),
+                geometry["elemnum"].to_numpy(dtype=int).tolist(),
             )
-            for i, el in geometry.iterrows()
         ]
 
         return shaft
@@ -623,6 +619,8 @@ class LumpedDiskElement(Element):
         ax : matplotlib axes
             Returns the axes object with the plot.
         """
+        import matplotlib.patches as mpatches
+
         zpos, ypos = position
         D = ypos * 1.5
         hw = 0.005
@@ -652,8 +650,18 @@ class LumpedDiskElement(Element):
 
     @classmethod
     def load_from_xltrc(cls, file, sheet_name="More"):
+        from ross.data_io.read_xl import load_disks_from_xltrc
+
         df = load_disks_from_xltrc(file, sheet_name)
-        disks = [cls(d.n - 1, d.Mass, d.It, d.Ip) for _, d in df.iterrows()]
+        disks = [
+            cls(n - 1, m, It, Ip)
+            for n, m, It, Ip in zip(
+                df["n"].to_numpy(dtype=int).tolist(),
+                df["Mass"].to_numpy(dtype=float),
+                df["It"].to_numpy(dtype=float),
+                df["Ip"].to_numpy(dtype=float),
+            )
+        ]
 
         return disks
 
@@ -746,6 +754,8 @@ class DiskElement(LumpedDiskElement):
         ax : matplotlib axes
             Returns the axes object with the plot.
         """
+        import matplotlib.patches as mpatches
+
         if isinstance(position, tuple):
             position = position[0]
         zpos = position
@@ -786,12 +796,15 @@ class _Coefficient:
         self.w = w
 
         if len(self.coefficient) > 1:
+            import scipy.interpolate as interpolate
+
             try:
                 with warnings.catch_warnings():
                     warnings.simplefilter("ignore")
                     self.interpolated = interpolate.UnivariateSpline(
                         self.w, self.coefficient
                     )
+                    self.derivative = self.interpolated.derivative()
             #  dfitpack.error is not exposed by scipy
             #  so a bare except is used
             except:
@@ -800,8 +813,11 @@ class _Coefficient:
                 )
         else:
             self.interpolated = lambda x: np.array(self.coefficient[0])
+            self.derivative = lambda x: np.array(0.0)
 
     def plot(self, ax=None, **kwargs):
+        import matplotlib.pyplot as plt
+
         if ax is None:
             ax = plt.gca()
 
@@ -952,6 +968,28 @@ class BearingElement(Element):
 
         return C
 
+    def dK(self, w):
+        """Derivative of the stiffness matrix with respect to the speed."""
+        dkxx = self.kxx.derivative(w)
+        dkyy = self.kyy.derivative(w)
+        dkxy = self.kxy.derivative(w)
+        dkyx = self.kyx.derivative(w)
+
+        dK = np.array([[dkxx, dkxy], [dkyx, dkyy]])
+
+        return dK
+
+    def dC(self, w):
+        """Derivative of the damping matrix with respect to the speed."""
+        dcxx = self.cxx.derivative(w)
+        dcyy = self.cyy.derivative(w)
+        dcxy = self.cxy.derivative(w)
+        dcyx = self.cyx.derivative(w)
+
+        dC = np.array([[dcxx, dcxy], [dcyx, dcyy]])
+
+        return dC
+
     def patch(self, ax, position):
         """Bearing element patch.
 
@@ -969,6 +1007,8 @@ class BearingElement(Element):
         ax : matplotlib axes
             Returns the axes object with the plot.
         """
+        import matplotlib.patches as mpatches
+
         zpos, ypos = position
         h = -0.75 * ypos  # height
 
@@ -983,14 +1023,44 @@ class BearingElement(Element):
 
     @classmethod
     def load_from_yaml(cls, n, file):
+        from ross.data_io.read_xl import load_bearing_seals_from_yaml
+
         kwargs = load_bearing_seals_from_yaml(file)
         return cls(n, **kwargs)
 
     @classmethod
     def load_from_xltrc(cls, n, file, sheet_name="XLUseKCM"):
+        from ross.data_io.read_xl import load_bearing_seals_from_xltrc
+
         kwargs = load_bearing_seals_from_xltrc(file, sheet_name)
         return cls(n, **kwargs)
 
+    @classmethod
+    def load_from_table(cls, n, file, bearing=None, **case):
+        """Load a bearing from a coefficient table.
+
+        Parameters
+        ----------
+        n: int
+            Node in which the bearing will be inserted.
+        file : str, dict
+            Table file (.csv or .npz) or table already loaded with
+            ross.data_io.bearing_table.load_bearing_table.
+        bearing : str, optional
+            Bearing name, if the table has more than one bearing.
+        **case
+            Values of the case parameters (e.g. load=1e3, temperature=50).
+
+        Returns
+        -------
+        bearing : BearingElement
+        """
+        from ross.data_io.bearing_table import load_bearing_table, select_bearing
+
+        table = file if isinstance(file, dict) else load_bearing_table(file)
+        kwargs = select_bearing(table, bearing, **case)
+        return cls(n, **kwargs)
+
 
 class SealElement(BearingElement):
     def __init__(
@@ -1040,6 +1110,8 @@ class SealElement(BearingElement):
         ax : matplotlib axes
             Returns the axes object with the plot.
         """
+        import matplotlib.patches as mpatches
+
         zpos, ypos = position
         hw = 0.05
         # TODO adapt hw according to bal drum diameter
@@ -1151,8 +1223,8 @@ class IsotSealElement(SealElement):
         self.turbulence_coef_ms = turbulence_coef_ms
         self.turbulence_coef_nr = turbulence_coef_nr
         self.turbulence_coef_ns = turbulence_coef_ns
-        self.exit_axial_mach_number = exit_axial_mach_number,
-        self.exit_axial_reynolds_number = exit_axial_reynolds_number,
+        self.exit_axial_mach_number = exit_axial_mach_number
+        self.exit_axial_reynolds_number = exit_axial_reynolds_number
         self.exit_circumferential_reynolds_number = exit_circumferential_reynolds_number
         self.kxx_fd = kxx_fd
         self.cxx_fd = cxx_fd
@@ -0,0 +1,538 @@
+"""Fluid film bearings.
+
+This module calculates the stiffness and damping coefficients of fluid film
+journal bearings (plain and tilting pad) with the Reynolds equation, solved
+by finite differences:
+
+.. math::
+
+    \\frac{\\partial}{\\partial x}\\left(\\frac{h^3}{12\\mu}
+    \\frac{\\partial p}{\\partial x}\\right) +
+    \\frac{\\partial}{\\partial z}\\left(\\frac{h^3}{12\\mu}
+    \\frac{\\partial p}{\\partial z}\\right) =
+    \\frac{U}{2}\\frac{\\partial h}{\\partial x} + \\frac{\\partial h}{\\partial t}
+
+The film is isoviscous, with the oil viscosity at the bearing temperature,
+and the Reynolds boundary condition (p >= 0 with no flow into cavitated
+nodes) is obtained with an active set iteration. The perturbed pressures
+are obtained from the linearized equation, so that the displacement and
+velocity perturbations of all coordinates share one sparse factorization.
+"""
+import numpy as np
+import scipy.linalg as la
+import scipy.sparse as sparse
+import scipy.sparse.linalg as las
+
+from ross.cache import cached, content_hash
+from ross.elements import BearingElement
+
+__all__ = ['FluidFilmBearing', 'TiltingPadBearing']
+
+
+class _Film:
+    """Finite difference grid of a fluid film.
+
+    The nodes are in the interior of the film (p = 0 at the axial ends and,
+    if the film is not periodic, at the circumferential edges). Node (i, j)
+    is the unknown i * n_z + j.
+    """
+
+    def __init__(self, radius, length, theta0, arc, n_theta, n_z, periodic):
+        self.radius = radius
+        self.n_theta = n_theta
+        self.n_z = n_z
+        self.periodic = periodic
+
+        if periodic:
+            dtheta = arc / n_theta
+            first = theta0
+        else:
+            dtheta = arc / (n_theta + 1)
+            first = theta0 + dtheta
+        dz = length / (n_z + 1)
+        self.dx = radius * dtheta
+        self.dz = dz
+        self.area = self.dx * dz
+
+        self.theta = first + dtheta * np.arange(n_theta)
+        # face i is between nodes i - 1 and i
+        n_faces = n_theta if periodic else n_theta + 1
+        self.theta_faces = first + dtheta * (np.arange(n_faces) - 0.5)
+
+        nodes = np.arange(n_theta * n_z).reshape(n_theta, n_z)
+        left = np.arange(n_faces) - 1
+        right = np.arange(n_faces)
+        if periodic:
+            left %= n_theta
+        # (left, right) node of each theta face and z face, -1 outside
+        pad = np.full((1, n_z), -1)
+        padded = np.vstack([pad, nodes, pad])
+        if periodic:
+            theta_l = nodes[left]
+            theta_r = nodes[right]
+        else:
+            theta_l = padded[left + 1]
+            theta_r = padded[right + 1]
+        padded = np.hstack([np.full((n_theta, 1), -1), nodes,
+                            np.full((n_theta, 1), -1)])
+        z_l = padded[:, :-1]
+        z_r = padded[:, 1:]
+
+        # conductance of the faces (see _matrix) and their nodes
+        face_l = np.concatenate([theta_l.ravel(), z_l.ravel()])
+        face_r = np.concatenate([theta_r.ravel(), z_r.ravel()])
+        face = np.arange(len(face_l))
+        valid_l = face_l >= 0
+        valid_r = face_r >= 0
+        both = valid_l & valid_r
+        self._rows = np.concatenate([face_l[valid_l], face_r[valid_r],
+                                     face_l[both], face_r[both]])
+        self._cols = np.concatenate([face_l[valid_l], face_r[valid_r],
+                                     face_r[both], face_l[both]])
+        self._faces = np.concatenate([face[valid_l], face[valid_r],
+                                      face[both], face[both]])
+        self._signs = np.concatenate([np.ones(valid_l.sum() + valid_r.sum()),
+                                      -np.ones(2 * both.sum())])
+        self.size = n_theta * n_z
+        # the active set of the last solution is the first guess of the next
+        self._free = np.ones(self.size, dtype=bool)
+
+    def _matrix(self, k_faces, k_nodes):
+        """Matrix of the flow term for the conductances (h^3 / 12 mu).
+
+        k_faces are the conductances at the theta faces and k_nodes at the
+        nodes (h does not change with z).
+        """
+        conductance = np.concatenate([
+            np.repeat(k_faces / self.dx ** 2, self.n_z),
+            np.repeat(k_nodes / self.dz ** 2, self.n_z + 1)
+        ])
+        values = self._signs * conductance[self._faces]
+
+        return sparse.csr_matrix((values, (self._rows, self._cols)),
+                                 shape=(self.size, self.size))
+
+    def _wedge(self, h_faces):
+        """Difference of h between the faces around each node."""
+        following = (np.arange(self.n_theta) + 1) % len(h_faces)
+        return (h_faces[following] - h_faces[:self.n_theta]) / self.dx
+
+    def solve(self, h, g, mu, speed, max_iter=100):
+        """Pressure, forces and coefficients of the film.
+
+        Parameters
+        ----------
+        h : tuple
+            Film thickness at the faces and at the nodes.
+        g : tuple
+            Derivatives -dh/dq of the film thickness for each coordinate q,
+            at the faces and at the nodes, with shape (n, coordinates).
+        mu : float
+            Oil viscosity.
+        speed : float
+            Journal speed (rad/s).
+
+        Returns
+        -------
+        p : array
+            Pressure with shape (n_theta, n_z).
+        Q : array
+            Generalized forces -int(p g dA) for each coordinate.
+        K, C : array
+            Stiffness -dQ/dq and damping -dQ/dq' matrices.
+        """
+        h_faces, h_nodes = h
+        g_faces, g_nodes = g
+        U = speed * self.radius
+        n_q = g_nodes.shape[1]
+
+        A = self._matrix(h_faces ** 3 / (12 * mu), h_nodes ** 3 / (12 * mu))
+        f = np.repeat(-U / 2 * self._wedge(h_faces), self.n_z)
+
+        free = self._free
+        for _ in range(max_iter):
+            lu = las.splu(A[free][:, free].tocsc())
+            p = np.zeros(self.size)
+            p[free] = lu.solve(f[free])
+            # cavitated nodes with flow into them are released
+            new_free = np.where(free, p >= 0, A @ p - f < 0)
+            if (new_free == free).all():
+                break
+            free = new_free
+        else:
+            raise ValueError('The cavitation region did not converge.')
+        self._free = free
+
+        # linearized equations: A dp = df - dA p
+        rhs = np.empty((self.size, 2 * n_q))
+        for i in range(n_q):
+            dk_faces = -3 * h_faces ** 2 * g_faces[:, i] / (12 * mu)
+            dk_nodes = -3 * h_nodes ** 2 * g_nodes[:, i] / (12 * mu)
+            dA = self._matrix(dk_faces, dk_nodes)
+            df = np.repeat(U / 2 * self._wedge(g_faces[:, i]), self.n_z)
+            rhs[:, i] = df - dA @ p
+        rhs[:, n_q:] = np.repeat(g_nodes, self.n_z, axis=0)
+
+        dp = np.zeros((self.size, 2 * n_q))
+        dp[free] = lu.solve(rhs[free])
+
+        G = np.repeat(g_nodes, self.n_z, axis=0) * self.area
+        Q = -G.T @ p
+        K = G.T @ dp[:, :n_q]
+        C = G.T @ dp[:, n_q:]
+
+        return p.reshape(self.n_theta, self.n_z), Q, K, C
+
+
+def _reduce(Z):
+    """Condense the pad tilt (last coordinate) of a 3x3 matrix."""
+    if Z.shape == (2, 2) or Z[2, 2] == 0:
+        # plain bearing or unloaded pad
+        return Z[:2, :2]
+    return Z[:2, :2] - np.outer(Z[:2, 2], Z[2, :2]) / Z[2, 2]
+
+
+class FluidFilmBearing:
+    """Plain (360 degrees) fluid film journal bearing.
+
+    The coefficients are calculated with the Reynolds equation at the
+    static equilibrium position of the journal for each speed.
+
+    Parameters
+    ----------
+    diameter : float
+        Journal diameter (m).
+    length : float
+        Bearing axial length (m).
+    clearance : float
+        Radial clearance (m).
+    oil : ross.materials.Oil
+        Lubricant.
+    load : float
+        Static load on the bearing (N).
+    temperature : float, optional
+        Oil temperature (same unit as the oil, C). Default is 40.
+    load_angle : float, optional
+        Direction of the load from the x axis (rad).
+        Default is -pi / 2 (load in -y).
+    n_theta, n_z : int, optional
+        Number of nodes in the circumferential and axial directions.
+        Defaults are 72 and 16.
+    cache : ross.ResultsCache, optional
+        Cache used to store the coefficients for each speed, keyed on the
+        geometry, oil, load and grid. Default is None.
+
+    Examples
+    --------
+    >>> from ross.materials import Oil
+    >>> oil = Oil(t_a=40, rho_a=856.8, mu_a=0.0256, t_b=100, mu_b=0.0042)
+    >>> bearing = FluidFilmBearing(0.1, 0.05, 100e-6, oil, load=2000)
+    >>> coefficients = bearing.coefficients(300)
+    >>> round(coefficients['eccentricity'], 2)
+    0.41
+    >>> element = bearing.bearing_element(0, np.linspace(100, 400, 4))
+    >>> element.w
+    array([ 100.,  200.,  300.,  400.])
+    """
+
+    def __init__(self, diameter, length, clearance, oil, load, temperature=40,
+                 load_angle=-np.pi / 2, n_theta=72, n_z=16, cache=None):
+        self.diameter = diameter
+        self.length = length
+        self.clearance = clearance
+        self.oil = oil
+        self.load = load
+        self.temperature = temperature
+        self.load_angle = load_angle
+        self.n_theta = n_theta
+        self.n_z = n_z
+        self.cache = cache
+
+        self._films = self._create_films()
+        self._equilibrium = None
+
+    def __repr__(self):
+        return (f'{self.__class__.__name__}(diameter={self.diameter}, '
+                f'length={self.length}, clearance={self.clearance}, '
+                f'load={self.load})')
+
+    def model_hash(self):
+        """Content hash of the bearing used as a key by the cache."""
+        attributes = {k: v for k, v in vars(self).items()
+                      if k != 'cache' and not k.startswith('_')}
+        return content_hash(self.__class__.__name__, attributes)
+
+    def _create_films(self):
+        radius = self.diameter / 2
+        return [_Film(radius, self.length, 0, 2 * np.pi, self.n_theta,
+                      self.n_z, periodic=True)]
+
+    def _film(self, film, position, tilt):
+        """Film thickness and its derivatives -dh/dq at faces and nodes."""
+        x, y = position
+        h, g = [], []
+        for theta in (film.theta_faces, film.theta):
+            g.append(np.column_stack([np.cos(theta), np.sin(theta)]))
+            h.append(self.clearance - x * np.cos(theta) - y * np.sin(theta))
+
+        return h, g
+
+    def _pads(self, speed, position, tilts):
+        """Forces and coefficients (2x2 or 3x3) of each film."""
+        mu = self.oil.mu(self.temperature)
+        results = []
+        for film, tilt in zip(self._films, tilts):
+            h, g = self._film(film, position, tilt)
+            results.append(film.solve(h, g, mu, speed)[1:])
+
+        return results
+
+    def _min_film(self, position, tilts):
+        return min(self._film(film, position, tilt)[0][1].min()
+                   for film, tilt in zip(self._films, tilts))
+
+    def equilibrium(self, speed, max_iter=50, tol=1e-8):
+        """Static equilibrium of the journal.
+
+        Parameters
+        ----------
+        speed : float
+            Journal speed (rad/s).
+
+        Returns
+        -------
+        position : array
+            Journal position (x, y) relative to the bearing center (m).
+        tilts : array
+            Pad tilts (rad), empty for plain bearings.
+        pads : list
+            Forces, stiffness and damping of each film at the equilibrium.
+        """
+        if speed <= 0:
+            raise ValueError('Speed must be positive to support the load.')
+
+        W = self.load * np.array([np.cos(self.load_angle),
+                                  np.sin(self.load_angle)])
+        # start from the last equilibrium (e.g. the previous speed)
+        if self._equilibrium is None:
+            position = 0.3 * self.clearance * W / self.load
+            tilts = np.zeros(len(self._films))
+        else:
+            position, tilts = self._equilibrium
+
+        for _ in range(max_iter):
+            tilts, pads = self._tilt_equilibrium(speed, position, tilts)
+            residual = sum(Q[:2] for Q, K, C in pads) + W
+            if np.linalg.norm(residual) < tol * self.load:
+                self._equilibrium = position, tilts
+                return position, tilts, pads
+
+            K = sum(_reduce(K) for Q, K, C in pads)
+            step = la.solve(K, residual)
+            # keep the journal inside the bearing
+            while self._min_film(position + step, tilts) <= 0:
+                step /= 2
+            position = position + step
+
+        raise ValueError(f'Equilibrium not found for speed {speed}.')
+
+    def _tilt_equilibrium(self, speed, position, tilts):
+        return tilts, self._pads(speed, position, tilts)
+
+    @cached
+    def coefficients(self, speed):
+        """Bearing coefficients at the static equilibrium.
+
+        Parameters
+        ----------
+        speed : float
+            Journal speed (rad/s). Pad tilts are condensed at the
+            synchronous frequency.
+
+        Returns
+        -------
+        coefficients : dict
+            Dictionary with kxx, kxy, kyx, kyy, cxx, cxy, cyx, cyy,
+            the journal position (x, y), eccentricity (ratio to the
+            clearance) and attitude_angle (rad, from the load direction).
+        """
+        position, tilts, pads = self.equilibrium(speed)
+        Z = sum(_reduce(K + 1j * speed * C) for Q, K, C in pads)
+        K, C = Z.real, Z.imag / speed
+
+        x, y = position
+        attitude_angle = np.arctan2(y, x) - self.load_angle
+        coefficients = {
+            'kxx': K[0, 0], 'kxy': K[0, 1], 'kyx': K[1, 0], 'kyy': K[1, 1],
+            'cxx': C[0, 0], 'cxy': C[0, 1], 'cyx': C[1, 0], 'cyy': C[1, 1],
+            'x': x, 'y': y,
+            'eccentricity': np.hypot(x, y) / self.clearance,
+            'attitude_angle': (attitude_angle + np.pi) % (2 * np.pi) - np.pi,
+        }
+
+        return {k: float(v) for k, v in coefficients.items()}
+
+    def bearing_element(self, n, speeds):
+        """Bearing element with the coefficients for a speed range.
+
+        Parameters
+        ----------
+        n : int
+            Node in which the bearing will be inserted.
+        speeds : array
+            Speeds (rad/s) in which the coefficients are calculated.
+
+        Returns
+        -------
+        bearing : ross.elements.BearingElement
+        """
+        names = ['kxx', 'kxy', 'kyx', 'kyy', 'cxx', 'cxy', 'cyx', 'cyy']
+        speeds = np.asarray(speeds, dtype=np.float64)
+        coefficients = [self.coefficients(speed) for speed in speeds]
+        table = np.array([[c[name] for name in names] for c in coefficients])
+
+        return BearingElement(n, w=speeds, **dict(zip(names, table.T)))
+
+
+class TiltingPadBearing(FluidFilmBearing):
+    """Tilting pad fluid film journal bearing.
+
+    Each pad tilts freely about its pivot until the moment of the film
+    pressure is zero. The coefficients are reduced to the journal
+    coordinates at the synchronous frequency, neglecting the pad inertia.
+
+    Parameters
+    ----------
+    diameter : float
+        Journal diameter (m).
+    length : float
+        Pad axial length (m).
+    clearance : float
+        Assembled (bearing) radial clearance (m).
+    oil : ross.materials.Oil
+        Lubricant.
+    load : float
+        Static load on the bearing (N).
+    n_pads : int, optional
+        Number of pads. Default is 4.
+    pad_arc : float, optional
+        Arc of each pad (rad). Default is 80% of 2 pi / n_pads.
+    pivot_offset : float, optional
+        Pivot position as a fraction of the arc from the leading edge.
+        Default is 0.5.
+    preload : float, optional
+        Preload 1 - clearance / pad clearance. Default is 0.
+    first_pivot : float, optional
+        Angle of the first pivot from the x axis (rad). Default is
+        -3 pi / 4 (load between pads for the default load direction).
+    temperature, load_angle, cache
+        See FluidFilmBearing.
+    n_theta, n_z : int, optional
+        Number of nodes in each pad. Defaults are 24 and 12.
+
+    Examples
+    --------
+    >>> from ross.materials import Oil
+    >>> oil = Oil(t_a=40, rho_a=856.8, mu_a=0.0256, t_b=100, mu_b=0.0042)
+    >>> bearing = TiltingPadBearing(0.1, 0.05, 100e-6, oil, load=2000,
+    ...                             preload=0.3)
+    >>> coefficients = bearing.coefficients(300)
+    >>> abs(coefficients['kxy']) < 1e-3 * coefficients['kxx']
+    True
+    """
+
+    def __init__(self, diameter, length, clearance, oil, load, n_pads=4,
+                 pad_arc=None, pivot_offset=0.5, preload=0,
+                 first_pivot=-3 * np.pi / 4, temperature=40,
+                 load_angle=-np.pi / 2, n_theta=24, n_z=12, cache=None):
+        if pad_arc is None:
+            pad_arc = 0.8 * 2 * np.pi / n_pads
+        self.n_pads = n_pads
+        self.pad_arc = pad_arc
+        self.pivot_offset = pivot_offset
+        self.preload = preload
+        self.first_pivot = first_pivot
+
+        super().__init__(diameter, length, clearance, oil, load,
+                         temperature=temperature, load_angle=load_angle,
+                         n_theta=n_theta, n_z=n_z, cache=cache)
+
+    def _pivots(self):
+        return self.first_pivot + 2 * np.pi * np.arange(self.n_pads) / self.n_pads
+
+    def _create_films(self):
+        radius = self.diameter / 2
+        films = []
+        for pivot in self._pivots():
+            film = _Film(radius, self.length,
+                         pivot - self.pivot_offset * self.pad_arc,
+                         self.pad_arc, self.n_theta, self.n_z, periodic=False)
+            film.pivot = pivot
+            films.append(film)
+
+        return films
+
+    def _film(self, film, position, tilt):
+        x, y = position
+        pivot = film.pivot
+        pad_clearance = self.clearance / (1 - self.preload)
+        radius = self.diameter / 2
+
+        h, g = [], []
+        for theta in (film.theta_faces, film.theta):
+            g.append(np.column_stack([np.cos(theta), np.sin(theta),
+                                      radius * np.sin(theta - pivot)]))
+            h.append(pad_clearance
+                     - (pad_clearance - self.clearance) * np.cos(theta - pivot)
+                     - x * np.cos(theta) - y * np.sin(theta)
+                     - tilt * radius * np.sin(theta - pivot))
+
+        return h, g
+
+    def _tilt_limits(self, film, position):
+        """Range of tilts in which the pad does not touch the journal."""
+        h, g = self._film(film, position, 0)
+        h = np.concatenate(h)
+        b = np.concatenate([g[0][:, 2], g[1][:, 2]])
+        # h = h(0) - tilt * b
+        upper = (h[b > 0] / b[b > 0]).min()
+        lower = (h[b < 0] / b[b < 0]).max()
+        margin = 1e-3 * (upper - lower)
+
+        return lower + margin, upper - margin
+
+    def _tilt_equilibrium(self, speed, position, tilts, max_iter=100,
+                          tol=1e-10):
+        """Tilt of each pad with zero moment for a journal position.
+
+        The film is cavitated (zero moment) near the contact of the leading
+        edge and the moment is negative near the contact of the trailing
+        edge, so the loaded tilt is bracketed and the Newton iteration is
+        safeguarded with bisection. Pads without a loaded tilt converge to
+        the tilt where the pressure starts.
+        """
+        tilts = np.array(tilts, dtype=np.float64)
+        radius = self.diameter / 2
+        mu = self.oil.mu(self.temperature)
+        pads = []
+        for i, film in enumerate(self._films):
+            lower, upper = self._tilt_limits(film, position)
+            tilt = np.clip(tilts[i], lower, upper)
+            for _ in range(max_iter):
+                h, g = self._film(film, position, tilt)
+                Q, K, C = film.solve(h, g, mu, speed)[1:]
+                # a cavitated pad (zero moment) is opened by smaller tilts
+                if Q[2] >= 0:
+                    lower = tilt
+                else:
+                    upper = tilt
+                new = tilt + Q[2] / K[2, 2] if K[2, 2] > 0 else np.nan
+                if not lower < new < upper:
+                    new = (lower + upper) / 2
+                if abs(new - tilt) * radius < tol * self.clearance:
+                    break
+                tilt = new
+            tilts[i] = tilt
+            pads.append((Q, K, C))
+
+        return tilts, pads
@@ -0,0 +1,40 @@
+"""Plotting module.
+
+This module holds the matplotlib style used by ross. matplotlib is not
+imported with ross; it is imported and configured on the first plot, so
+that analyses that do not plot do not pay for it.
+"""
+
+__all__ = ['set_style', 'seaborn_colors']
+
+seaborn_colors = ['#4c72b0', '#55a868', '#c44e52',
+                  '#8172b2', '#ccb974', '#64b5cd']
+
+_style = {
+    'lines.linewidth': 2.5,
+    'axes.grid': True,
+    'axes.linewidth': 0.1,
+    'grid.color': '.9',
+    'grid.linestyle': '--',
+    'legend.frameon': True,
+    'legend.framealpha': 0.2
+}
+
+_style_set = False
+
+
+def set_style():
+    """Set the ross style for matplotlib.
+
+    This is called by the plot methods. The style is applied only once,
+    so changes made by the user after the first plot are kept.
+    """
+    global _style_set
+    if _style_set:
+        return
+
+    import matplotlib.pyplot as plt
+
+    plt.style.use('seaborn-white')
+    plt.style.use(_style)
+    _style_set = True
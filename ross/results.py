@@ -1,7 +1,288 @@
-import pickle
 import numpy as np
-import matplotlib as mpl
-import matplotlib.pyplot as plt
+from ross.data_io.npz import save_npz, load_npz
+from ross.plotting import set_style, seaborn_colors
+
+
+def _peaks(x, y, method='rational'):
+    """Peaks and half power points of curves.
+
+    Peaks are the local maxima of each curve. With method='rational',
+    the peak is refined with a quadratic fitted to 1 / y**2 at the three
+    points around it (second order accurate near the peak) and
+    the half power points are interpolated linearly in 1 / y**2, or taken
+    from the fitted quadratic when they fall between the peak and its
+    neighbours. This resolves peaks narrower than the grid spacing.
+    With method='linear', the grid maximum and linearly interpolated half
+    power points are used.
+
+    Parameters
+    ----------
+    x : array
+        Abscissa (e.g. speed) with shape (n,).
+    y : array
+        Amplitudes with shape (..., n).
+    method : str, optional
+        'rational' (default) or 'linear'.
+
+    Returns
+    -------
+    index : tuple
+        Index of the curve (y[..., 0] shape) for each peak.
+    x_peak, y_peak : array
+        Location and amplitude of each peak.
+    x1, x2 : array
+        Half power points (y = y_peak / sqrt(2)) before and after each
+        peak (nan if not found).
+    """
+    if method not in ['rational', 'linear']:
+        raise ValueError(f'Invalid method {method}.')
+
+    x = np.asarray(x)
+    y = np.asarray(y)
+
+    is_peak = np.zeros(y.shape, dtype=bool)
+    is_peak[..., 1:-1] = (y[..., 1:-1] > y[..., :-2]) & (y[..., 1:-1] >= y[..., 2:])
+    *index, i_peak = np.nonzero(is_peak)
+    index = tuple(index)
+
+    curves = y[index]
+    peaks = np.arange(len(i_peak))
+    y_peak = curves[peaks, i_peak]
+    x_peak = x[i_peak]
+    fitted = np.zeros(len(i_peak), dtype=bool)
+
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        if method == 'rational' and len(i_peak):
+            # 1 / y**2 = c2 * x**2 + c1 * x + c0 around each peak
+            jj = i_peak[:, np.newaxis] + np.arange(-1, 2)
+            xx = x[jj]
+            yy = 1 / curves[peaks[:, np.newaxis], jj] ** 2
+            V = np.stack([xx ** 2, xx, np.ones_like(xx)], axis=-1)
+            fitted = np.isfinite(yy).all(axis=1)
+            c = np.zeros((len(i_peak), 3))
+            c[fitted] = np.linalg.solve(V[fitted], yy[fitted, :, np.newaxis])[..., 0]
+            c2, c1, c0 = c.T
+
+            x0 = -c1 / (2 * c2)
+            b = c0 - c1 ** 2 / (4 * c2)
+            fitted &= (c2 > 0) & (b > 0) & (x0 >= xx[:, 0]) & (x0 <= xx[:, 2])
+
+            x_peak = np.where(fitted, x0, x_peak)
+            y_peak = np.where(fitted, 1 / np.sqrt(b), y_peak)
+            width = np.sqrt(b / c2)
+
+        half_power = y_peak / np.sqrt(2)
+
+        j = np.arange(len(x))
+        below = curves < half_power[:, np.newaxis]
+
+        # last point below the half power before the peak
+        left = np.where(below & (j < i_peak[:, np.newaxis]), j, -1).max(axis=1)
+        # first point below the half power after the peak
+        right = np.where(below & (j > i_peak[:, np.newaxis]), j, len(x)).min(axis=1)
+
+        def crossing(j0, j1, valid):
+            j0 = np.where(valid, j0, 0)
+            j1 = np.where(valid, j1, 0)
+            if method == 'rational':
+                f, f0, f1 = (1 / v ** 2 for v in
+                             [half_power, curves[peaks, j0], curves[peaks, j1]])
+            else:
+                f, f0, f1 = half_power, curves[peaks, j0], curves[peaks, j1]
+            xc = x[j0] + (f - f0) * (x[j1] - x[j0]) / (f1 - f0)
+            return np.where(valid, xc, np.nan)
+
+        x1 = crossing(left, left + 1, left >= 0)
+        x2 = crossing(right - 1, right, right < len(x))
+
+    if method == 'rational':
+        # half power points between the peak and its neighbours
+        x1 = np.where(fitted & (left >= i_peak - 1), x_peak - width, x1)
+        x2 = np.where(fitted & (right <= i_peak + 1), x_peak + width, x2)
+
+    return index, x_peak, y_peak, x1, x2
+
+
+def _peak_table(shape, index, *values):
+    """Arrange values for each peak in arrays padded with nan.
+
+    Parameters
+    ----------
+    shape : tuple
+        Shape of the curves (y[..., 0] shape).
+    index : tuple
+        Index of the curve for each peak (see _peaks).
+    values : array
+        Values for each peak.
+
+    Returns
+    -------
+    tables : list
+        Arrays with shape shape + (maximum number of peaks,).
+    """
+    count = np.zeros(shape, dtype=int)
+    np.add.at(count, index, 1)
+    count = count.ravel()
+    position = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+
+    tables = []
+    for v in values:
+        table = np.full(tuple(shape) + (max(count.max(initial=0), 1),), np.nan)
+        table[index + (position,)] = v
+        tables.append(table)
+
+    return tables
+
+
+def _separation_margin(speed, af, min_w=None, max_w=None):
+    """Separation margin and separation margin required by API 684.
+
+    Parameters
+    ----------
+    speed : array
+        Critical speeds.
+    af : array
+        Amplification factors.
+    min_w, max_w : float, optional
+        Operating speed range.
+
+    Returns
+    -------
+    sm, sm_required : array
+        Separation margin (%) from the operating speed range (0 inside
+        the range) and the separation margin required by API 684
+        (0 when af < 2.5).
+    """
+    speed = np.asarray(speed, dtype=float)
+    af = np.asarray(af, dtype=float)
+    sm = np.zeros_like(speed)
+    sm_required = np.zeros_like(speed)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if min_w is not None:
+            below = speed < min_w
+            sm[below] = 100 * (min_w - speed[below]) / min_w
+            sm_required[below] = np.minimum(16, 17 * (1 - 1 / (af[below] - 1.5)))
+        if max_w is not None:
+            above = speed > max_w
+            sm[above] = 100 * (speed[above] - max_w) / max_w
+            sm_required[above] = np.minimum(26, 10 + 17 * (1 - 1 / (af[above] - 1.5)))
+
+    sm_required[af < 2.5] = 0
+    sm[np.isnan(speed)] = np.nan
+    sm_required[np.isnan(af)] = np.nan
+
+    return sm, sm_required
+
+
+def _ellipse(u, v):
+    """Ellipse parameters for arrays of x and y complex amplitudes.
+
+    The orbit x = Re(u e^(jwt)), y = Re(v e^(jwt)) is an ellipse with axes
+    given by the square root of the eigenvalues of H = T.T^T
+    (see Rotor.H_kappa). The eigenvalues of the 2x2 matrix are obtained
+    in closed form, so any number of orbits is handled at once.
+
+    Parameters
+    ----------
+    u, v : array
+        Complex amplitudes in the x and y directions.
+
+    Returns
+    -------
+    major, minor : array
+        Semi-major and semi-minor axes.
+    kappa : array
+        Ratio minor / major, positive for forward and negative for
+        backward whirl (0 for straight lines).
+    angle : array
+        Inclination (rad) of the major axis from the x axis.
+    """
+    ru = np.absolute(u)
+    rv = np.absolute(v)
+    nu = np.angle(u)
+    nv = np.angle(v)
+
+    h00 = ru ** 2
+    h11 = rv ** 2
+    h01 = ru * rv * np.cos(nu - nv)
+    center = (h00 + h11) / 2
+    radius = np.sqrt(((h00 - h11) / 2) ** 2 + h01 ** 2)
+
+    major = np.sqrt(center + radius)
+    minor = np.sqrt(np.maximum(center - radius, 0))
+    angle = np.arctan2(2 * h01, h00 - h11) / 2
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        kappa = minor / major
+
+    diff = nv - nu
+    diff = np.where(diff < -np.pi, diff + 2 * np.pi, diff)
+    diff = np.where(diff > np.pi, diff - 2 * np.pi, diff)
+
+    kappa = np.where((diff == 0) | (diff == np.pi), 0, kappa)
+    kappa = np.where((0 < diff) & (diff < np.pi), -kappa, kappa)
+
+    return major, minor, kappa, angle
+
+
+# dof axes and dof names (4 dofs for each node)
+_dof_dims = ('dof', 'input', 'output')
+_dof_names = {'x': 0, 'y': 1, 'alpha': 2, 'beta': 3}
+
+
+def _as_index(positions):
+    """Slice for regularly spaced positions (to obtain views), else array."""
+    positions = np.asarray(positions, dtype=int)
+    if len(positions) == 1:
+        return slice(positions[0], positions[0] + 1)
+    if len(positions) > 1:
+        step = positions[1] - positions[0]
+        if step > 0 and np.all(np.diff(positions) == step):
+            return slice(positions[0], positions[-1] + 1, step)
+    if len(positions) == 0:
+        return slice(0, 0)
+    return positions
+
+
+def _select(array, dims, index):
+    """Select from an array with named axes.
+
+    Integers and slices are applied with basic indexing (a view is
+    returned) and arrays of positions are applied to each axis with
+    np.take.
+    """
+    if not isinstance(array, np.ndarray):
+        array = np.asarray(array)
+    basic = []
+    for dim in dims:
+        i = index.get(dim, slice(None))
+        if isinstance(i, (int, np.integer)):
+            basic.append(slice(i, i + 1) if i != -1 else slice(-1, None))
+        elif isinstance(i, slice):
+            basic.append(i)
+        else:
+            basic.append(slice(None))
+    array = array[tuple(basic) + (Ellipsis,)]
+
+    for axis, dim in enumerate(dims):
+        i = index.get(dim)
+        if i is not None and not isinstance(i, (int, np.integer, slice)):
+            array = np.take(array, i, axis=axis)
+
+    # remove the axes selected with integers
+    return array[tuple(0 if isinstance(index.get(dim), (int, np.integer))
+                       else slice(None) for dim in dims) + (Ellipsis,)]
+
+
+def _equal(a, b):
+    """Equality for attributes (arrays, lists, numbers, None)."""
+    if a is b:
+        return True
+    try:
+        return np.array_equal(a, b, equal_nan=True)
+    except TypeError:
+        return np.array_equal(a, b)
 
 
 class Results(np.ndarray):
@@ -15,10 +296,35 @@ class Results(np.ndarray):
 
     Additional attributes can be passed as a dictionary in new_attributes kwarg.
 
+    The axes have names (dims) and can be selected by label with the sel
+    method, which also selects the attributes aligned with the axes
+    (e.g. frequency_range for the frequency axis). Indexing with
+    integers, slices and arrays of positions (results[4], results[:, 2:5])
+    selects the same attributes; other indexes and operations that change
+    the shape drop the axes names and the aligned attributes.
+
     """
+    # attributes calculated from the array on access (see ComplexResults)
+    _derived = ()
+    # axes names, attributes with the labels of an axis, fixed labels of
+    # an axis and axes of the attributes aligned with the array axes
+    _dims = None
+    _coords = {}
+    _labels = {}
+    _attribute_dims = {}
+
     def __new__(cls, input_array, new_attributes=None):
         obj = np.asarray(input_array).view(cls)
 
+        # derived attributes passed by older versions are dropped
+        new_attributes = {k: v for k, v in (new_attributes or {}).items()
+                          if k not in cls._derived}
+
+        dims = new_attributes.get('dims', cls._dims)
+        if dims is None or len(dims) != obj.ndim:
+            dims = [f'dim_{i}' for i in range(obj.ndim)]
+        new_attributes['dims'] = tuple(str(dim) for dim in dims)
+
         # TODO evaluate if new_attributes is useful. Slicing may by a problem
         for k, v in new_attributes.items():
             setattr(obj, k, v)
@@ -33,11 +339,90 @@ class Results(np.ndarray):
             return
 
         try:
-            for k, v in obj._new_attributes.items():
-                setattr(self, k, getattr(obj, k, v))
+            new_attributes = dict(obj._new_attributes)
         except AttributeError:
             return
 
+        if self.shape != obj.shape:
+            # the axes of arrays with another shape are unknown (see
+            # __getitem__), so names and aligned attributes are dropped
+            new_attributes = {k: v for k, v in new_attributes.items()
+                              if k not in obj._attribute_dims}
+            new_attributes['dims'] = tuple(f'dim_{i}'
+                                           for i in range(self.ndim))
+            for k, v in new_attributes.items():
+                setattr(self, k, v)
+        else:
+            for k, v in new_attributes.items():
+                setattr(self, k, getattr(obj, k, v))
+        self._new_attributes = new_attributes
+
+    def __getitem__(self, key):
+        result = super().__getitem__(key)
+        if not isinstance(result, Results):
+            return result
+
+        # indexing along the axes keeps their names and the aligned
+        # attributes, as sel does
+        index = self._axes_index(key)
+        if index is not None:
+            new_attributes = self._selected_attributes(index)
+            for k, v in new_attributes.items():
+                setattr(result, k, v)
+            result._new_attributes = new_attributes
+
+        return result
+
+    def _axes_index(self, key):
+        """Index for each axis of a numpy index.
+
+        Returns None for indexes that do not select along the axes (new
+        axes, booleans with several dimensions or several arrays, which
+        are broadcast together).
+        """
+        if not isinstance(key, tuple):
+            key = (key,)
+
+        items = []
+        for item in key:
+            if item is None or isinstance(item, (bool, np.bool_)):
+                return None
+            if item is Ellipsis or isinstance(item, (slice, int, np.integer)):
+                items.append(item)
+                continue
+            item = np.asarray(item)
+            if item.dtype == bool and item.ndim == 1:
+                item = np.flatnonzero(item)
+            if not np.issubdtype(item.dtype, np.integer) or item.ndim > 1:
+                return None
+            items.append(int(item) if item.ndim == 0 else item)
+
+        if sum(isinstance(item, np.ndarray) for item in items) > 1:
+            return None
+        ellipsis = [i for i, item in enumerate(items) if item is Ellipsis]
+        if len(ellipsis) > 1:
+            return None
+        if ellipsis:
+            i = ellipsis[0]
+            items[i:i + 1] = [slice(None)] * (self.ndim - len(items) + 1)
+
+        return dict(zip(self.dims, items))
+
+    def _selected_attributes(self, index):
+        """Attributes for the results selected with an index of each axis."""
+        dims = tuple(dim for dim in self.dims
+                     if not isinstance(index.get(dim), (int, np.integer)))
+        new_attributes = {}
+        for name in self._new_attributes:
+            value = getattr(self, name)
+            attribute_dims = self._attribute_dims_of(name)
+            if attribute_dims is not None:
+                value = _select(value, attribute_dims, index)
+            new_attributes[name] = value
+        new_attributes['dims'] = dims
+
+        return new_attributes
+
     def __reduce__(self):
         # TODO add documentation explaining reduce, setstate and save.
         pickled_state = super().__reduce__()
@@ -46,20 +431,359 @@ class Results(np.ndarray):
         return (pickled_state[0], pickled_state[1], new_state)
 
     def __setstate__(self, state):
-        self._new_attributes = state[-1]
+        self._new_attributes = {k: v for k, v in state[-1].items()
+                                if k not in self._derived}
         for k, v in self._new_attributes.items():
             setattr(self, k, v)
         super().__setstate__(state[0:-1])
 
+    @property
+    def coords(self):
+        """Labels for the axes that have labels."""
+        coords = {dim: np.asarray(getattr(self, attribute))
+                  for dim, attribute in self._coords.items()
+                  if dim in self.dims and hasattr(self, attribute)}
+        coords.update({dim: np.array(labels) for dim, labels in self._labels.items()
+                       if dim in self.dims})
+
+        return coords
+
+    def _attribute_dims_of(self, name):
+        """Current axes of an attribute aligned with the array axes."""
+        dims = self._attribute_dims.get(name)
+        if dims is None:
+            return None
+        # axes removed from the array by sel are removed from the attributes
+        class_dims = self._dims or ()
+        return tuple(dim for dim in dims if dim in self.dims or dim not in class_dims)
+
+    def _positions(self, dim, label, method=None):
+        """Index (int, slice or array) for a label of an axis."""
+        coords = self.coords
+        size = self.shape[self.dims.index(dim)]
+
+        coord = coords.get(dim)
+        if dim in _dof_dims:
+            coord = coords.get(dim, np.arange(size))
+
+        if isinstance(label, slice) and coord is not None:
+            mask = np.ones(len(coord), dtype=bool)
+            if label.start is not None:
+                mask &= coord >= label.start
+            if label.stop is not None:
+                mask &= coord <= label.stop
+            return _as_index(np.flatnonzero(mask)[::label.step])
+
+        if dim in _dof_dims:
+            # global dof numbers for (node, 'x'), 'x' or dof
+            if isinstance(label, tuple):
+                node, name = label
+                targets = 4 * np.asarray(node) + _dof_names[name]
+            elif isinstance(label, str):
+                targets = coord[coord % 4 == _dof_names[label]]
+            else:
+                targets = np.asarray(label)
+
+            if targets.ndim == 0:
+                position = np.flatnonzero(coord == targets)
+                if len(position) == 0:
+                    raise KeyError(f'{label} not found in {dim}.')
+                return int(position[0])
+            return _as_index(np.flatnonzero(np.isin(coord, targets)))
+
+        if coord is None:
+            if isinstance(label, (slice, int, np.integer)):
+                return label
+            return _as_index(np.asarray(label))
+
+        if isinstance(label, (list, tuple, np.ndarray)):
+            return _as_index(np.array([self._positions(dim, value, method)
+                                       for value in label], dtype=int))
+
+        position = np.flatnonzero(coord == label)
+        if len(position):
+            return int(position[0])
+        if method == 'nearest':
+            return int(np.argmin(np.abs(coord - label)))
+        raise KeyError(f'{label} not found in {dim}.')
+
+    def sel(self, method=None, **indexers):
+        """Select by axis name and label.
+
+        Labels are values of the axis coordinate (e.g. frequency_range for
+        the frequency axis) or positions if the axis has no coordinate.
+        A label selects a single value (the axis is removed), a slice
+        selects the labels between start and stop (inclusive) and a list
+        selects several labels. For dof axes ('dof', 'input' and
+        'output'), labels are dof numbers, (node, 'x') tuples or the dof
+        names 'x', 'y', 'alpha' and 'beta' (all nodes), and the node
+        keyword selects the dofs of a node.
+
+        Single labels and slices (and regularly spaced lists) return
+        views of the results, so no data is copied.
+
+        Parameters
+        ----------
+        method : str, optional
+            If 'nearest', the nearest label is used for labels that are
+            not in the coordinate. Default is None (exact labels).
+        indexers : optional
+            Labels for each axis (e.g. frequency=100, node=2, dof='x').
+
+        Returns
+        -------
+        results : ross.Results
+            Results with the selected values and attributes.
+
+        Examples
+        --------
+        >>> from ross.rotor import rotor_example
+        >>> rotor = rotor_example()
+        >>> response = rotor.unbalance_response(2, 1e-4, 0,
+        ...                                     np.linspace(0, 1000, 11))
+        >>> response.dims
+        ('dof', 'frequency')
+        >>> response.sel(node=3, dof='x').shape
+        (11,)
+        >>> response.sel(dof='y', frequency=slice(200, 500)).shape
+        (7, 4)
+        """
+        indexers = dict(indexers)
+        node = indexers.pop('node', None) if 'node' not in self.dims else None
+        if node is not None:
+            name = indexers.pop('dof', None)
+            if name is None:
+                indexers['dof'] = list(4 * node + np.arange(4))
+            else:
+                indexers['dof'] = (node, name)
+
+        for dim in indexers:
+            if dim not in self.dims:
+                raise ValueError(f'{dim} is not an axis of {self.dims}.')
+
+        index = {dim: self._positions(dim, label, method)
+                 for dim, label in indexers.items()}
+
+        return type(self)(_select(np.asarray(self), self.dims, index),
+                          self._selected_attributes(index))
+
+    @staticmethod
+    def concatenate(results, dim):
+        """Concatenate results (e.g. calculated in parts) along an axis.
+
+        Attributes aligned with the axis (see sel) are concatenated and
+        the other attributes must be equal for all parts.
+
+        Parameters
+        ----------
+        results : list
+            List with the results.
+        dim : str
+            Name of the axis.
+
+        Returns
+        -------
+        results : ross.Results
+            Concatenated results with the class of the first results.
+
+        Examples
+        --------
+        >>> from ross.rotor import rotor_example
+        >>> rotor = rotor_example()
+        >>> parts = [rotor.unbalance_response(2, 1e-4, 0, speed)
+        ...          for speed in np.split(np.linspace(0, 1000, 10), 2)]
+        >>> response = Results.concatenate(parts, 'frequency')
+        >>> response.shape
+        (28, 10)
+        """
+        first = results[0]
+        axis = first.dims.index(dim)
+        data = np.concatenate([np.asarray(r) for r in results], axis=axis)
+
+        new_attributes = {}
+        for name in first._new_attributes:
+            values = [getattr(r, name) for r in results]
+            attribute_dims = first._attribute_dims_of(name)
+            if attribute_dims is not None and dim in attribute_dims:
+                values = np.concatenate([np.asarray(v) for v in values],
+                                        axis=attribute_dims.index(dim))
+            else:
+                if not all(_equal(values[0], v) for v in values[1:]):
+                    raise ValueError(f'Attribute {name} is different for '
+                                     f'the results and cannot be concatenated '
+                                     f'along {dim}.')
+                values = values[0]
+            new_attributes[name] = values
+
+        return type(first)(data, new_attributes)
+
     def save(self, file):
-        with open(file, mode='wb') as f:
-            pickle.dump(self, f)
+        """Save results to a binary (.npz) file.
+
+        The results array and array attributes are stored uncompressed, so
+        they can be memory-mapped when loaded. Other attributes
+        (numbers, strings and None) are stored as json metadata.
+
+        Parameters
+        ----------
+        file : str
+            File path name.
+        """
+        arrays = {'data': np.asarray(self)}
+        attributes = {}
+        for k in self._new_attributes:
+            if k == 'dims':
+                continue
+            v = getattr(self, k)
+            if v is None or isinstance(v, (str, bool, int, float)):
+                attributes[k] = v
+            else:
+                v = np.asarray(v)
+                if v.dtype.hasobject:
+                    raise TypeError(f'Attribute {k} cannot be saved.')
+                arrays['attr_' + k] = v
+
+        metadata = {'format': 'ross.Results',
+                    'version': 1,
+                    'class': self.__class__.__name__,
+                    'dims': list(self.dims),
+                    'attributes': attributes}
+
+        save_npz(file, arrays, metadata)
+
+    @classmethod
+    def load(cls, file, mmap_mode=None):
+        """Load results from a binary (.npz) file created with Results.save.
+
+        Parameters
+        ----------
+        file : str
+            File path name.
+        mmap_mode : str, optional
+            If not None (e.g. 'r'), arrays are memory-mapped instead of
+            read, so only the parts of the results that are accessed
+            are read from disk.
+
+        Returns
+        -------
+        results : ross.Results
+            Results with the class used to save it.
+
+        Examples
+        --------
+        >>> import os, tempfile
+        >>> from ross.rotor import rotor_example
+        >>> rotor = rotor_example()
+        >>> freq_resp = rotor.freq_response(np.linspace(0, 100, 5))
+        >>> file = os.path.join(tempfile.mkdtemp(), 'freq_resp.npz')
+        >>> freq_resp.save(file)
+        >>> freq_resp_loaded = Results.load(file, mmap_mode='r')
+        >>> np.allclose(freq_resp[0, 0], freq_resp_loaded[0, 0])
+        True
+        """
+        arrays, metadata = load_npz(file, mmap_mode=mmap_mode)
+        if metadata.get('format') != 'ross.Results':
+            raise ValueError(f'{file} is not a results file.')
+
+        new_attributes = dict(metadata['attributes'])
+        if 'dims' in metadata:
+            new_attributes['dims'] = metadata['dims']
+        for k, v in arrays.items():
+            if k.startswith('attr_'):
+                new_attributes[k[len('attr_'):]] = v
+
+        results_class = globals()[metadata['class']]
+
+        return results_class(arrays['data'], new_attributes)
 
     def plot(self, *args, **kwargs):
         raise NotImplementedError
 
 
+class ComplexResults(Results):
+    """Results with a complex response.
+
+    The magnitude, phase and magnitude_db (20 log10(magnitude)) are
+    calculated from the complex array on access, so the complex array is
+    the only array stored, and slices return the values for the slice
+    (e.g. results[4].magnitude). If cache_derived is True, the values
+    are kept after the first access; each slice has its own cache, and
+    the cache is not updated if the array is changed in place.
+    """
+    _derived = ('magnitude', 'phase', 'magnitude_db')
+    cache_derived = False
+
+    def __array_finalize__(self, obj):
+        super().__array_finalize__(obj)
+        if obj is None:
+            return
+        # the option is kept for slices, but not the cached values
+        self.cache_derived = getattr(obj, 'cache_derived', self.cache_derived)
+
+    def _derived_array(self, name, function):
+        if not self.cache_derived:
+            return function(np.asarray(self))
+
+        cache = self.__dict__.setdefault('_derived_cache', {})
+        if name not in cache:
+            cache[name] = function(np.asarray(self))
+
+        return cache[name]
+
+    @property
+    def magnitude(self):
+        """Magnitude of the response."""
+        return self._derived_array('magnitude', np.abs)
+
+    @property
+    def phase(self):
+        """Phase (rad) of the response."""
+        return self._derived_array('phase', np.angle)
+
+    @property
+    def magnitude_db(self):
+        """Magnitude (dB) of the response."""
+        def db(x):
+            with np.errstate(divide='ignore'):
+                return 20 * np.log10(np.abs(x))
+
+        return self._derived_array('magnitude_db', db)
+
+
 class CampbellResults(Results):
+    """Campbell diagram results.
+
+    Array with shape (speeds, modes, 5), where the last axis (quantity)
+    has the damped natural frequency, log dec, whirl value, speed and
+    natural frequency ('wd', 'log_dec', 'whirl', 'speed' and 'wn').
+    The wd, log_dec and whirl_values attributes are views of the array.
+    """
+    _dims = ('speed', 'mode', 'quantity')
+    _coords = {'speed': 'speed_range'}
+    _labels = {'quantity': ('wd', 'log_dec', 'whirl', 'speed', 'wn')}
+    _attribute_dims = {'speed_range': ('speed',)}
+    _derived = ('wd', 'log_dec', 'whirl_values')
+
+    def _quantity(self, name):
+        axis = self.dims.index('quantity')
+        index = self._labels['quantity'].index(name)
+        return np.asarray(self)[(slice(None),) * axis + (index,)]
+
+    @property
+    def wd(self):
+        """Damped natural frequencies."""
+        return self._quantity('wd')
+
+    @property
+    def log_dec(self):
+        """Logarithmic decrements."""
+        return self._quantity('log_dec')
+
+    @property
+    def whirl_values(self):
+        """Whirl values."""
+        return self._quantity('whirl')
+
     def plot(self, harmonics=[1], wn=False, fig=None, ax=None, **kwargs):
         """Plot campbell results.
 
@@ -79,6 +803,10 @@ class CampbellResults(Results):
             Returns the axes object with the plot.
 
         """
+        import matplotlib as mpl
+        import matplotlib.pyplot as plt
+
+        set_style()
 
         # results for campbell is an array with [speed_range, wd/log_dec/whirl]
 
@@ -142,7 +870,11 @@ class CampbellResults(Results):
         return fig, ax
 
 
-class FrequencyResponseResults(Results):
+class FrequencyResponseResults(ComplexResults):
+    _dims = ('output', 'input', 'frequency')
+    _coords = {'frequency': 'frequency_range'}
+    _attribute_dims = {'frequency_range': ('frequency',)}
+
     def plot_magnitude(self, inp, out, ax=None, units='m',
                        **kwargs):
         """Plot frequency response.
@@ -171,28 +903,36 @@ class FrequencyResponseResults(Results):
         Examples
         --------
         """
-        if ax is None:
-            ax = plt.gca()
+        import matplotlib as mpl
+        import matplotlib.pyplot as plt
 
-        omega = self.omega
-        mag = self[:, :, :, 0]
-        units = self.units
+        set_style()
 
-        ax.plot(omega, mag[:, inp, out], **kwargs)
+        if ax is None:
+            ax = plt.gca()
 
-        ax.set_xlim(0, max(omega))
-        ax.yaxis.set_major_locator(
-            mpl.ticker.MaxNLocator(prune='lower'))
-        ax.yaxis.set_major_locator(
-            mpl.ticker.MaxNLocator(prune='upper'))
+        frequency_range = self.frequency_range
+        # only the magnitude for the input/output pair is calculated
+        response = self[out, inp]
 
         if units == 'm':
+            mag = response.magnitude
             ax.set_ylabel('Amplitude $(m)$')
         elif units == 'mic-pk-pk':
+            mag = 2 * response.magnitude * 1e6
             ax.set_ylabel('Amplitude $(\mu pk-pk)$')
         else:
+            mag = response.magnitude_db
             ax.set_ylabel('Amplitude $(dB)$')
 
+        ax.plot(frequency_range, mag, **kwargs)
+
+        ax.set_xlim(0, max(frequency_range))
+        ax.yaxis.set_major_locator(
+            mpl.ticker.MaxNLocator(prune='lower'))
+        ax.yaxis.set_major_locator(
+            mpl.ticker.MaxNLocator(prune='upper'))
+
         ax.set_xlabel('Frequency (rad/s)')
 
         return ax
@@ -227,15 +967,20 @@ class FrequencyResponseResults(Results):
         Examples
         --------
         """
+        import matplotlib as mpl
+        import matplotlib.pyplot as plt
+
+        set_style()
+
         if ax is None:
             ax = plt.gca()
 
-        omega = self.omega
-        phase = self[:, :, :, 1]
+        frequency_range = self.frequency_range
+        phase = self[out, inp].phase
 
-        ax.plot(omega, phase[:, inp, out], **kwargs)
+        ax.plot(frequency_range, phase, **kwargs)
 
-        ax.set_xlim(0, max(omega))
+        ax.set_xlim(0, max(frequency_range))
         ax.yaxis.set_major_locator(
             mpl.ticker.MaxNLocator(prune='lower'))
         ax.yaxis.set_major_locator(
@@ -276,6 +1021,10 @@ class FrequencyResponseResults(Results):
         Examples
         --------
         """
+        import matplotlib.pyplot as plt
+
+        set_style()
+
         if ax0 is None and ax1 is None:
             fig, (ax0, ax1) = plt.subplots(2)
 
@@ -287,6 +1036,10 @@ class FrequencyResponseResults(Results):
         return ax0, ax1
 
     def plot_freq_response_grid(self, outs, inps, ax=None, **kwargs):
+        import matplotlib.pyplot as plt
+
+        set_style()
+
         # TODO function not tested after being moved from rotor.py
         # TODO check if this can be integrated to the plot function
         """Plot frequency response.
@@ -334,21 +1087,130 @@ class FrequencyResponseResults(Results):
         if len(outs) > 1:
             for i, out in enumerate(outs):
                 for j, inp in enumerate(inps):
-                    self.plot_magnitude(out, inp,
+                    self.plot_magnitude(inp, out,
                                         ax=ax[2 * i, j], **kwargs)
-                    self.plot_phase(out, inp,
+                    self.plot_phase(inp, out,
                                     ax=ax[2 * i + 1, j], **kwargs)
         else:
             for i, inp in enumerate(inps):
-                self.plot_magnitude(outs[0], inp,
+                self.plot_magnitude(inp, outs[0],
                                     ax=ax[2 * i], **kwargs)
-                self.plot_phase(outs[0], inp,
+                self.plot_phase(inp, outs[0],
                                 ax=ax[2 * i + 1], **kwargs)
 
         return ax
 
 
-class ForcedResponseResults(Results):
+class ForcedResponseResults(ComplexResults):
+    _dims = ('dof', 'frequency')
+    _coords = {'frequency': 'frequency_range'}
+    _attribute_dims = {'frequency_range': ('frequency',)}
+
+    def peaks(self, dofs=None, operating_range=None, method='rational'):
+        """Peaks, amplification factors and separation margins.
+
+        Peaks of the response amplitude are located for each dof. The
+        peak and the half power points are refined with a quadratic fitted
+        to 1 / amplitude**2 around each peak (method='rational'), so
+        accurate amplification factors are obtained from sparse frequency
+        ranges.
+
+        Parameters
+        ----------
+        dofs : list, optional
+            Degrees of freedom. Default is all dofs.
+        operating_range : tuple, optional
+            Tuple with (min, max) operating speed. If given, the separation
+            margins are also calculated.
+        method : str, optional
+            'rational' (default) or 'linear' (grid peaks and linearly
+            interpolated half power points).
+
+        Returns
+        -------
+        peaks : dict
+            Dictionary with arrays with shape (len(dofs), peaks), padded
+            with nan, for 'frequency', 'amplitude', 'amplification_factor'
+            and, if operating_range is given, 'separation_margin' and
+            'required_separation_margin' (API 684).
+
+        Examples
+        --------
+        >>> from ross import ShaftElement, DiskElement, BearingElement, Rotor
+        >>> from ross.materials import steel
+        >>> shaft = [ShaftElement(0.25, 0, 0.05, steel) for _ in range(6)]
+        >>> disks = [DiskElement(n, steel, 0.07, 0.05, 0.28) for n in [2, 4]]
+        >>> bearings = [BearingElement(n, kxx=1e6, cxx=1e3) for n in [0, 6]]
+        >>> rotor = Rotor(shaft, disks, bearings)
+        >>> response = rotor.unbalance_response(2, 1e-4, 0,
+        ...                                     np.linspace(0, 1000, 51))
+        >>> peaks = response.peaks(dofs=[8], operating_range=(400, 600))
+        >>> peaks['frequency'].round(1)
+        array([[ 101.9,  324.8]])
+        >>> peaks['amplification_factor'].round(1)
+        array([[ 15.4,   4.1]])
+        """
+        if dofs is None:
+            dofs = np.arange(self.shape[0])
+
+        amplitude = np.abs(np.asarray(self)[dofs])
+        index, frequency, peak_amplitude, x1, x2 = _peaks(
+            self.frequency_range, amplitude, method=method)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            af = frequency / (x2 - x1)
+
+        values = [frequency, peak_amplitude, af]
+        names = ['frequency', 'amplitude', 'amplification_factor']
+        if operating_range is not None:
+            values.extend(_separation_margin(frequency, af, *operating_range))
+            names.extend(['separation_margin', 'required_separation_margin'])
+
+        return dict(zip(names, _peak_table(amplitude.shape[:-1], index, *values)))
+
+    def orbit(self, nodes=None, num_points=37):
+        """Orbits at nodes for each frequency.
+
+        The ellipse parameters and the sampled orbits for all nodes and
+        frequencies are calculated together with array operations.
+
+        Parameters
+        ----------
+        nodes : list, optional
+            Nodes. Default is all nodes.
+        num_points : int, optional
+            Number of points sampled over one revolution (the first and
+            last points are the same). Default is 37.
+
+        Returns
+        -------
+        orbits : ross.results.OrbitResults
+            Sampled orbits with shape (len(nodes), len(frequency_range),
+            2, num_points).
+        """
+        if nodes is None:
+            nodes = np.arange(self.shape[0] // 4)
+        nodes = np.atleast_1d(nodes)
+
+        response = np.asarray(self)
+        u = response[4 * nodes]
+        v = response[4 * nodes + 1]
+        major, minor, kappa, angle = _ellipse(u, v)
+
+        theta = np.linspace(0, 2 * np.pi, num_points)
+        rotation = np.exp(1j * theta)
+        xy = np.stack([u, v], axis=-1)[..., np.newaxis] * rotation
+
+        return OrbitResults(
+            xy.real, new_attributes={'nodes': nodes,
+                                     'frequency_range': self.frequency_range,
+                                     'theta': theta,
+                                     'u': u,
+                                     'v': v,
+                                     'major_axis': major,
+                                     'minor_axis': minor,
+                                     'kappa': kappa,
+                                     'angle': angle})
+
     def plot_magnitude(self, dof, ax=None, units='m',
                        **kwargs):
         """Plot frequency response.
@@ -377,11 +1239,16 @@ class ForcedResponseResults(Results):
         Examples
         --------
         """
+        import matplotlib as mpl
+        import matplotlib.pyplot as plt
+
+        set_style()
+
         if ax is None:
             ax = plt.gca()
 
         frequency_range = self.frequency_range
-        mag = self.magnitude
+        mag = self[dof].magnitude
 
         if units == 'm':
             ax.set_ylabel('Amplitude $(m)$')
@@ -389,7 +1256,7 @@ class ForcedResponseResults(Results):
             mag = 2*mag*1e6
             ax.set_ylabel('Amplitude $(\mu pk-pk)$')
 
-        ax.plot(frequency_range, mag[dof], **kwargs)
+        ax.plot(frequency_range, mag, **kwargs)
 
         ax.set_xlim(0, max(frequency_range))
         ax.yaxis.set_major_locator(
@@ -430,13 +1297,18 @@ class ForcedResponseResults(Results):
         Examples
         --------
         """
+        import matplotlib as mpl
+        import matplotlib.pyplot as plt
+
+        set_style()
+
         if ax is None:
             ax = plt.gca()
 
         frequency_range = self.frequency_range
-        phase = self.phase
+        phase = self[dof].phase
 
-        ax.plot(frequency_range, phase[dof], **kwargs)
+        ax.plot(frequency_range, phase, **kwargs)
 
         ax.set_xlim(0, max(frequency_range))
         ax.yaxis.set_major_locator(
@@ -479,6 +1351,10 @@ class ForcedResponseResults(Results):
         Examples
         --------
         """
+        import matplotlib.pyplot as plt
+
+        set_style()
+
         if ax0 is None and ax1 is None:
             fig, (ax0, ax1) = plt.subplots(2)
 
@@ -495,16 +1371,111 @@ class ForcedResponseResults(Results):
 
 
 class ModeShapeResults(Results):
+    """Mode shapes results.
+
+    Array with the eigenvectors (dofs only) of the modes in the modes
+    attribute, with their damped natural frequencies and logarithmic
+    decrements in wd and log_dec. Whirl data is calculated on demand
+    with the kappa method.
+    """
+    _dims = ('dof', 'mode')
+    _coords = {'mode': 'modes'}
+    _attribute_dims = {'modes': ('mode',), 'wd': ('mode',),
+                       'log_dec': ('mode',)}
+
+    def kappa(self, mode):
+        """Kappa for each node of a mode.
+
+        Parameters
+        ----------
+        mode : int
+            Mode label (see the modes attribute), as in sel(mode=...).
+
+        Returns
+        -------
+        kappa : array
+            Kappa (minor / major axis) for each node, positive for forward
+            and negative for backward whirl (see Rotor.kappa).
+        """
+        evec = np.asarray(self)[:, self._positions('mode', mode)]
+        return _ellipse(evec[0::4], evec[1::4])[2]
+
+    def deflection(self, z, modes=None):
+        """Interpolated deflection of the mode shapes.
+
+        The deflection between nodes is interpolated with the Hermite shape
+        functions of the shaft elements, evaluated for all positions and
+        modes at once.
+
+        Parameters
+        ----------
+        z : float, array
+            Axial positions (m).
+        modes : int, list, optional
+            Labels of the modes to be evaluated (see the modes attribute).
+            Default is all modes.
+
+        Returns
+        -------
+        x, y : array
+            Complex deflection in x and y with shape (len(z), len(modes)).
+            Dimensions of scalar z or modes are dropped.
+
+        Examples
+        --------
+        >>> from ross.rotor import rotor_example
+        >>> modes = rotor_example().mode_shapes()
+        >>> x, y = modes.deflection(modes.nodes_pos, modes=[0, 1])
+        >>> np.allclose(x, modes[0::4, :2])
+        True
+        """
+        modes = (slice(None) if modes is None
+                 else self._positions('mode', modes))
+        nodes_pos = np.asarray(self.nodes_pos)
+        elements_length = np.diff(nodes_pos)
+
+        evec = np.asarray(self)[:, modes]
+        # (dof, node, ...) so that dofs are indexed first
+        evec = np.moveaxis(evec.reshape(len(nodes_pos), 4, *evec.shape[1:]),
+                           1, 0)
+
+        z = np.asarray(z, dtype=float)
+        element = np.searchsorted(nodes_pos, z, side='right') - 1
+        element = np.clip(element, 0, len(elements_length) - 1)
+        Le = elements_length[element]
+        zeta = (z - nodes_pos[element]) / Le
+
+        # broadcast positions against modes
+        shape = z.shape + (1,) * (evec.ndim - 2)
+        Le = Le.reshape(shape)
+        zeta = zeta.reshape(shape)
+
+        N1 = 1 - 3 * zeta ** 2 + 2 * zeta ** 3
+        N2 = Le * (zeta - 2 * zeta ** 2 + zeta ** 3)
+        N3 = 3 * zeta ** 2 - 2 * zeta ** 3
+        N4 = Le * (-zeta ** 2 + zeta ** 3)
+
+        ev0 = evec[:, element]
+        ev1 = evec[:, element + 1]
+        x = N1 * ev0[0] + N2 * ev0[3] + N3 * ev1[0] + N4 * ev1[3]
+        y = N1 * ev0[1] - N2 * ev0[2] + N3 * ev1[1] - N4 * ev1[2]
+
+        return x, y
+
     def plot(self, mode=None, evec=None, fig=None, ax=None):
+        import matplotlib.pyplot as plt
+        from mpl_toolkits.mplot3d import Axes3D  # noqa: F401
+
+        set_style()
+
         if ax is None:
             fig = plt.figure()
-            ax = fig.gca(projection='3d')
+            ax = fig.add_subplot(111, projection='3d')
 
-        evec0 = self[:, mode]
+        column = self._positions('mode', mode)
+        evec0 = np.asarray(self)[:, column]
         nodes = self.nodes
-        nodes_pos = self.nodes_pos
-        kappa_modes = self.kappa_modes
-        elements_length = self.elements_length
+        nodes_pos = np.asarray(self.nodes_pos)
 
         modex = evec0[0::4]
         modey = evec0[1::4]
@@ -512,63 +1483,31 @@ class ModeShapeResults(Results):
         ymax, iymax = max(abs(modey)), np.argmax(abs(modey))
 
         if ymax > 0.4 * xmax:
-            evec0 /= modey[iymax]
+            scale = modey[iymax]
         else:
-            evec0 /= modex[ixmax]
+            scale = modex[ixmax]
 
-        modex = evec0[0::4]
-        modey = evec0[1::4]
+        modex = modex / scale
+        modey = modey / scale
 
         num_points = 201
         c = np.linspace(0, 2 * np.pi, num_points)
         circle = np.exp(1j * c)
 
-        x_circles = np.zeros((num_points, len(nodes)))
-        y_circles = np.zeros((num_points, len(nodes)))
-        z_circles_pos = np.zeros((num_points, len(nodes)))
+        x_circles = np.real(np.outer(circle, modex))
+        y_circles = np.real(np.outer(circle, modey))
+        z_circles_pos = np.broadcast_to(nodes_pos, x_circles.shape)
 
-        kappa_mode = kappa_modes[mode]
-
-        for node in nodes:
-            x = modex[node] * circle
-            x_circles[:, node] = np.real(x)
-            y = modey[node] * circle
-            y_circles[:, node] = np.real(y)
-            z_circles_pos[:, node] = nodes_pos[node]
+        kappa_mode = ['tab:blue' if kappa > 0 else 'tab:red'
+                      for kappa in self.kappa(mode)]
 
         # plot lines
-        nn = 21
-        zeta = np.linspace(0, 1, nn)
-        onn = np.ones_like(zeta)
-
-        zeta = zeta.reshape(nn, 1)
-        onn = onn.reshape(nn, 1)
-
-        xn = np.zeros(nn * (len(nodes) - 1))
-        yn = np.zeros(nn * (len(nodes) - 1))
-        zn = np.zeros(nn * (len(nodes) - 1))
-
-        N1 = onn - 3 * zeta ** 2 + 2 * zeta ** 3
-        N2 = zeta - 2 * zeta ** 2 + zeta ** 3
-        N3 = 3 * zeta ** 2 - 2 * zeta ** 3
-        N4 = -zeta ** 2 + zeta ** 3
-
-        # TODO Check how to pass rotor.shaft_elements.
-        # TODO pass elements length.
-
-        for Le, n in zip(elements_length, nodes):
-            node_pos = nodes_pos[n]
-            Nx = np.hstack((N1, Le * N2, N3, Le * N4))
-            Ny = np.hstack((N1, -Le * N2, N3, -Le * N4))
-
-            xx = [4 * n, 4 * n + 3, 4 * n + 4, 4 * n + 7]
-            yy = [4 * n + 1, 4 * n + 2, 4 * n + 5, 4 * n + 6]
-
-            pos0 = nn * n
-            pos1 = nn * (n + 1)
-            xn[pos0:pos1] = Nx @ evec0[xx].real
-            yn[pos0:pos1] = Ny @ evec0[yy].real
-            zn[pos0:pos1] = (node_pos * onn + Le * zeta).reshape(nn)
+        zeta = np.linspace(0, 1, 21)
+        zn = (nodes_pos[:-1, np.newaxis]
+              + np.diff(nodes_pos)[:, np.newaxis] * zeta).ravel()
+        xn, yn = self.deflection(zn, mode)
+        xn = (xn / scale).real
+        yn = (yn / scale).real
 
         for node in nodes:
             ax.plot(x_circles[10:, node],
@@ -595,7 +1534,389 @@ class ModeShapeResults(Results):
         ax.set_xlim(zn_cl0 - 0.1, zn_cl1 + 0.1)
 
         ax.set_title(f'$speed$ = {self.w:.1f} rad/s\n$'
-                     f'\omega_d$ = {self.wd[mode]:.1f} rad/s\n'
-                     f'$log dec$ = {self.log_dec[mode]:.1f}')
+                     f'\omega_d$ = {self.wd[column]:.1f} rad/s\n'
+                     f'$log dec$ = {self.log_dec[column]:.1f}')
 
         return fig, ax
+
+
+class UCSResults(Results):
+    """Undamped critical speed map results.
+
+    Array with the critical speeds (rad/s) for each bearing stiffness,
+    with shape (4, number of stiffness values). The stiffness values are
+    in the stiffness_range attribute and the first bearing stiffness
+    (kxx and kyy) with its speeds in bearing_kxx, bearing_kyy and
+    bearing_w.
+    """
+    _dims = ('mode', 'stiffness')
+    _coords = {'stiffness': 'stiffness_range'}
+    _attribute_dims = {'stiffness_range': ('stiffness',)}
+
+    def plot(self, ax=None):
+        """Plot undamped critical speed map.
+
+        Parameters
+        ----------
+        ax : matplotlib axes, optional
+            Axes in which the plot will be drawn.
+
+        Returns
+        -------
+        ax : matplotlib axes
+            Returns the axes object with the plot.
+        """
+        import matplotlib.pyplot as plt
+        from cycler import cycler
+
+        set_style()
+
+        if ax is None:
+            ax = plt.gca()
+
+        ax.set_prop_cycle(cycler('color', seaborn_colors))
+        ax.loglog(self.stiffness_range, np.asarray(self).T)
+        ax.set_xlabel('Bearing Stiffness (N/m)')
+        ax.set_ylabel('Critical Speed (rad/s)')
+
+        ax.plot(self.bearing_kxx, self.bearing_w,
+                marker='o', color='k', alpha=0.25,
+                markersize=5, lw=0, label='kxx')
+        ax.plot(self.bearing_kyy, self.bearing_w,
+                marker='s', color='k', alpha=0.25,
+                markersize=5, lw=0, label='kyy')
+        ax.legend()
+
+        return ax
+
+
+class Level1Results(Results):
+    """Level 1 stability analysis results.
+
+    Array with the log dec of the first non backward mode for each
+    cross coupled stiffness in the stiffness_range attribute.
+    """
+    _dims = ('stiffness',)
+    _coords = {'stiffness': 'stiffness_range'}
+    _attribute_dims = {'stiffness_range': ('stiffness',)}
+
+    def plot(self, ax=None, **kwargs):
+        """Plot level 1 stability analysis.
+
+        Parameters
+        ----------
+        ax : matplotlib axes, optional
+            Axes in which the plot will be drawn.
+        kwargs : optional
+            Additional key word arguments can be passed to change
+            the plot (e.g. linestyle='--')
+
+        Returns
+        -------
+        ax : matplotlib axes
+            Returns the axes object with the plot.
+        """
+        import matplotlib.pyplot as plt
+
+        set_style()
+
+        if ax is None:
+            ax = plt.gca()
+
+        ax.plot(self.stiffness_range, np.asarray(self), '--', **kwargs)
+        ax.set_xlabel('Applied Cross Coupled Stiffness, Q (N/m)')
+        ax.set_ylabel('Log Dec')
+
+        return ax
+
+
+class TimeResponseResults(Results):
+    """Time response results.
+
+    Array with the system response with shape (number of time values,
+    number of dofs). The time values are in the t attribute and the time
+    evolution of the state vector in the xout attribute. Results from
+    Rotor.time_response_chunks only have the dofs in the dofs attribute
+    and no xout attribute.
+    """
+    _dims = ('time', 'dof')
+    _coords = {'time': 't', 'dof': 'dofs'}
+    _attribute_dims = {'t': ('time',), 'xout': ('time', 'state'),
+                       'speed': ('time',), 'dofs': ('dof',)}
+
+    def plot(self, dof, ax=None):
+        """Plot the time response.
+
+        Parameters
+        ----------
+        dof : int
+            Degree of freedom that will be observed.
+        ax : matplotlib axes, optional
+            Axes in which the plot will be drawn.
+
+        Returns
+        -------
+        ax : matplotlib axes
+            Returns the axes object with the plot.
+        """
+        import matplotlib.pyplot as plt
+
+        set_style()
+
+        if ax is None:
+            ax = plt.gca()
+
+        dofs = getattr(self, 'dofs', None)
+        column = dof if dofs is None else list(dofs).index(dof)
+        ax.plot(self.t, self[:, column])
+
+        if dof % 4 == 0:
+            obs_dof = '$x$'
+            amp = 'm'
+        elif dof % 4 == 1:
+            obs_dof = '$y$'
+            amp = 'm'
+        elif dof % 4 == 2:
+            obs_dof = r'$\alpha$'
+            amp = 'rad'
+        else:
+            obs_dof = r'$\beta$'
+            amp = 'rad'
+
+        ax.set_xlabel('Time (s)')
+        ax.set_ylabel('Amplitude (%s)' % amp)
+        ax.set_title('Response for node %s and degree of freedom %s'
+                     % (dof//4, obs_dof))
+
+        return ax
+
+
+class UnbalanceResults(ComplexResults):
+    """Unbalance response analysis results.
+
+    Complex response with shape (load cases, probes, speeds). Peaks of
+    each response are reported in arrays with shape
+    (load cases, probes, peaks), padded with nan:
+
+    - critical_speeds: speed of each peak;
+    - peak_amplitude: amplitude of each peak;
+    - amplification_factor: peak speed / half power bandwidth;
+    - separation_margin: separation (%) from the operating speed range;
+    - required_separation_margin: separation margin (%) required by
+      API 684 (0 when the amplification factor is below 2.5).
+    """
+    _dims = ('case', 'probe', 'speed')
+    _coords = {'speed': 'speed_range'}
+    _attribute_dims = {'speed_range': ('speed',),
+                       'probes': ('probe', 'probe_position'),
+                       'critical_speeds': ('case', 'probe', 'peak'),
+                       'peak_amplitude': ('case', 'probe', 'peak'),
+                       'amplification_factor': ('case', 'probe', 'peak'),
+                       'separation_margin': ('case', 'probe', 'peak'),
+                       'required_separation_margin': ('case', 'probe', 'peak')}
+
+    def plot(self, case=0, probe=0, ax=None, **kwargs):
+        """Plot the unbalance response amplitude for a load case and probe.
+
+        Parameters
+        ----------
+        case : int, optional
+            Load case. Default is 0.
+        probe : int, optional
+            Probe. Default is 0.
+        ax : matplotlib axes, optional
+            Axes in which the plot will be drawn.
+        kwargs : optional
+            Additional key word arguments can be passed to change
+            the plot (e.g. linestyle='--')
+
+        Returns
+        -------
+        ax : matplotlib axes
+            Returns the axes object with the plot.
+        """
+        import matplotlib.pyplot as plt
+
+        set_style()
+
+        if ax is None:
+            ax = plt.gca()
+
+        ax.plot(self.speed_range, abs(np.asarray(self[case, probe])), **kwargs)
+        ax.plot(self.critical_speeds[case, probe],
+                self.peak_amplitude[case, probe], 'kv')
+
+        for speed in [self.min_w, self.max_w]:
+            if speed is not None:
+                ax.axvline(speed, color='k', linestyle='--', linewidth=0.8)
+
+        ax.set_xlabel('Rotor speed ($rad/s$)')
+        ax.set_ylabel('Amplitude $(m)$')
+
+        return ax
+
+
+class OrbitResults(Results):
+    """Orbit results.
+
+    Sampled orbits with shape (nodes, speeds, 2, num_points), where the
+    third axis holds the x and y displacements over one revolution
+    (the phase angles are in the theta attribute). The ellipse
+    parameters for each node and speed are in the attributes:
+
+    - major_axis, minor_axis: semi-axes of the orbit;
+    - kappa: minor / major, positive for forward and negative for
+      backward whirl;
+    - angle: inclination (rad) of the major axis from the x axis;
+    - u, v: complex amplitudes in the x and y directions.
+    """
+    _dims = ('node', 'speed', 'direction', 'sample')
+    _coords = {'node': 'nodes', 'speed': 'frequency_range', 'sample': 'theta'}
+    _labels = {'direction': ('x', 'y')}
+    _attribute_dims = {'nodes': ('node',), 'frequency_range': ('speed',),
+                       'theta': ('sample',), 'u': ('node', 'speed'),
+                       'v': ('node', 'speed'), 'major_axis': ('node', 'speed'),
+                       'minor_axis': ('node', 'speed'), 'kappa': ('node', 'speed'),
+                       'angle': ('node', 'speed')}
+
+    def probe(self, angle):
+        """Complex reading of a probe at each node and speed.
+
+        Parameters
+        ----------
+        angle : float, array
+            Probe angle (rad) measured from the x axis towards the y axis.
+            An array gives one reading for each angle (last axis).
+
+        Returns
+        -------
+        reading : array
+            Complex amplitude x * cos(angle) + y * sin(angle) with shape
+            (nodes, speeds) or (nodes, speeds, len(angle)).
+        """
+        angle = np.asarray(angle, dtype=float)
+        u = self.u[..., np.newaxis] if angle.ndim else self.u
+        v = self.v[..., np.newaxis] if angle.ndim else self.v
+
+        return u * np.cos(angle) + v * np.sin(angle)
+
+    def plot(self, node=0, speed=0, ax=None, **kwargs):
+        """Plot the orbit for a node and speed.
+
+        Parameters
+        ----------
+        node : int, optional
+            Index of the node in the nodes attribute. Default is 0.
+        speed : int, optional
+            Index of the speed in the frequency_range attribute.
+            Default is 0.
+        ax : matplotlib axes, optional
+            Axes in which the plot will be drawn.
+        kwargs : optional
+            Additional key word arguments can be passed to change
+            the plot (e.g. linestyle='--')
+
+        Returns
+        -------
+        ax : matplotlib axes
+            Returns the axes object with the plot.
+        """
+        import matplotlib.pyplot as plt
+
+        set_style()
+
+        if ax is None:
+            ax = plt.gca()
+
+        x, y = np.asarray(self[node, speed])
+        ax.plot(x, y, **kwargs)
+        # marker at the phase reference (theta = 0)
+        ax.plot(x[0], y[0], 'o', color=ax.lines[-1].get_color())
+
+        ax.set_aspect('equal', adjustable='datalim')
+        ax.set_xlabel('x $(m)$')
+        ax.set_ylabel('y $(m)$')
+        ax.set_title('Orbit for node %s at %.1f rad/s'
+                     % (self.nodes[node], self.frequency_range[speed]))
+
+        return ax
+
+
+class WaterfallResults(Results):
+    """Waterfall results.
+
+    Spectra amplitudes with shape (windows, probes, frequencies). The
+    frequencies (rad/s) are in the frequency attribute and the rotor
+    speed and time at the center of each window in the speed_range and
+    t attributes. The complex amplitude of each harmonic of the rotor
+    speed (order tracks) is in the orders attribute, with shape
+    (harmonics, windows, probes).
+    """
+    _dims = ('window', 'probe', 'frequency')
+    _coords = {'window': 't', 'frequency': 'frequency'}
+    _attribute_dims = {'t': ('window',), 'speed_range': ('window',),
+                       'frequency': ('frequency',),
+                       'probes': ('probe', 'probe_position'),
+                       'orders': ('harmonic', 'window', 'probe'),
+                       'harmonics': ('harmonic',)}
+
+    def order(self, harmonic=1):
+        """Order track (complex amplitude) for a harmonic.
+
+        Parameters
+        ----------
+        harmonic : float, optional
+            Harmonic of the rotor speed. Default is 1.
+
+        Returns
+        -------
+        order : array
+            Complex amplitude with shape (windows, probes).
+        """
+        index = np.flatnonzero(self.harmonics == harmonic)
+        if len(index) == 0:
+            raise ValueError(f'Harmonic {harmonic} was not calculated.')
+
+        return self.orders[index[0]]
+
+    def plot(self, probe=0, ax=None, **kwargs):
+        """Plot the waterfall for a probe.
+
+        The spectra amplitudes are plotted in a color map with the
+        frequency on the x axis and the rotor speed on the y axis, and
+        the harmonics of the rotor speed are plotted as lines.
+
+        Parameters
+        ----------
+        probe : int, optional
+            Probe. Default is 0.
+        ax : matplotlib axes, optional
+            Axes in which the plot will be drawn.
+        kwargs : optional
+            Additional key word arguments are passed to pcolormesh
+            (e.g. cmap='viridis').
+
+        Returns
+        -------
+        ax : matplotlib axes
+            Returns the axes object with the plot.
+        """
+        import matplotlib.pyplot as plt
+
+        set_style()
+
+        if ax is None:
+            ax = plt.gca()
+
+        mesh = ax.pcolormesh(self.frequency, self.speed_range,
+                             np.asarray(self[:, probe]), **kwargs)
+        for harmonic in self.harmonics:
+            ax.plot(harmonic * self.speed_range, self.speed_range,
+                    color='w', linestyle='--', linewidth=0.8)
+        plt.colorbar(mesh, ax=ax, label='Amplitude $(m)$')
+
+        ax.set_xlim(self.frequency[0], self.frequency[-1])
+        ax.set_xlabel('Frequency ($rad/s$)')
+        ax.set_ylabel('Rotor speed ($rad/s$)')
+
+        return ax
@@ -1,49 +1,26 @@
 import os
+import inspect
 import warnings
-import pickle
 import numpy as np
-import pandas as pd
 import scipy.linalg as la
 import scipy.sparse.linalg as las
-import scipy.signal as signal
-import scipy.io as sio
 from copy import copy
 from collections import Iterable
 
-import matplotlib as mpl
-import matplotlib.patches as mpatches
-import matplotlib.pyplot as plt
-from matplotlib.collections import LineCollection
-from matplotlib.colors import ListedColormap
-from mpl_toolkits.mplot3d import Axes3D
-from cycler import cycler
-
 from ross.elements import *
-from ross.materials import steel
+from ross.materials import Material, steel
+from ross.data_io.npz import save_npz, load_npz
+from ross.cache import cached, content_hash
+from ross.plotting import set_style
 from ross.results import (CampbellResults, FrequencyResponseResults,
-                          ForcedResponseResults, ModeShapeResults)
+                          ForcedResponseResults, ModeShapeResults,
+                          UCSResults, Level1Results, TimeResponseResults,
+                          UnbalanceResults, _peaks, _peak_table,
+                          WaterfallResults, _separation_margin, _ellipse)
 
 
 __all__ = ['Rotor', 'rotor_example']
 
-# set style and colors
-plt.style.use('seaborn-white')
-plt.style.use({
-    'lines.linewidth': 2.5,
-    'axes.grid': True,
-    'axes.linewidth': 0.1,
-    'grid.color': '.9',
-    'grid.linestyle': '--',
-    'legend.frameon': True,
-    'legend.framealpha': 0.2
-    })
-
-_orig_rc_params = mpl.rcParams.copy()
-
-seaborn_colors = ['#4c72b0', '#55a868', '#c44e52',
-                  '#8172b2', '#ccb974', '#64b5cd']
-
-
 class Rotor(object):
     r"""A rotor object.
 
@@ -66,6 +43,10 @@ class Rotor(object):
     n_eigen : int, optional
         Number of eigenvalues calculated by arpack.
         Default is 12.
+    cache : ross.ResultsCache, optional
+        Cache used to store the results of the analyses (campbell,
+        frequency response, forced response and mode shapes).
+        Default is None (results are not stored).
 
     Returns
     -------
@@ -109,7 +90,8 @@ class Rotor(object):
     """
 
     def __init__(self, shaft_elements, disk_elements=None, bearing_seal_elements=None, w=0,
-                 sparse=True, n_eigen=12, min_w=None, max_w=None, rated_w=None):
+                 sparse=True, n_eigen=12, min_w=None, max_w=None, rated_w=None,
+                 cache=None):
         #  TODO consider speed as a rotor property. Setter should call __init__ again
         self._w = w
 
@@ -123,6 +105,7 @@ class Rotor(object):
         self.min_w = min_w
         self.max_w = max_w
         self.rated_w = rated_w
+        self.cache = cache
 
         ####################################################
 
@@ -160,59 +143,60 @@ class Rotor(object):
         ####################################################
         # Rotor summary
         ####################################################
-        columns = ['type', 'n', 'L', 'node_pos', 'node_pos_r', 'i_d', 'o_d',
-                   'i_d_r', 'o_d_r', 'material', 'rho', 'volume', 'm']
-
-        df_shaft = pd.DataFrame([el.summary() for el in self.shaft_elements])
-        df_disks = pd.DataFrame([el.summary() for el in self.disk_elements])
-        df_bearings = pd.DataFrame([el.summary() for el in self.bearing_seal_elements])
+        n_l = np.array([sh.n_l for sh in self.shaft_elements])
+        L = np.array([sh.L for sh in self.shaft_elements])
+        i_d = np.array([sh.i_d for sh in self.shaft_elements])
+        o_d = np.array([sh.o_d for sh in self.shaft_elements])
 
-        nodes_pos_l = np.zeros(len(df_shaft.n_l))
-        nodes_pos_r = np.zeros(len(df_shaft.n_l))
+        nodes_pos_l = np.zeros(len(n_l))
+        nodes_pos_r = np.zeros(len(n_l))
 
-        for i in range(len(df_shaft)):
+        for i in range(len(n_l)):
             if i == 0:
-                nodes_pos_r[i] = (nodes_pos_r[i] + df_shaft.loc[i, 'L'])
+                nodes_pos_r[i] = (nodes_pos_r[i] + L[i])
                 continue
-            if df_shaft.loc[i, 'n_l'] == df_shaft.loc[i - 1, 'n_l']:
+            if n_l[i] == n_l[i - 1]:
                 nodes_pos_l[i] = nodes_pos_l[i - 1]
                 nodes_pos_r[i] = nodes_pos_r[i - 1]
             else:
                 nodes_pos_l[i] = nodes_pos_r[i - 1]
-                nodes_pos_r[i] = nodes_pos_l[i] + df_shaft.loc[i, 'L']
+                nodes_pos_r[i] = nodes_pos_l[i] + L[i]
 
-        df_shaft['nodes_pos_l'] = nodes_pos_l
-        df_shaft['nodes_pos_r'] = nodes_pos_r
-        # bearings
-        # TODO add bearings to summary
-
-        df = pd.concat([df_shaft, df_disks, df_bearings])
-        df = df.sort_values(by='n_l')
-        df = df.reset_index(drop=True)
-        # TODO Add inertia to df
-        # TODO Add Axial cg location to df
+        self._nodes_pos_l = nodes_pos_l
+        self._nodes_pos_r = nodes_pos_r
 
         # check consistence for disks and bearings location
-        if df.n_l.max() > df[df.type == 'ShaftElement'].n_r.max():
+        if max(el.n_l for el in self.elements) > max(sh.n_r for sh in self.shaft_elements):
             raise ValueError('Trying to set disk or bearing outside shaft')
 
-        self.df = df
+        # nodes axial position and diameter (reduced by the left node)
+        shaft_nodes, index = np.unique(n_l, return_inverse=True)
 
-        # nodes axial position and diameter
-        nodes_pos = list(df_shaft.groupby('n_l')['nodes_pos_l'].max())
-        nodes_pos.append(df_shaft['nodes_pos_r'].iloc[-1])
+        nodes_pos = np.full(len(shaft_nodes), -np.inf)
+        np.maximum.at(nodes_pos, index, nodes_pos_l)
+        nodes_pos = list(nodes_pos)
+        nodes_pos.append(nodes_pos_r[-1])
         self.nodes_pos = nodes_pos
 
-        nodes_i_d = list(df_shaft.groupby('n_l')['i_d'].min())
-        nodes_i_d.append(df_shaft['i_d'].iloc[-1])
+        nodes_i_d = np.full(len(shaft_nodes), np.inf)
+        np.minimum.at(nodes_i_d, index, i_d)
+        nodes_i_d = list(nodes_i_d)
+        nodes_i_d.append(i_d[-1])
         self.nodes_i_d = nodes_i_d
 
-        nodes_o_d = list(df_shaft.groupby('n_l')['o_d'].min())
-        nodes_o_d.append(df_shaft['o_d'].iloc[-1])
+        nodes_o_d = np.full(len(shaft_nodes), np.inf)
+        np.minimum.at(nodes_o_d, index, o_d)
+        nodes_o_d = list(nodes_o_d)
+        nodes_o_d.append(o_d[-1])
         self.nodes_o_d = nodes_o_d
 
         self.nodes = list(range(len(self.nodes_pos)))
-        self.elements_length = self.df.groupby('n_l')['L'].max()
+
+        # length of the elements starting at each node (nan if none)
+        elements_nodes = np.unique([el.n_l for el in self.elements])
+        elements_length = np.full(len(elements_nodes), np.nan)
+        np.fmax.at(elements_length, np.searchsorted(elements_nodes, n_l), L)
+        self.elements_length = elements_length
         self.L = nodes_pos[-1]
 
         # rotor mass can also be calculated with self.M()[::4, ::4].sum()
@@ -226,7 +210,7 @@ class Rotor(object):
         self.evectors = None
         self.wn = None
         self.wd = None
-        self.lti = None
+        self._lti_sys = None
 
         self._v0 = None  # used to call eigs
         #  TODO check when disk diameter in no consistent with shaft diameter
@@ -251,17 +235,68 @@ class Rotor(object):
             warnings.simplefilter('ignore')
             self.log_dec = (2*np.pi*self.damping_ratio /
                             np.sqrt(1 - self.damping_ratio**2))
-        self.lti = self._lti()
+        # the lti system is created on first access (see self.lti)
+        self._lti_sys = None
 
     @property
     def w(self):
         return self._w
 
+    @property
+    def lti(self):
+        """Continuous-time linear time invariant system (see self._lti)."""
+        if self._lti_sys is None:
+            self._lti_sys = self._lti()
+        return self._lti_sys
+
+    @property
+    def df(self):
+        """Summary of the rotor elements (pandas DataFrame)."""
+        import pandas as pd
+
+        df_shaft = pd.DataFrame([el.summary() for el in self.shaft_elements])
+        df_disks = pd.DataFrame([el.summary() for el in self.disk_elements])
+        df_bearings = pd.DataFrame([el.summary() for el in self.bearing_seal_elements])
+
+        df_shaft['nodes_pos_l'] = self._nodes_pos_l
+        df_shaft['nodes_pos_r'] = self._nodes_pos_r
+        # bearings
+        # TODO add bearings to summary
+
+        df = pd.concat([df_shaft, df_disks, df_bearings])
+        df = df.sort_values(by='n_l')
+        df = df.reset_index(drop=True)
+        # TODO Add inertia to df
+        # TODO Add Axial cg location to df
+
+        return df
+
     @w.setter
     def w(self, value):
         self._w = value
         self._calc_system()
 
+    def model_hash(self):
+        """Content hash for the rotor model.
+
+        The hash considers the elements (geometry, material properties
+        and bearing coefficients tables), the rotor speed and the
+        eigenvalue solver configuration.
+
+        Returns
+        -------
+        hash : str
+            Hexadecimal sha256 digest.
+
+        Examples
+        --------
+        >>> rotor_example().model_hash() == rotor_example().model_hash()
+        True
+        """
+        return content_hash(self.shaft_elements, self.disk_elements,
+                            self.bearing_seal_elements, self.w,
+                            self.sparse, self.n_eigen)
+
     def _dofs(self, element):
         # TODO This part should be inside each element
         """The first and last dof for a given element"""
@@ -427,6 +462,92 @@ class Rotor(object):
 
         return A
 
+    def _dA(self, w=None):
+        """Derivative of the state space matrix with respect to the speed.
+
+        Only the bearing coefficients and the gyroscopic term depend on the
+        rotor speed, so the derivative is zero for the upper half of A.
+        """
+        if w is None:
+            w = self.w
+
+        dK0 = np.zeros((self.ndof, self.ndof))
+        dC0 = np.zeros((self.ndof, self.ndof))
+
+        for elm in self.bearing_seal_elements:
+            n1, n2 = self._dofs(elm)
+            dK0[n1:n2, n1:n2] += elm.dK(w)
+            dC0[n1:n2, n1:n2] += elm.dC(w)
+
+        Z = np.zeros((self.ndof, self.ndof))
+        dA = np.vstack(
+            [np.hstack([Z, Z]),
+             np.hstack([la.solve(-self.M(), dK0), la.solve(-self.M(), (dC0 + self.G()))])])
+
+        return dA
+
+    def _element_derivatives(self, element, parameter):
+        """Derivatives of the element matrices with respect to a parameter.
+
+        Parameters
+        ----------
+        element : ross.Element
+            Bearing, disk or shaft element.
+        parameter : str
+            Bearing coefficient ('kxx', 'kxy', ..., 'cyy'), disk
+            property ('m', 'Id' or 'Ip') or shaft diameter ('i_d' or 'o_d').
+
+        Returns
+        -------
+        dM, dK, dC, dG : array
+            Derivatives of the element mass, stiffness, damping and
+            gyroscopic matrices (element dofs).
+        """
+        n1, n2 = self._dofs(element)
+        dM, dK, dC, dG = (np.zeros((n2 - n1, n2 - n1)) for _ in range(4))
+
+        if isinstance(element, BearingElement):
+            position = {'xx': (0, 0), 'xy': (0, 1), 'yx': (1, 0), 'yy': (1, 1)}
+            if parameter[0] not in 'kc' or parameter[1:] not in position:
+                raise ValueError(f'Invalid parameter {parameter} for a bearing.')
+            if parameter[0] == 'k':
+                dK[position[parameter[1:]]] = 1
+            else:
+                dC[position[parameter[1:]]] = 1
+        elif isinstance(element, LumpedDiskElement):
+            if parameter == 'm':
+                dM[0, 0] = dM[1, 1] = 1
+            elif parameter == 'Id':
+                dM[2, 2] = dM[3, 3] = 1
+            elif parameter == 'Ip':
+                dG[2, 3], dG[3, 2] = 1, -1
+            else:
+                raise ValueError(f'Invalid parameter {parameter} for a disk.')
+        elif isinstance(element, ShaftElement):
+            if parameter not in ['i_d', 'o_d']:
+                raise ValueError(f'Invalid parameter {parameter} for a shaft.')
+            # shaft matrices are nonlinear in the diameters, so a central
+            # difference is used (only the element is rebuilt).
+            h = 1e-6 * element.o_d
+            perturbed = []
+            for step in [h, -h]:
+                diameters = {'i_d': element.i_d, 'o_d': element.o_d}
+                diameters[parameter] += step
+                perturbed.append(ShaftElement(
+                    element.L, diameters['i_d'], diameters['o_d'],
+                    element.material, n=element.n,
+                    shear_effects=element.shear_effects,
+                    rotary_inertia=element.rotary_inertia,
+                    gyroscopic=element.gyroscopic))
+            el_p, el_m = perturbed
+            dM = (el_p.M() - el_m.M()) / (2 * h)
+            dK = (el_p.K() - el_m.K()) / (2 * h)
+            dG = (el_p.G() - el_m.G()) / (2 * h)
+        else:
+            raise ValueError(f'Sensitivity not available for {element}.')
+
+        return dM, dK, dC, dG
+
     @staticmethod
     def _index(eigenvalues):
         r"""Function used to generate an index that will sort
@@ -466,7 +587,7 @@ class Rotor(object):
 
         return idx
 
-    def _eigen(self, w=None, sorted_=True, A=None):
+    def _eigen(self, w=None, sorted_=True, A=None, sparse=None, left=False):
         r"""This method will return the eigenvalues and eigenvectors of the
         state space matrix A, sorted by the index method which considers
         the imaginary part (wd) of the eigenvalues for sorting.
@@ -476,6 +597,12 @@ class Rotor(object):
         ----------
         w: float
             Rotor speed.
+        sparse: bool, optional
+            If True, eigenvalues will be calculated with arpack.
+            Default is the rotor sparse attribute.
+        left: bool, optional
+            If True, the left eigenvectors are also returned.
+            Default is False.
 
         Returns
         -------
@@ -483,6 +610,9 @@ class Rotor(object):
             An array with the eigenvalues
         evectors array
             An array with the eigenvectors
+        left_evectors: array
+            An array with the left eigenvectors, normalized so that
+            :math:`Y^H X = I`. It will be returned only if left is True.
 
         Examples
         --------
@@ -495,8 +625,11 @@ class Rotor(object):
             w = self.w
         if A is None:
             A = self.A(w)
+        if sparse is None:
+            sparse = self.sparse
 
-        if self.sparse is True:
+        left_evectors = None
+        if sparse is True:
             try:
                 evalues, evectors = las.eigs(A, k=self.n_eigen,
                                              sigma=0, ncv=24, which='LM',
@@ -504,18 +637,77 @@ class Rotor(object):
                 # store v0 as a linear combination of the previously
                 # calculated eigenvectors to use in the next call to eigs
                 self._v0 = np.real(sum(evectors.T))
+                if left:
+                    # left eigenvectors of A are the eigenvectors of A.T
+                    # with conjugate eigenvalues.
+                    evalues_t, evectors_t = las.eigs(A.T, k=self.n_eigen,
+                                                     sigma=0, ncv=24, which='LM')
+                    pair = np.argmin(np.absolute(
+                        evalues_t[None, :] - evalues.conj()[:, None]), axis=1)
+                    left_evectors = evectors_t[:, pair]
             except las.ArpackError:
+                sparse = False
+        if sparse is not True:
+            if left:
+                evalues, left_evectors, evectors = la.eig(A, left=True)
+            else:
                 evalues, evectors = la.eig(A)
-        else:
-            evalues, evectors = la.eig(A)
+
+        if left:
+            # bi-orthonormalization (y_i^H x_i = 1)
+            norm = np.sum(left_evectors.conj() * evectors, axis=0)
+            left_evectors = left_evectors / norm.conj()
 
         if sorted_ is False:
+            if left:
+                return evalues, evectors, left_evectors
             return evalues, evectors
 
         idx = self._index(evalues)
 
+        if left:
+            return evalues[idx], evectors[:, idx], left_evectors[:, idx]
         return evalues[idx], evectors[:, idx]
 
+    def _eigen_speed_derivative(self, w=None):
+        r"""Eigenvalues and their derivatives with respect to the speed.
+
+        The derivatives are obtained from the left (:math:`y`) and
+        right (:math:`x`) eigenvectors of the state space matrix:
+
+        .. math::
+
+            \frac{d\lambda}{d\Omega} = \frac{y^H A'(\Omega) x}{y^H x}
+
+        Parameters
+        ----------
+        w: float, optional
+            Rotor speed.
+
+        Returns
+        -------
+        evalues: array
+            An array with the sorted eigenvalues.
+        evectors: array
+            An array with the sorted (right) eigenvectors.
+        devalues: array
+            An array with the derivative of each eigenvalue with
+            respect to the speed.
+        """
+        if w is None:
+            w = self.w
+
+        evalues, right, left = self._eigen(w, sparse=False, left=True)
+        # left eigenvectors are normalized, so y^H x = 1
+        devalues = np.sum(left.conj() * (self._dA(w) @ right), axis=0)
+
+        return evalues, right, devalues
+
+    @staticmethod
+    def _track(evalues, target):
+        """Index of the eigenvalue (positive wd) closest to target."""
+        return np.argmin(np.absolute(evalues[:len(evalues) // 2] - target))
+
     def H_kappa(self, node, w, return_T=False):
         r"""Calculates the H matrix for a given node and natural frequency.
 
@@ -744,8 +936,57 @@ class Rotor(object):
         """Get the whirl value (0., 0.5, or 1.) for each frequency."""
         return whirl_to_cmap(self.whirl_direction())
 
-    def orbit(self):
-        pass
+    def orbit(self, node, magnitude, phase, frequency_range=None,
+              nodes=None, num_points=37, moment=0, moment_phase=0):
+        """Orbits due to unbalance.
+
+        The unbalance response (see Rotor.unbalance_response) is used to
+        calculate the orbit ellipses (major and minor axes, kappa and
+        inclination, as in Rotor.kappa) and the sampled orbits at each
+        node for each speed. All nodes and speeds are calculated
+        together, so the cost is the cost of the unbalance response.
+
+        Parameters
+        ----------
+        node : list, int
+            Node where the unbalance is applied.
+        magnitude : list, float
+            Unbalance magnitude (kg.m)
+        phase : list, float
+            Unbalance phase (rad)
+        frequency_range : list, float, str
+            Array with the rotor speeds (rad/s) or 'adaptive'.
+        nodes : list, optional
+            Nodes where the orbits are calculated. Default is all nodes.
+        num_points : int, optional
+            Number of points sampled over one revolution. Default is 37.
+        moment : list, float, optional
+            Moment unbalance magnitude (kg.m**2). Default is 0.
+        moment_phase : list, float, optional
+            Moment unbalance phase (rad). Default is 0.
+
+        Returns
+        -------
+        orbits : ross.results.OrbitResults
+            Sampled orbits with shape (len(nodes), len(frequency_range),
+            2, num_points) and the ellipse parameters with shape
+            (len(nodes), len(frequency_range)).
+
+        Examples
+        --------
+        >>> rotor = rotor_example()
+        >>> speed = np.linspace(0, 1000, 11)
+        >>> orbits = rotor.orbit(2, 1e-4, 0, frequency_range=speed)
+        >>> orbits.shape
+        (7, 11, 2, 37)
+        >>> orbits.kappa.shape
+        (7, 11)
+        """
+        response = self.unbalance_response(
+            node, magnitude, phase, frequency_range=frequency_range,
+            moment=moment, moment_phase=moment_phase)
+
+        return response.orbit(nodes=nodes, num_points=num_points)
 
     def _lti(self):
         """Continuous-time linear time invariant system.
@@ -755,6 +996,8 @@ class Rotor(object):
         From this system we can obtain poles, impulse response,
         generate a bode, etc.
         """
+        import scipy.signal as signal
+
         Z = np.zeros((self.ndof, self.ndof))
         I = np.eye(self.ndof)
 
@@ -783,32 +1026,111 @@ class Rotor(object):
         C = self.lti.C
         D = self.lti.D
 
-        # calculate eigenvalues and eigenvectors using la.eig to get
-        # left and right eigenvectors.
-        # TODO check if this is possible with linalg sparse
-        # TODO test_freq_response is failing because evalues here are not sorted
-        evals, psi, = la.eig(self.A(w))
-        # TODO change to get psi_inv from la.eig - first evaluate performance gain
-        psi_inv = la.inv(psi)
+        # the left eigenvectors (normalized) are the rows of the inverse
+        # of the eigenvectors matrix, so psi_inv is not calculated with
+        # la.inv. The full set of modes is needed here (no arpack).
+        evals, psi, psi_left = self._eigen(w, sparse=False, left=True)
 
         if modes is not None:
             n = self.ndof  # n dof -> number of modes
-            m = len(modes)  # -> number of desired modes
+            modes = np.asarray(modes)
             # idx to get each evalue/evector and its conjugate
-            idx = np.zeros((2 * m), int)
-            idx[0:m] = modes  # modes
-            idx[m:] = range(2 * n)[-m:]  # conjugates (see how evalues are ordered)
+            # (see how evalues are ordered in self._index)
+            idx = np.concatenate([modes, 2 * n - 1 - modes])
 
-            evals = evals[np.ix_(idx)]
-            psi = psi[np.ix_(range(2 * n), idx)]
-            psi_inv = psi_inv[np.ix_(idx, range(2 * n))]
+            evals = evals[idx]
+            psi = psi[:, idx]
+            psi_left = psi_left[:, idx]
 
-        diag = np.diag([1 / (1j * w - lam) for lam in evals])
+        psi_inv = psi_left.conj().T
 
-        H = C @ psi @ diag @ psi_inv @ B + D
+        H = C @ (psi * (1 / (1j * w - evals))) @ psi_inv @ B + D
 
         return H
 
+    def adaptive_frequency_range(self, start=0, stop=None, rtol=0.01,
+                                 max_step=None):
+        """Frequency range with points concentrated at the resonances.
+
+        The response near a critical speed behaves as
+        1 / sqrt((w - wc)**2 + sigma**2), where wc is the critical speed
+        (see Rotor.critical_speeds) and sigma is the decay rate of the mode
+        at that speed. The step at each frequency is proportional to the
+        distance to the nearest pole,
+
+        step = min(max_step, c * sqrt((w - wc)**2 + sigma**2)),
+
+        with c = 2 * sqrt(1 / (1 - rtol)**2 - 1), so that the peak
+        amplitude between two points is missed by at most rtol. Points are
+        dense at lightly damped modes and sparse elsewhere.
+
+        The critical speeds are estimated for all modes from one
+        eigenvalue solution at the rotor speed, and only the modes
+        estimated near [start, stop] are refined, with a few eigenvalue
+        solutions each.
+
+        Parameters
+        ----------
+        start : float, optional
+            First frequency (rad/s). Default is 0.
+        stop : float, optional
+            Last frequency (rad/s). Default is 1.5 times the highest
+            damped natural frequency.
+        rtol : float, optional
+            Relative amplitude error at the peaks. Default is 0.01.
+        max_step : float, optional
+            Maximum step. Default is (stop - start) / 50.
+
+        Returns
+        -------
+        frequency_range : array
+            Frequencies (rad/s), including the critical speeds.
+
+        Examples
+        --------
+        >>> rotor = rotor_example()
+        >>> frequency_range = rotor.adaptive_frequency_range(0, 1000)
+        >>> frequency_range[[0, -1]]
+        array([    0.,  1000.])
+        """
+        if stop is None:
+            stop = 1.5 * max(self.evalues.imag)
+        if max_step is None:
+            max_step = (stop - start) / 50
+
+        # first order estimates of the critical speeds from one eigenvalue
+        # solution; only the modes estimated near [start, stop] are refined
+        # (see Rotor.critical_speeds)
+        evalues, evectors, devalues = self._eigen_speed_derivative(self.w)
+        margin = 0.2 * (stop - start)
+        critical, sigma = [], []
+        for j in range(len(self.wd)):
+            lam, dlam = evalues[j], devalues[j]
+            estimate = self.w - (lam.imag - self.w) / (dlam.imag - 1)
+            if not start - margin <= estimate <= stop + margin:
+                continue
+            wc, lam = self._critical_speed(1, j, lam, dlam, evectors[:, j],
+                                           tol=1e-8, maxiter=20)
+            if np.isfinite(wc):
+                critical.append(wc)
+                # floor avoids zero steps for undamped modes
+                sigma.append(max(abs(lam.real), 1e-6 * wc))
+        critical, sigma = np.array(critical), np.array(sigma)
+
+        c = 2 * np.sqrt(1 / (1 - rtol) ** 2 - 1)
+
+        frequency_range = [start]
+        while frequency_range[-1] < stop:
+            w = frequency_range[-1]
+            distance = np.sqrt((w - critical) ** 2 + sigma ** 2).min(initial=np.inf)
+            frequency_range.append(w + min(max_step, c * distance))
+        frequency_range[-1] = stop
+
+        inside = (critical > start) & (critical < stop)
+
+        return np.union1d(frequency_range, critical[inside])
+
+    @cached
     def freq_response(self, frequency_range=None, modes=None):
         """Frequency response for a mdof system.
 
@@ -820,29 +1142,30 @@ class Rotor(object):
         force : array, optional
             Force array (needs to have the same length as frequencies array).
             If not given the impulse response is calculated.
-        omega : array, optional
+        frequency_range : array, str, optional
             Array with the desired range of frequencies (the default
              is 0 to 1.5 x highest damped natural frequency.
+            If 'adaptive', points are concentrated at the resonances
+            (see Rotor.adaptive_frequency_range).
         modes : list, optional
             Modes that will be used to calculate the frequency response
             (all modes will be used if a list is not given).
 
         Returns
         -------
-        omega : array
-            Array with the frequencies
-        magdb : array
-            Magnitude (dB) of the frequency response for each pair input/output.
-            The order of the array is: [output, input, magnitude]
-        phase : array
-            Phase of the frequency response for each pair input/output.
-            The order of the array is: [output, input, phase]
+        results : ross.results.FrequencyResponseResults
+            Complex frequency response with shape
+            (outputs, inputs, len(frequency_range)). The magnitude,
+            phase and magnitude_db are calculated on access (also for
+            slices, e.g. results[0, 4].magnitude).
 
         Examples
         --------
         """
         if frequency_range is None:
             frequency_range = np.linspace(0, max(self.evalues.imag) * 1.5, 1000)
+        elif isinstance(frequency_range, str) and frequency_range == 'adaptive':
+            frequency_range = self.adaptive_frequency_range()
 
         freq_resp = np.empty(
             (self.lti.inputs, self.lti.outputs, len(frequency_range)), dtype=np.complex)
@@ -852,12 +1175,11 @@ class Rotor(object):
             freq_resp[..., i] = H
 
         results = FrequencyResponseResults(
-            freq_resp, new_attributes={'frequency_range': frequency_range,
-                                       'magnitude': abs(freq_resp),
-                                       'phase': np.angle(freq_resp)})
+            freq_resp, new_attributes={'frequency_range': frequency_range})
 
         return results
 
+    @cached
     def forced_response(self, force=None, frequency_range=None, modes=None):
         freq_resp = self.freq_response(
             frequency_range=frequency_range, modes=modes)
@@ -869,35 +1191,140 @@ class Rotor(object):
             forced_resp[:, i] = freq_resp[..., i] @ force[..., i]
 
         forced_resp = ForcedResponseResults(
-            forced_resp, new_attributes={'frequency_range': frequency_range,
-                                         'magnitude': abs(forced_resp),
-                                         'phase': np.angle(forced_resp)})
+            forced_resp, new_attributes={'frequency_range': frequency_range})
 
         return forced_resp
 
-    def _unbalance_force(self, node, magnitude, phase, omega):
-        """Function to calculate unbalance force"""
+    def _unbalance_load(self, node, magnitude, phase, moment=0, moment_phase=0):
+        """Unbalance load amplitudes for one or more planes.
+
+        The load for each plane is the force (me) and moment (U = (Id - Ip)*beta)
+        unbalance amplitudes, which are multiplied by speed**2 to obtain
+        the forces. Planes at the same node are added.
+
+        Parameters
+        ----------
+        node : int, array
+            Node(s) where the unbalance is applied.
+        magnitude : float, array
+            Unbalance magnitude (kg.m).
+        phase : float, array
+            Unbalance phase (rad).
+        moment : float, array, optional
+            Moment unbalance magnitude (kg.m**2). Default is 0.
+        moment_phase : float, array, optional
+            Moment unbalance phase (rad). Default is 0.
+
+        Returns
+        -------
+        dofs : array
+            Dofs with a load (sorted).
+        load : array
+            Complex load amplitude for each dof.
+
+        Examples
+        --------
+        >>> rotor = rotor_example()
+        >>> dofs, load = rotor._unbalance_load([2, 3], [1e-3, 1e-3], [0, np.pi/2])
+        >>> dofs
+        array([ 8,  9, 10, 11, 12, 13, 14, 15])
+        """
+        node, magnitude, phase, moment, moment_phase = np.broadcast_arrays(
+            *(np.atleast_1d(arg) for arg in
+              [node, magnitude, phase, moment, moment_phase]))
+
+        me = magnitude * np.exp(1j * phase)
+        U = moment * np.exp(1j * moment_phase)
+        b0 = np.stack([me, -1j * me, 1j * U, U], axis=1)
+
+        dofs = 4 * node[:, np.newaxis] + np.arange(4)
+        dofs, index = np.unique(dofs, return_inverse=True)
+        load = np.zeros(len(dofs), dtype=np.complex128)
+        np.add.at(load, index.ravel(), b0.ravel())
+
+        return dofs, load
+
+    def _unbalance_force(self, node, magnitude, phase, omega, moment=0,
+                         moment_phase=0):
+        """Function to calculate unbalance force
+
+        Full force array (ndof, len(omega)) obtained with the outer product
+        of the unbalance load (see _unbalance_load) and omega**2.
+        """
         # TODO add unbalance as a rotor attribute.
+        dofs, load = self._unbalance_load(node, magnitude, phase,
+                                          moment, moment_phase)
         F0 = np.zeros((self.ndof, len(omega)), dtype=np.complex128)
-        me = magnitude
-        delta = phase
-        b0 = np.array([me * np.exp(1j * delta),
-                       -1j * me * np.exp(1j * delta),
-                       0,  # 1j*(Id - Ip)*beta*np.exp(1j*gamma),
-                       0])  # (Id - Ip)*beta*np.exp(1j*gamma)])
-        # TODO implement moment
-        n0 = 4 * node
-        n1 = n0 + 4
-        for i, w in enumerate(omega):
-            F0[n0:n1, i] += w ** 2 * b0
+        F0[dofs] = np.outer(load, np.asarray(omega) ** 2)
 
         return F0
 
-    def unbalance_response(self, node, magnitude, phase, frequency_range=None):
-        """frequency response for a mdof system.
+    def _harmonic_response(self, dofs, load, speed_range, harmonic=1,
+                           modes=None):
+        """Response to a load rotating with the rotor.
 
-        This method returns the frequency response for a mdof system
-        given a range of frequencies and the modes that will be used.
+        The load (speed**2 * load) is applied at harmonic * speed
+        for each speed in speed_range. The response is calculated with
+        the modes of the rotor at each speed, and only the columns of
+        M^-1 for the loaded dofs are used, so the full frequency response
+        is never calculated.
+
+        Parameters
+        ----------
+        dofs : array
+            Dofs with a load.
+        load : array
+            Complex load amplitude for each dof.
+        speed_range : array
+            Rotor speeds (rad/s).
+        harmonic : float, optional
+            Harmonic order of the load. Default is 1.
+        modes : list, optional
+            Modes that will be used (all modes if not given).
+
+        Returns
+        -------
+        response : array
+            Complex response with shape (ndof, len(speed_range)).
+        """
+        n = self.ndof
+        speed_range = np.asarray(speed_range)
+
+        # M^-1 @ F for a unit speed
+        E = np.zeros((n, len(dofs)))
+        E[dofs, np.arange(len(dofs))] = 1
+        M_inv_load = la.solve(self.M(), E) @ load
+
+        if modes is not None:
+            modes = np.asarray(modes)
+            idx = np.concatenate([modes, 2 * n - 1 - modes])
+
+        response = np.zeros((n, len(speed_range)), dtype=np.complex128)
+
+        for i, speed in enumerate(speed_range):
+            if speed == 0:
+                continue
+            evals, psi, psi_left = self._eigen(speed, sparse=False, left=True)
+            if modes is not None:
+                evals, psi, psi_left = evals[idx], psi[:, idx], psi_left[:, idx]
+
+            # modal participation of the load (B @ F only has the
+            # velocity rows M^-1 F)
+            q = (psi_left[n:].conj().T @ M_inv_load) / (1j * harmonic * speed - evals)
+            response[:, i] = speed ** 2 * (psi[:n] @ q)
+
+        return response
+
+    @cached
+    def unbalance_response(self, node, magnitude, phase, frequency_range=None,
+                           moment=0, moment_phase=0, harmonic=1, modes=None):
+        """Unbalance response for a mdof system.
+
+        This method returns the unbalance response for a mdof system
+        given magnitude and phase of the unbalance, the node where it's
+        applied and a frequency range (rotor speeds). Several planes
+        (lists for node, magnitude and phase) and moment unbalance are
+        supported.
 
         Parameters
         ----------
@@ -907,33 +1334,150 @@ class Rotor(object):
             Unbalance magnitude (kg.m)
         phase : list, float
             Unbalance phase (rad)
+        frequency_range : list, float, str
+            Array with the desired range of frequencies (rotor speed).
+            If 'adaptive', points are concentrated at the resonances
+            (see Rotor.adaptive_frequency_range).
+        moment : list, float, optional
+            Moment unbalance magnitude (kg.m**2), that is (Id - Ip) times
+            the disk skew angle. Default is 0.
+        moment_phase : list, float, optional
+            Moment unbalance phase (rad). Default is 0.
+        harmonic : float, optional
+            Harmonic order of the excitation. The load is speed**2 times
+            the unbalance, applied at harmonic * speed. Default is 1.
+        modes : list, optional
+            Modes that will be used to calculate the response
+            (all modes will be used if a list is not given).
 
         Returns
         -------
-        frequency_range : array
-            Array with the frequencies
-        magdb : array
-            Magnitude (dB) of the frequency response for each pair input/output.
-            The order of the array is: [output, input, magnitude]
-        phase : array
-            Phase of the frequency response for each pair input/output.
-            The order of the array is: [output, input, phase]
+        forced_response : ross.results.ForcedResponseResults
+            Complex response with shape (ndof, len(frequency_range)).
 
         Examples
         --------
+        >>> rotor = rotor_example()
+        >>> speed = np.linspace(0, 1000, 101)
+        >>> response = rotor.unbalance_response([2, 4], [1e-4, 1e-4],
+        ...                                     [0, np.pi], frequency_range=speed)
+        >>> response.shape
+        (28, 101)
         """
-        force = np.zeros((self.ndof, len(frequency_range)), dtype=np.complex)
+        if isinstance(frequency_range, str) and frequency_range == 'adaptive':
+            frequency_range = self.adaptive_frequency_range()
 
-        try:
-            for n, m, p in zip(node, magnitude, phase):
-                    force += self._unbalance_force(n, m, p, frequency_range)
-        except TypeError:
-            force = self._unbalance_force(node, magnitude, phase, frequency_range)
+        dofs, load = self._unbalance_load(node, magnitude, phase,
+                                          moment, moment_phase)
+        response = self._harmonic_response(dofs, load, frequency_range,
+                                           harmonic=harmonic, modes=modes)
 
-        forced_response = self.forced_response(force, frequency_range)
+        forced_response = ForcedResponseResults(
+            response, new_attributes={'frequency_range': frequency_range})
 
         return forced_response
 
+    @cached
+    def unbalance_analysis(self, load_cases, speed_range, probes,
+                           operating_range=None):
+        """Unbalance response analysis (API 684).
+
+        This method calculates the unbalance response for several load
+        cases (e.g. unbalance placements based on the mode shapes) at
+        several probes, and reports the critical speeds, amplification
+        factors and separation margins for each probe.
+        The dynamic stiffness is factorized once for each speed and all
+        load cases are solved together.
+
+        Parameters
+        ----------
+        load_cases : list
+            List with (node, magnitude, phase) for each load case.
+            node, magnitude and phase can be lists for unbalance in
+            several planes (see Rotor.unbalance_response).
+        speed_range : array
+            Rotor speeds (rad/s).
+        probes : list
+            List with (node, angle) for each probe. The angle (rad) is
+            measured from the x axis towards the y axis.
+        operating_range : tuple, optional
+            Tuple with (min, max) operating speed used for the separation
+            margin. Default is (rotor.min_w, rotor.max_w).
+
+        Returns
+        -------
+        results : ross.results.UnbalanceResults
+            Response for each load case and probe with shape
+            (len(load_cases), len(probes), len(speed_range)).
+
+        Examples
+        --------
+        >>> shaft = [ShaftElement(0.25, 0, 0.05, steel) for _ in range(6)]
+        >>> disks = [DiskElement(n, steel, 0.07, 0.05, 0.28) for n in [2, 4]]
+        >>> bearings = [BearingElement(n, kxx=1e6, cxx=1e3) for n in [0, 6]]
+        >>> rotor = Rotor(shaft, disks, bearings)
+        >>> speed = np.linspace(0, 1000, 201)
+        >>> results = rotor.unbalance_analysis(
+        ...     [(2, 1e-4, 0)], speed, probes=[(2, 0), (2, np.pi/2)],
+        ...     operating_range=(400, 600))
+        >>> results.shape
+        (1, 2, 201)
+        >>> results.critical_speeds[0, 0].round(1)
+        array([  96.8,  320.9])
+        >>> results.separation_margin[0, 0].round(1)
+        array([ 75.8,  19.8])
+        """
+        if operating_range is None:
+            operating_range = (self.min_w, self.max_w)
+        min_w, max_w = operating_range
+
+        n = self.ndof
+        speed_range = np.asarray(speed_range)
+
+        # load amplitudes (for unit speed) with shape (ndof, load cases)
+        F = np.zeros((n, len(load_cases)), dtype=np.complex128)
+        for i, (node, magnitude, phase) in enumerate(load_cases):
+            dofs, load = self._unbalance_load(node, magnitude, phase)
+            F[dofs, i] = load
+
+        # probe readings: x * cos(angle) + y * sin(angle)
+        probe_nodes = np.array([node for node, angle in probes], dtype=int)
+        probe_angles = np.array([angle for node, angle in probes], dtype=float)
+
+        M = self.M()
+        G = self.G()
+        response = np.zeros((len(load_cases), len(probes), len(speed_range)),
+                            dtype=np.complex128)
+
+        for i, w in enumerate(speed_range):
+            Z = self.K(w) + 1j * w * (self.C(w) + w * G) - w ** 2 * M
+            X = la.lu_solve(la.lu_factor(Z), w ** 2 * F)
+            response[..., i] = (np.cos(probe_angles)[:, np.newaxis] * X[4 * probe_nodes]
+                                + np.sin(probe_angles)[:, np.newaxis] * X[4 * probe_nodes + 1]).T
+
+        # peaks for each load case and probe (padded with nan)
+        index, x_peak, y_peak, x1, x2 = _peaks(speed_range, abs(response))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            af = x_peak / (x2 - x1)
+        sm, sm_required = _separation_margin(x_peak, af, min_w, max_w)
+
+        critical_speeds, peak_amplitude, af, sm, sm_required = _peak_table(
+            response.shape[:2], index, x_peak, y_peak, af, sm, sm_required)
+
+        results = UnbalanceResults(
+            response,
+            new_attributes={'speed_range': speed_range,
+                            'probes': np.array(probes, dtype=float),
+                            'min_w': min_w,
+                            'max_w': max_w,
+                            'critical_speeds': critical_speeds,
+                            'peak_amplitude': peak_amplitude,
+                            'amplification_factor': af,
+                            'separation_margin': sm,
+                            'required_separation_margin': sm_required})
+
+        return results
+
     def time_response(self, F, t, ic=None):
         """Time response for a rotor.
 
@@ -951,18 +1495,509 @@ class Rotor(object):
 
         Returns
         -------
+        results : ross.results.TimeResponseResults
+            System response with shape (len(t), ndof). The time values
+            are in results.t and the time evolution of the state vector
+            in results.xout.
+
+        Examples
+        --------
+        >>> rotor = rotor_example()
+        >>> t = np.linspace(0, 0.1, 11)
+        >>> F = np.zeros((len(t), rotor.ndof))
+        >>> F[:, 12] = 10
+        >>> response = rotor.time_response(F, t)
+        >>> response.shape
+        (11, 28)
+        """
+        import scipy.signal as signal
+
+        t, yout, xout = signal.lsim(self.lti, F, t, X0=ic)
+
+        results = TimeResponseResults(yout,
+                                      new_attributes={'t': t, 'xout': xout})
+
+        return results
+
+    def _discrete_foh(self, dt):
+        """State transition matrices for a first order hold.
+
+        The input is linearly interpolated between time steps (as in
+        scipy.signal.lsim), so that, for row vectors,
+        x[k + 1] = x[k] @ Ad + u[k] @ Bd0 + u[k + 1] @ Bd1.
+        """
+        A = self.lti.A
+        B = self.lti.B
+        n_states, n_inputs = B.shape
+
+        M = np.zeros((n_states + 2 * n_inputs, n_states + 2 * n_inputs))
+        M[:n_states, :n_states] = A * dt
+        M[:n_states, n_states:n_states + n_inputs] = B * dt
+        M[n_states:n_states + n_inputs, n_states + n_inputs:] = np.eye(n_inputs)
+
+        expMT = la.expm(M.T)
+        Ad = expMT[:n_states, :n_states]
+        Bd1 = expMT[n_states + n_inputs:, :n_states]
+        Bd0 = expMT[n_states:n_states + n_inputs, :n_states] - Bd1
+
+        return Ad, Bd0, Bd1
+
+    def time_response_chunks(self, F, t, dofs=None, ic=None, chunk_size=1000,
+                             decimate=1):
+        """Time response for a rotor calculated in chunks.
+
+        This is a generator version of Rotor.time_response for long
+        simulations. The response is calculated with the same
+        discretization used by scipy.signal.lsim, but only the state at
+        the end of each chunk and the selected dofs are kept, so each
+        chunk can be written to disk (or processed) and discarded.
+
+        Parameters
+        ----------
+        F : array, callable
+            Force array with shape (len(t), ndof), or a function that
+            receives an array of times and returns the forces with shape
+            (len(times), ndof), so that the forces for the whole
+            simulation are not stored. If None, the force is zero.
+        t : array
+            Equally spaced time array.
+        dofs : list, optional
+            Degrees of freedom in the output. Default is all dofs.
+        ic : array, optional
+            The initial conditions on the state vector (zero by default).
+        chunk_size : int, optional
+            Number of time steps calculated for each chunk. Default is 1000.
+        decimate : int, optional
+            Decimation factor. The output is filtered by an order 8
+            Chebyshev type I low pass filter (as in
+            scipy.signal.decimate with zero_phase=False) and every
+            decimate-th sample is returned. The filter state is kept
+            between chunks. Default is 1 (no decimation).
+
+        Yields
+        ------
+        results : ross.results.TimeResponseResults
+            Response for each chunk with shape (number of samples,
+            len(dofs)). The time values are in results.t and the dofs in
+            results.dofs.
+
+        Examples
+        --------
+        >>> rotor = rotor_example()
+        >>> t = np.linspace(0, 1, 2001)
+        >>> def force(t):
+        ...     F = np.zeros((len(t), rotor.ndof))
+        ...     F[:, 12] = 10 * np.sin(100 * t)
+        ...     return F
+        >>> chunks = rotor.time_response_chunks(force, t, dofs=[12, 13],
+        ...                                     chunk_size=500, decimate=4)
+        >>> [chunk.shape for chunk in chunks]
+        [(125, 2), (125, 2), (125, 2), (125, 2), (1, 2)]
+        """
+        import scipy.signal as signal
+
+        t = np.asarray(t, dtype=float)
+        if dofs is None:
+            dofs = np.arange(self.ndof)
+        dofs = np.atleast_1d(dofs)
+
+        C = self.lti.C[dofs]
+        D = self.lti.D[dofs]
+        n_states = self.lti.A.shape[0]
+
+        if F is not None and not callable(F):
+            F = np.asarray(F)
+            if F.shape[0] != len(t):
+                raise ValueError('F must have the same number of rows '
+                                 'as elements in t.')
+
+        dt = t[1] - t[0] if len(t) > 1 else 0
+        if not np.allclose(np.diff(t), dt):
+            raise ValueError('Time steps are not equally spaced.')
+        Ad, Bd0, Bd1 = self._discrete_foh(dt)
+
+        x = np.zeros(n_states) if ic is None else np.asarray(ic, dtype=float)
+        if t[0] > 0:
+            # step forward to initial time, with zero input
+            x = x @ la.expm(self.lti.A.T * t[0])
+        elif t[0] < 0:
+            raise ValueError('Initial time must be nonnegative')
+
+        if decimate > 1:
+            sos = signal.cheby1(8, 0.05, 0.8 / decimate, output='sos')
+            zi = np.zeros((sos.shape[0], 2, len(dofs)))
+
+        for i0 in range(0, len(t), chunk_size):
+            times = t[i0:i0 + chunk_size]
+            if F is None:
+                u = np.zeros((len(times), self.ndof))
+            elif callable(F):
+                u = np.asarray(F(times), dtype=float)
+            else:
+                u = F[i0:i0 + chunk_size]
+
+            # input contribution for each step (the last input of the
+            # previous chunk is kept)
+            if i0 == 0:
+                u_previous = u[0]
+            w = np.vstack([u_previous, u[:-1]]) @ Bd0 + u @ Bd1
+            u_previous = u[-1]
+
+            xout = np.empty((len(times), n_states))
+            for i in range(len(times)):
+                if i0 + i > 0:
+                    x = x @ Ad + w[i]
+                xout[i] = x
+
+            yout = xout @ C.T + u @ D.T
+
+            if decimate > 1:
+                yout, zi = signal.sosfilt(sos, yout, axis=0, zi=zi)
+                start = -i0 % decimate
+                yout = yout[start::decimate]
+                times = times[start::decimate]
+
+            yield TimeResponseResults(yout, new_attributes={'t': times,
+                                                            'dofs': dofs})
+
+    def _bearing_coefficients(self, speed):
+        """Bearing stiffness and damping for an array of speeds.
+
+        Returns
+        -------
+        dofs : array
+            First dof of each bearing/seal element.
+        K, C : array
+            Coefficients with shape (len(speed), elements, 2, 2).
+        """
+        speed = np.asarray(speed, dtype=float)
+        dofs = np.array([self._dofs(elm)[0] for elm in self.bearing_seal_elements],
+                        dtype=int)
+
+        coefficients = []
+        for prefix in 'kc':
+            values = [[np.broadcast_to(getattr(elm, prefix + name).interpolated(speed),
+                                       speed.shape)
+                       for name in ['xx', 'xy', 'yx', 'yy']]
+                      for elm in self.bearing_seal_elements]
+            values = np.array(values, dtype=float).reshape(-1, 2, 2, len(speed))
+            coefficients.append(values.transpose(3, 0, 1, 2))
+
+        return (dofs, *coefficients)
+
+    def transient_response(self, t, speed, F=None, unbalance=None, ic=None,
+                           dofs=None, tol=1e-3):
+        """Transient response with time varying speed (run-up/coast-down).
+
+        The equations of motion
+
+        M q'' + (C(speed) + speed * G) q' + K(speed) q = F(t)
+
+        are integrated with the Newmark average acceleration method
+        (unconditionally stable), with the bearing coefficients
+        interpolated for the speed at each time step. The effective
+        stiffness matrix is factorized only when it changes by more than
+        tol from the last factorization. In between, the last
+        factorization is used and the change is applied to a predicted
+        displacement on the right hand side.
+
+        Parameters
+        ----------
         t : array
-            Time values for the output.
-        yout : array
-            System response.
-        xout : array
-            Time evolution of the state vector.
+            Equally spaced time array.
+        speed : float, array
+            Rotor speed (rad/s) for each time value.
+        F : array, callable, optional
+            Force array with shape (len(t), ndof), or a function that
+            receives an array of times and returns the forces with shape
+            (len(times), ndof).
+        unbalance : tuple, optional
+            Tuple with (node, magnitude, phase) for an unbalance (see
+            Rotor.unbalance_response). The force includes the tangential
+            component due to the angular acceleration.
+        ic : tuple, optional
+            Initial displacements and velocities (zero by default).
+        dofs : list, optional
+            Degrees of freedom in the output. Default is all dofs.
+        tol : float, optional
+            Change in the effective stiffness matrix, relative to its
+            diagonal (Frobenius norm of D.dK.D, with D = diag^-1/2), that
+            triggers a new factorization. Default is 1e-3.
 
+        Returns
+        -------
+        results : ross.results.TimeResponseResults
+            Response with shape (len(t), len(dofs)). The time values are
+            in results.t, the speed in results.speed, the dofs in
+            results.dofs and the number of factorizations in
+            results.factorizations.
 
         Examples
         --------
+        >>> rotor = rotor_example()
+        >>> t = np.linspace(0, 1, 1001)
+        >>> response = rotor.transient_response(t, speed=500 * t,
+        ...                                     unbalance=(3, 1e-4, 0),
+        ...                                     dofs=[12, 13])
+        >>> response.shape
+        (1001, 2)
         """
-        return signal.lsim(self.lti, F, t, X0=ic)
+        n = self.ndof
+        t = np.asarray(t, dtype=float)
+        nt = len(t)
+        speed = np.broadcast_to(np.asarray(speed, dtype=float), t.shape)
+        if dofs is None:
+            dofs = np.arange(n)
+        dofs = np.atleast_1d(dofs)
+
+        dt = t[1] - t[0]
+        if not np.allclose(np.diff(t), dt):
+            raise ValueError('Time steps are not equally spaced.')
+
+        if F is not None and not callable(F):
+            F = np.asarray(F)
+            if F.shape != (nt, n):
+                raise ValueError('F must have shape (len(t), ndof).')
+
+        # unbalance force Re(load * (speed**2 - j * acceleration) * e^(j * angle))
+        if unbalance is not None:
+            unbalance_dofs, load = self._unbalance_load(*unbalance)
+            angle = np.concatenate(
+                [[0], np.cumsum((speed[1:] + speed[:-1]) / 2 * np.diff(t))])
+            acceleration = np.gradient(speed, t)
+            unbalance_force = np.real(
+                np.outer((speed ** 2 - 1j * acceleration) * np.exp(1j * angle), load))
+
+        def force(i0, i1):
+            if F is None:
+                u = np.zeros((i1 - i0, n))
+            elif callable(F):
+                u = np.array(F(t[i0:i1]), dtype=float)
+            else:
+                u = np.array(F[i0:i1], dtype=float)
+            if unbalance is not None:
+                u[:, unbalance_dofs] += unbalance_force[i0:i1]
+            return u
+
+        # constant matrices; the bearing coefficients (at the bearing
+        # dofs) and speed * G are added at each step
+        M = self.M()
+        G = self.G()
+        K0 = self.K(0)
+        C0 = self.C(0)
+        bearing_dofs, Kb0, Cb0 = self._bearing_coefficients([0])
+        for dof, k, c in zip(bearing_dofs, Kb0[0], Cb0[0]):
+            K0[dof:dof + 2, dof:dof + 2] -= k
+            C0[dof:dof + 2, dof:dof + 2] -= c
+
+        # coefficients for all time steps, added for elements that share dofs
+        bearing_dofs, Kb, Cb = self._bearing_coefficients(speed)
+        rows = bearing_dofs[:, np.newaxis, np.newaxis] + np.array([[0, 0], [1, 1]])
+        cols = bearing_dofs[:, np.newaxis, np.newaxis] + np.array([[0, 1], [0, 1]])
+        index, inverse = np.unique((rows * n + cols).ravel(), return_inverse=True)
+        rows, cols = index // n, index % n
+        Kb_sum = np.zeros((nt, len(index)))
+        Cb_sum = np.zeros((nt, len(index)))
+        np.add.at(Kb_sum.T, inverse, Kb.reshape(nt, -1).T)
+        np.add.at(Cb_sum.T, inverse, Cb.reshape(nt, -1).T)
+
+        def bearing_product(values, x):
+            return np.bincount(rows, weights=values * x[cols], minlength=n)
+
+        # Newmark average acceleration (beta = 1/4, gamma = 1/2)
+        a0, a1, a2 = 4 / dt ** 2, 2 / dt, 4 / dt
+        Eb_sum = Kb_sum + a1 * Cb_sum
+        E0 = K0 + a1 * C0 + a0 * M
+
+        if ic is None:
+            q, v = np.zeros(n), np.zeros(n)
+        else:
+            q, v = (np.array(x, dtype=float) for x in ic)
+        u = force(0, 1)[0]
+        a = la.solve(M, u - K0 @ q - bearing_product(Kb_sum[0], q)
+                     - C0 @ v - speed[0] * G @ v - bearing_product(Cb_sum[0], v))
+
+        response = np.zeros((nt, len(dofs)))
+        response[0] = q[dofs]
+
+        getrs, = la.get_lapack_funcs(('getrs',), (M,))
+        ref = None
+        factorizations = 0
+        chunk_size = 1000
+        for i0 in range(1, nt, chunk_size):
+            u_chunk = force(i0, min(i0 + chunk_size, nt))
+            for i, u in enumerate(u_chunk, start=i0):
+                if ref is not None:
+                    # change relative to the diagonal of the factorized matrix
+                    dE = Eb_sum[i] - Eb_sum[ref]
+                    dspeed = speed[i] - speed[ref]
+                    dE_scaled = dE * scale
+                    change = (np.sqrt(dE_scaled @ dE_scaled)
+                              + a1 * abs(dspeed) * G_scaled_norm)
+                if ref is None or change > tol:
+                    ref = i
+                    K_eff = E0 + a1 * speed[i] * G
+                    K_eff[rows, cols] += Eb_sum[i]
+                    d = 1 / np.sqrt(abs(np.diag(K_eff)))
+                    scale = d[rows] * d[cols]
+                    G_scaled_norm = la.norm(d[:, np.newaxis] * G * d)
+                    lu, piv = la.lu_factor(K_eff, check_finite=False)
+                    factorizations += 1
+                    dE, dspeed = None, 0
+
+                y = a1 * q + v
+                rhs = (u + M @ (a0 * q + a2 * v + a) + C0 @ y
+                       + speed[i] * (G @ y) + bearing_product(Cb_sum[i], y))
+                if dE is not None:
+                    # the change since the last factorization is applied
+                    # to a predicted displacement
+                    q_predicted = q + dt * v + dt ** 2 / 2 * a
+                    rhs -= (a1 * dspeed * (G @ q_predicted)
+                            + bearing_product(dE, q_predicted))
+                # lapack is called directly, since the wrapper overhead
+                # is larger than the solution for small models
+                q_new = getrs(lu, piv, rhs)[0]
+
+                a_new = a0 * (q_new - q) - a2 * v - a
+                v = v + dt / 2 * (a + a_new)
+                q, a = q_new, a_new
+                response[i] = q[dofs]
+
+        results = TimeResponseResults(
+            response, new_attributes={'t': t,
+                                      'speed': np.array(speed),
+                                      'dofs': dofs,
+                                      'factorizations': factorizations})
+
+        return results
+
+    def waterfall(self, speed_profile, probes, unbalance, method='transient',
+                  harmonics=(1,), window_size=1024, overlap=0.5):
+        """Waterfall (spectra over a run-up or coast-down) at probes.
+
+        The probe signals are split in windows (Hann window) and the
+        spectrum of each window is calculated. The response is obtained
+        with a transient simulation (see Rotor.transient_response) or,
+        with method='harmonic', with the steady state unbalance response
+        for the speed at the center of each window (see
+        Rotor.unbalance_response), in which case the spectra only have
+        the harmonics lines.
+
+        Order tracks (complex amplitude of each harmonic of the rotor
+        speed) are calculated for each window with a Fourier transform
+        along the shaft angle, so the speed may vary within a window.
+
+        Parameters
+        ----------
+        speed_profile : tuple
+            Tuple with (t, speed), where t is an equally spaced time array
+            and speed is the rotor speed (rad/s) for each time value.
+        probes : list
+            List with (node, angle) for each probe. The angle (rad) is
+            measured from the x axis towards the y axis.
+        unbalance : tuple
+            Tuple with (node, magnitude, phase) for the unbalance.
+        method : str, optional
+            'transient' (default) or 'harmonic'.
+        harmonics : tuple, optional
+            Harmonics of the rotor speed for the order tracks.
+            Default is (1,).
+        window_size : int, optional
+            Number of samples in each window. Default is 1024.
+        overlap : float, optional
+            Overlap between windows. Default is 0.5.
+
+        Returns
+        -------
+        results : ross.results.WaterfallResults
+            Spectra amplitudes with shape (windows, len(probes),
+            frequencies).
+
+        Examples
+        --------
+        >>> rotor = rotor_example()
+        >>> t = np.linspace(0, 1, 4001)
+        >>> results = rotor.waterfall((t, 200 + 300 * t), probes=[(3, 0)],
+        ...                           unbalance=(3, 1e-4, 0), method='harmonic',
+        ...                           window_size=512)
+        >>> results.shape
+        (14, 1, 257)
+        >>> results.order(1).shape
+        (14, 1)
+        """
+        t, speed = (np.asarray(x, dtype=float) for x in speed_profile)
+        speed = np.broadcast_to(speed, t.shape)
+        dt = t[1] - t[0]
+
+        step = max(int(window_size * (1 - overlap)), 1)
+        n_windows = (len(t) - window_size) // step + 1
+        if n_windows < 1:
+            raise ValueError('The speed profile is shorter than the window.')
+        start = step * np.arange(n_windows)
+        center = start + window_size // 2
+        window = np.hanning(window_size)
+        # a sinusoid with amplitude 1 has a peak of 1
+        scale = 2 / window.sum()
+        frequency = 2 * np.pi * np.fft.rfftfreq(window_size, dt)
+        harmonics = np.atleast_1d(np.asarray(harmonics, dtype=float))
+
+        probe_nodes = np.array([node for node, angle in probes], dtype=int)
+        probe_angles = np.array([angle for node, angle in probes], dtype=float)
+        cos, sin = np.cos(probe_angles), np.sin(probe_angles)
+
+        if method == 'transient':
+            dofs = np.concatenate([4 * probe_nodes, 4 * probe_nodes + 1])
+            response = np.asarray(self.transient_response(
+                t, speed, unbalance=unbalance, dofs=dofs))
+            signal = np.ascontiguousarray(
+                cos * response[:, :len(probes)] + sin * response[:, len(probes):])
+
+            # windows with shape (windows, window_size, probes) (no copy)
+            s0, s1 = signal.strides
+            windows = np.lib.stride_tricks.as_strided(
+                signal, shape=(n_windows, window_size, len(probes)),
+                strides=(step * s0, s0, s1)) * window[:, np.newaxis]
+            spectrum = scale * np.abs(np.fft.rfft(windows, axis=1))
+            spectrum = spectrum.transpose(0, 2, 1)
+
+            angle = np.concatenate(
+                [[0], np.cumsum((speed[1:] + speed[:-1]) / 2 * np.diff(t))])
+            window_angle = angle[start[:, np.newaxis] + np.arange(window_size)]
+            orders = scale * np.einsum(
+                'wkp,hwk->hwp', windows,
+                np.exp(-1j * harmonics[:, np.newaxis, np.newaxis] * window_angle))
+        elif method == 'harmonic':
+            node, magnitude, phase = unbalance
+            orders = np.zeros((len(harmonics), n_windows, len(probes)),
+                              dtype=np.complex128)
+            for i, harmonic in enumerate(harmonics):
+                response = self.unbalance_response(
+                    node, magnitude, phase, frequency_range=speed[center],
+                    harmonic=harmonic)
+                orders[i] = (cos[:, np.newaxis] * response[4 * probe_nodes]
+                             + sin[:, np.newaxis] * response[4 * probe_nodes + 1]).T
+
+            # lines at the closest frequency
+            spectrum = np.zeros((n_windows, len(probes), len(frequency)))
+            bins = np.rint(harmonics[:, np.newaxis] * speed[center]
+                           / frequency[1]).astype(int)
+            window_index = np.broadcast_to(np.arange(n_windows), bins.shape)
+            valid = bins < len(frequency)
+            np.add.at(spectrum.transpose(0, 2, 1),
+                      (window_index[valid], bins[valid]),
+                      np.abs(orders[valid]))
+        else:
+            raise ValueError(f'Invalid method {method}.')
+
+        results = WaterfallResults(
+            spectrum, new_attributes={'frequency': frequency,
+                                      'speed_range': np.array(speed[center]),
+                                      't': t[center],
+                                      'probes': np.array(probes, dtype=float),
+                                      'harmonics': harmonics,
+                                      'orders': orders})
+
+        return results
 
     def plot_rotor(self, nodes=1, ax=None):
         """Plots a rotor object.
@@ -984,6 +2019,10 @@ class Rotor(object):
 
         Examples:
         """
+        import matplotlib.pyplot as plt
+
+        set_style()
+
         if ax is None:
             ax = plt.gca()
 
@@ -1027,6 +2066,7 @@ class Rotor(object):
 
         return ax
 
+    @cached
     def campbell(self, speed_range, frequencies=6, frequency_type='wd'):
         """Calculates the Campbell diagram.
 
@@ -1081,62 +2121,333 @@ class Rotor(object):
 
         results = CampbellResults(
             results,
-            new_attributes={'speed_range': speed_range,
-                            'wd': results[..., 0],
-                            'log_dec': results[..., 1],
-                            'whirl_values': results[..., 2]})
+            new_attributes={'speed_range': speed_range})
 
         self.w = rotor_current_speed
 
         return results
 
-    def mode_shapes(self):
-        # TODO add docs
-        kappa_modes = []
-        for mode in range(len(self.wn)):
-            kappa_color = []
-            kappa_mode = self.kappa_mode(mode)
-            for kappa in kappa_mode:
-                kappa_color.append('tab:blue' if kappa > 0 else 'tab:red')
-            kappa_modes.append(kappa_color)
-
-        mode_shapes = ModeShapeResults(self.evectors[:self.ndof],
+    def critical_speeds(self, harmonics=(1,), frequencies=6, tol=1e-8,
+                        maxiter=20):
+        r"""Calculates the critical speeds.
+
+        For each harmonic :math:`k` and each mode, the speed where
+        :math:`\omega_d(\Omega) = k \Omega` is found with a Newton
+        iteration that uses the eigenvalue derivative with respect to the
+        speed. Each iteration costs one eigenvalue solution, so only a
+        few solutions are needed instead of a dense campbell sweep.
+
+        The iteration may jump to a neighbouring mode, so a critical speed
+        is only accepted if, at that speed, the residual of the j-th mode
+        is within the tolerance and its shape matches (MAC > 0.9) the mode
+        that was tracked.
+
+        Parameters
+        ----------
+        harmonics : tuple, optional
+            Harmonics (e.g. (0.5, 1, 2)).
+            Default is (1,).
+        frequencies : int, optional
+            Number of modes for which the critical speeds are calculated.
+            Default is 6.
+        tol : float, optional
+            Relative tolerance for the speed and for the residual
+            wd - k * speed.
+            Default is 1e-8.
+        maxiter : int, optional
+            Maximum number of iterations for each critical speed.
+            Default is 20.
+
+        Returns
+        -------
+        critical_speeds : array
+            Array with shape (len(harmonics), frequencies) with the
+            critical speeds in rad/s. If the iteration does not converge
+            to a positive speed, or converges to the critical speed of
+            another mode, the value is nan.
+
+        Examples
+        --------
+        >>> rotor = rotor_example()
+        >>> np.round(rotor.critical_speeds(frequencies=4), 1)
+        array([[  82.6,   86.7,  247.9,  281.6]])
+        """
+        evalues, evectors, devalues = self._eigen_speed_derivative(self.w)
+        critical_speeds = np.full((len(harmonics), frequencies), np.nan)
+
+        for i, k in enumerate(harmonics):
+            for j in range(frequencies):
+                critical_speeds[i, j] = self._critical_speed(
+                    k, j, evalues[j], devalues[j], evectors[:, j], tol,
+                    maxiter)[0]
+
+        return critical_speeds
+
+    def _critical_speed(self, k, j, lam, dlam, evector, tol, maxiter):
+        """Newton iteration of critical_speeds for the j-th mode.
+
+        The iteration starts at the rotor speed, where the mode has the
+        eigenvalue lam, its derivative dlam and the eigenvector evector.
+        Returns the critical speed and the eigenvalue at that speed, or nan
+        if the critical speed is not accepted.
+        """
+        w = self.w
+        for _ in range(maxiter):
+            w_new = w - (lam.imag - k * w) / (dlam.imag - k)
+            evalues, evectors, devalues = self._eigen_speed_derivative(w_new)
+            m = self._track(evalues, lam + dlam * (w_new - w))
+            converged = abs(w_new - w) <= tol * max(abs(w_new), 1)
+            lam, dlam, w = evalues[m], devalues[m], w_new
+            evector = evectors[:, m]
+            if converged:
+                if (w > 0 and abs(evalues[j].imag - k * w) <= tol * k * w
+                        and MAC(evector, evectors[:, j]) > 0.9):
+                    return w, evalues[j]
+                break
+
+        return np.nan, np.nan
+
+    def stability_threshold(self, speed_range, frequencies=6, num=5,
+                            tol=1e-8, maxiter=20):
+        r"""Calculates the onset speed of instability.
+
+        The speed where the log dec of a forward (or mixed) mode crosses
+        zero is found with a safeguarded Newton iteration on the largest
+        negative damping ratio of these modes, using the eigenvalue
+        derivative with respect to the speed. The speed range is first
+        divided in num - 1 intervals to bracket the first crossing.
+
+        Modes with a damping ratio smaller than 1e-10 (e.g. undamped
+        rotors) are considered stable.
+
+        Parameters
+        ----------
+        speed_range : tuple
+            Tuple with (start, end) for the speed range in rad/s.
+        frequencies : int, optional
+            Number of modes that will be checked.
+            Default is 6.
+        num : int, optional
+            Number of speeds used to bracket the crossing.
+            Default is 5.
+        tol : float, optional
+            Relative tolerance for the speed.
+            Default is 1e-8.
+        maxiter : int, optional
+            Maximum number of Newton iterations.
+            Default is 20.
+
+        Returns
+        -------
+        threshold : float
+            The lowest speed (rad/s) in speed_range where a forward mode
+            becomes unstable. None if the rotor is stable in the range.
+        """
+        def negative_damping(w):
+            """Largest negative damping ratio and its derivative."""
+            evalues, evectors, devalues = self._eigen_speed_derivative(w)
+            evalues = evalues[:frequencies]
+            devalues = devalues[:frequencies]
+
+            u = evectors[0:self.ndof:4, :frequencies]
+            v = evectors[1:self.ndof:4, :frequencies]
+            whirl_w = [whirl(k) for k in _kappa(u, v).T]
+            non_backward = np.array(whirl_w) != 'Backward'
+            if not any(non_backward):
+                return -np.inf, 0.
+
+            evalues = evalues[non_backward]
+            devalues = devalues[non_backward]
+            abs_evalues = np.absolute(evalues)
+            g = evalues.real / abs_evalues
+            dg = (devalues.real / abs_evalues
+                  - evalues.real * np.real(evalues.conj() * devalues)
+                  / abs_evalues ** 3)
+
+            i = np.argmax(g)
+            return g[i] - 1e-10, dg[i]
+
+        speeds = np.linspace(*speed_range, num)
+        a = speeds[0]
+        g, dg = negative_damping(a)
+        if g > 0:
+            return a
+
+        for b in speeds[1:]:
+            g, dg = negative_damping(b)
+            if g <= 0:
+                a = b
+                continue
+
+            # first crossing is in [a, b]
+            w = b
+            for _ in range(maxiter):
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    w_new = w - g / dg
+                if not a < w_new < b:
+                    w_new = (a + b) / 2
+                if abs(w_new - w) <= tol * max(abs(w_new), 1):
+                    return w_new
+                w = w_new
+                g, dg = negative_damping(w)
+                if g > 0:
+                    b = w
+                else:
+                    a = w
+
+            return w
+
+        return None
+
+    def eigen_sensitivity(self, params, frequencies=6):
+        r"""Derivatives of wn, wd and log dec with respect to parameters.
+
+        The eigenvalue derivatives are calculated with the left
+        (:math:`y`) and right (:math:`x`) eigenvectors of the state space
+        matrix. For a parameter :math:`p` of an element:
+
+        .. math::
+
+            \frac{\partial \lambda}{\partial p} = -\frac{z^H \left(
+            K' + \lambda (C' + \Omega G') + \lambda^2 M' \right) x_1}
+            {y^H x}
+
+        where :math:`x_1` is the displacement part of :math:`x` and
+        :math:`z = M^{-1} y_2`, with :math:`y_2` the velocity part of
+        :math:`y`. Only the element matrices derivatives are needed, so
+        all the gradients are obtained with a single eigenvalue solution.
+
+        Parameters
+        ----------
+        params : list
+            List of tuples (element, parameter), where element is one of
+            the rotor elements (e.g. rotor.bearing_seal_elements[0]) and
+            parameter is:
+            a bearing coefficient ('kxx', 'kxy', 'kyx', 'kyy', 'cxx', 'cxy',
+            'cyx' or 'cyy');
+            a disk property ('m', 'Id' or 'Ip');
+            a shaft element diameter ('i_d' or 'o_d').
+        frequencies : int, optional
+            Number of modes for which the derivatives are calculated.
+            Default is 6.
+
+        Returns
+        -------
+        sensitivity : dict
+            Dictionary with the derivatives of 'wn', 'wd' and 'log_dec'.
+            Each value is an array with shape (len(params), frequencies).
+
+        Examples
+        --------
+        >>> rotor = rotor_example()
+        >>> bearing = rotor.bearing_seal_elements[0]
+        >>> sens = rotor.eigen_sensitivity([(bearing, 'kxx')], frequencies=2)
+        >>> # derivative of the second damped natural frequency
+        >>> sens['wd'][0, 1] # doctest: +ELLIPSIS
+        7.458...e-06
+        """
+        w = self.w
+        evalues, right, left = self._eigen(w, sparse=False, left=True)
+        evalues = evalues[:frequencies]
+        right = right[:, :frequencies]
+        left = left[:, :frequencies]
+
+        x1 = right[:self.ndof]
+        z = la.solve(self.M(), left[self.ndof:])
+
+        devalues = np.zeros((len(params), frequencies), dtype=np.complex128)
+        for i, (element, parameter) in enumerate(params):
+            if not any(element is el for el in self.elements):
+                raise ValueError(f'{element} is not an element of this rotor.')
+            n1, n2 = self._dofs(element)
+            dM, dK, dC, dG = self._element_derivatives(element, parameter)
+            # one matrix for each mode: K' + lambda (C' + w G') + lambda^2 M'
+            dZ = (dK + evalues[:, None, None] * (dC + w * dG)
+                  + evalues[:, None, None] ** 2 * dM)
+            num = np.einsum('im,mij,jm->m', z[n1:n2].conj(), dZ, x1[n1:n2])
+            # left eigenvectors are normalized, so y^H x = 1
+            devalues[i] = -num
+
+        wd = evalues.imag
+        wn = np.absolute(evalues)
+        dwd = devalues.imag
+        dwn = np.real(evalues.conj() * devalues) / wn
+        dlog_dec = -2 * np.pi * (devalues.real * wd - evalues.real * dwd) / wd ** 2
+
+        return {'wn': dwn, 'wd': dwd, 'log_dec': dlog_dec}
+
+    @cached
+    def mode_shapes(self, modes=None):
+        """Mode shapes of the rotor.
+
+        Parameters
+        ----------
+        modes : list, optional
+            Indexes of the modes (see wd). Only these modes are stored in
+            the results. Default is all modes.
+
+        Returns
+        -------
+        mode_shapes : ModeShapeResults
+            Eigenvectors for the dofs of each mode.
+
+        Examples
+        --------
+        >>> rotor = rotor_example()
+        >>> mode_shapes = rotor.mode_shapes(modes=[0, 3])
+        >>> mode_shapes.shape
+        (28, 2)
+        >>> mode_shapes.modes
+        array([0, 3])
+        """
+        # the eigenvectors after the first len(self.wd) are the conjugates
+        if modes is None:
+            modes = slice(len(self.wd))
+        index = np.arange(len(self.wd))[modes]
+
+        mode_shapes = ModeShapeResults(self.evectors[:self.ndof, modes],
                                        new_attributes={'ndof': self.ndof,
+                                                       'modes': index,
                                                        'nodes': self.nodes,
                                                        'nodes_pos': self.nodes_pos,
                                                        'elements_length': self.elements_length,
                                                        'w': self.w,
-                                                       'wd': self.wd,
-                                                       'log_dec': self.log_dec,
-                                                       'kappa_modes': kappa_modes})
+                                                       'wd': self.wd[modes],
+                                                       'log_dec': self.log_dec[modes]})
 
         return mode_shapes
 
-    def plot_ucs(self, stiffness_range=None, num=20, ax=None):
-        """Plot undamped critical speed map.
+    @cached
+    def ucs(self, stiffness_range=None, num=20):
+        """Undamped critical speed map.
 
-        This method will plot the undamped critical speed map for a given range
-        of stiffness values. If the range is not provided, the bearing
+        This method will calculate the undamped critical speed map for a given
+        range of stiffness values. If the range is not provided, the bearing
         stiffness at rated speed will be used to create a range.
 
         Parameters
         ----------
         stiffness_range : tuple, optional
-            Tuple with (start, end) for stiffness range.
+            Tuple with (start, end) for the stiffness range (log10 values).
         num : int
             Number of steps in the range.
             Default is 20.
-        ax : matplotlib axes, optional
-            Axes in which the plot will be drawn.
 
         Returns
         -------
-        ax : matplotlib axes
-            Returns the axes object with the plot.
-        """
-        if ax is None:
-            ax = plt.gca()
+        results : ross.results.UCSResults
+            Critical speeds (rad/s) with shape (4, num).
 
+        Examples
+        --------
+        >>> rotor = rotor_example()
+        >>> ucs = rotor.ucs(stiffness_range=(6, 9), num=4)
+        >>> ucs.shape
+        (4, 4)
+        >>> ucs.stiffness_range
+        array([  1.00000000e+06,   1.00000000e+07,   1.00000000e+08,
+                 1.00000000e+09])
+        """
         if stiffness_range is None:
             if self.rated_w is not None:
                 bearing = self.bearing_seal_elements[0]
@@ -1160,29 +2471,22 @@ class Rotor(object):
                                    bearings, n_eigen=16)
             rotor_wn[:, i] = rotor.wn[:8:2]
 
-        ax.set_prop_cycle(cycler('color', seaborn_colors))
-        ax.loglog(stiffness_log, rotor_wn.T)
-        ax.set_xlabel('Bearing Stiffness (N/m)')
-        ax.set_ylabel('Critical Speed (rad/s)')
-
         bearing0 = bearings_elements[0]
 
-        ax.plot(bearing0.kxx.interpolated(bearing0.w), bearing0.w,
-                marker='o', color='k', alpha=0.25,
-                markersize=5, lw=0, label='kxx')
-        ax.plot(bearing0.kyy.interpolated(bearing0.w), bearing0.w,
-                marker='s', color='k', alpha=0.25,
-                markersize=5, lw=0, label='kyy')
-        ax.legend()
+        results = UCSResults(
+            rotor_wn,
+            new_attributes={'stiffness_range': stiffness_log,
+                            'bearing_w': bearing0.w,
+                            'bearing_kxx': bearing0.kxx.interpolated(bearing0.w),
+                            'bearing_kyy': bearing0.kyy.interpolated(bearing0.w)})
 
-        return ax
+        return results
 
-    def plot_level1(self, n=None, stiffness_range=None,
-                    num=5, ax=None, **kwargs):
-        """Plot level 1 stability analysis.
+    def plot_ucs(self, stiffness_range=None, num=20, ax=None):
+        """Plot undamped critical speed map.
 
-        This method will plot the stability 1 analysis for a
-        given stiffness range.
+        This method will plot the undamped critical speed map for a given range
+        of stiffness values (see Rotor.ucs).
 
         Parameters
         ----------
@@ -1190,7 +2494,7 @@ class Rotor(object):
             Tuple with (start, end) for stiffness range.
         num : int
             Number of steps in the range.
-            Default is 5.
+            Default is 20.
         ax : matplotlib axes, optional
             Axes in which the plot will be drawn.
 
@@ -1199,9 +2503,31 @@ class Rotor(object):
         ax : matplotlib axes
             Returns the axes object with the plot.
         """
-        if ax is None:
-            ax = plt.gca()
+        return self.ucs(stiffness_range=stiffness_range, num=num).plot(ax=ax)
+
+    @cached
+    def level1(self, n=None, stiffness_range=None, num=5):
+        """Level 1 stability analysis.
+
+        This method will calculate the log dec of the first non backward
+        mode at rated speed for a range of cross coupled stiffness applied
+        at node n.
+
+        Parameters
+        ----------
+        n : int
+            Node where the cross coupled stiffness is applied.
+        stiffness_range : tuple
+            Tuple with (start, end) for stiffness range.
+        num : int
+            Number of steps in the range.
+            Default is 5.
 
+        Returns
+        -------
+        results : ross.results.Level1Results
+            Log dec for each cross coupled stiffness.
+        """
         stiffness = np.linspace(*stiffness_range, num)
 
         log_dec = np.zeros(len(stiffness))
@@ -1220,17 +2546,44 @@ class Rotor(object):
             non_backward = rotor.whirl_direction() != 'Backward'
             log_dec[i] = rotor.log_dec[non_backward][0]
 
-        ax.plot(stiffness, log_dec, '--', **kwargs)
-        ax.set_xlabel('Applied Cross Coupled Stiffness, Q (N/m)')
-        ax.set_ylabel('Log Dec')
+        results = Level1Results(log_dec,
+                                new_attributes={'stiffness_range': stiffness})
 
-        return ax
+        return results
+
+    def plot_level1(self, n=None, stiffness_range=None,
+                    num=5, ax=None, **kwargs):
+        """Plot level 1 stability analysis.
+
+        This method will plot the stability 1 analysis for a
+        given stiffness range (see Rotor.level1).
+
+        Parameters
+        ----------
+        n : int
+            Node where the cross coupled stiffness is applied.
+        stiffness_range : tuple, optional
+            Tuple with (start, end) for stiffness range.
+        num : int
+            Number of steps in the range.
+            Default is 5.
+        ax : matplotlib axes, optional
+            Axes in which the plot will be drawn.
+
+        Returns
+        -------
+        ax : matplotlib axes
+            Returns the axes object with the plot.
+        """
+        results = self.level1(n=n, stiffness_range=stiffness_range, num=num)
+
+        return results.plot(ax=ax, **kwargs)
 
     def plot_time_response(self, F, t, dof, ax=None):
         """Plot the time response.
 
         This function will take a rotor object and plot its time response
-        given a force and a time.
+        given a force and a time (see Rotor.time_response).
 
         Parameters
         ----------
@@ -1252,35 +2605,12 @@ class Rotor(object):
         Examples:
         ---------
         """
-        t_, yout, xout = self.time_response(F, t)
-
-        if ax is None:
-            ax = plt.gca()
-
-        ax.plot(t, yout[:, dof])
-
-        if dof % 4 == 0:
-            obs_dof = '$x$'
-            amp = 'm'
-        elif dof + 1 % 4 == 0:
-            obs_dof = '$y$'
-            amp = 'm'
-        elif dof + 2 % 4 == 0:
-            obs_dof = '$\alpha$'
-            amp = 'rad'
-        else:
-            obs_dof = '$\beta$'
-            amp = 'rad'
-
-        ax.set_xlabel('Time (s)')
-        ax.set_ylabel('Amplitude (%s)' % amp)
-        ax.set_title('Response for node %s and degree of freedom %s'
-                     % (dof//4, obs_dof))
-
-        return ax
+        return self.time_response(F, t).plot(dof, ax=ax)
 
     def save_mat(self, file_name):
         """Save matrices and rotor model to a .mat file."""
+        import scipy.io as sio
+
         dic = {'M': self.M(),
                'K': self.K(),
                'C': self.C(),
@@ -1290,18 +2620,96 @@ class Rotor(object):
         sio.savemat('%s/%s.mat' % (os.getcwd(), file_name), dic)
 
     def save(self, file_name):
-        """Save rotor to binary file.
+        """Save rotor to a binary (.npz) file.
+
+        Elements are stored as arrays (one row per element), bearing
+        coefficients as tables with the speeds in which they were given
+        and everything else as json metadata. Pickle is not used, so the
+        file can be loaded with numpy alone.
 
         Parameters
         ----------
         file_name : str
+
+        Examples
+        --------
+        >>> import tempfile
+        >>> rotor = rotor_example()
+        >>> file = os.path.join(tempfile.mkdtemp(), 'rotor.npz')
+        >>> rotor.save(file)
+        >>> rotor_loaded = Rotor.load(file)
+        >>> np.allclose(rotor.wn, rotor_loaded.wn)
+        True
         """
-        with open(file_name, 'wb') as f:
-            pickle.dump(self, f)
+        materials = []
+
+        def material_index(material):
+            for i, mat in enumerate(materials):
+                if mat is material:
+                    return i
+            materials.append(material)
+            return len(materials) - 1
+
+        shaft = np.array([[sh.n, sh.L, sh.i_d, sh.o_d, sh.shear_effects,
+                           sh.rotary_inertia, sh.gyroscopic,
+                           material_index(sh.material)]
+                          for sh in self.shaft_elements], dtype=np.float64)
+
+        disks = np.full((len(self.disk_elements), 8), np.nan)
+        for i, disk in enumerate(self.disk_elements):
+            disks[i, :4] = disk.n, disk.m, disk.Id, disk.Ip
+            if isinstance(disk, DiskElement):
+                disks[i, 4:] = (disk.width, disk.i_d, disk.o_d,
+                                material_index(disk.material))
+
+        arrays = {
+            'shaft': shaft.reshape(-1, 8),
+            'disks': disks,
+            'materials': np.array([[mat.rho, mat.E, mat.G_s, mat.Poisson]
+                                   for mat in materials], dtype=np.float64)
+        }
+
+        coefficients = ['kxx', 'kyy', 'kxy', 'kyx', 'cxx', 'cyy', 'cxy', 'cyx']
+        bearings = []
+        for i, brg in enumerate(self.bearing_seal_elements):
+            arrays[f'bearing{i}'] = np.array(
+                [getattr(brg, c).coefficient for c in coefficients],
+                dtype=np.float64
+            )
+            has_w = brg.kxx.w is not None
+            if has_w:
+                arrays[f'bearing{i}_w'] = np.array(brg.kxx.w, dtype=np.float64)
+
+            kwargs = {}
+            for name in inspect.signature(type(brg)).parameters:
+                if name in coefficients or name in ('n', 'w'):
+                    continue
+                value = getattr(brg, name, None)
+                if value is None or isinstance(value, (str, bool, int, float)):
+                    kwargs[name] = value
+                else:
+                    arrays[f'bearing{i}_{name}'] = np.asarray(value)
 
-    @staticmethod
-    def load(file_name):
-        """Load rotor from binary file.
+            bearings.append({'class': type(brg).__name__, 'n': brg.n,
+                             'w': has_w, 'kwargs': kwargs})
+
+        metadata = {
+            'format': 'ross.Rotor',
+            'version': 1,
+            'config': {'w': self.w, 'sparse': self.sparse,
+                       'n_eigen': self.n_eigen, 'min_w': self.min_w,
+                       'max_w': self.max_w, 'rated_w': self.rated_w},
+            'materials': [{'name': mat.name, 'color': mat.color}
+                          for mat in materials],
+            'disks': [type(disk).__name__ for disk in self.disk_elements],
+            'bearings': bearings,
+        }
+
+        save_npz(file_name, arrays, metadata)
+
+    @classmethod
+    def load(cls, file_name):
+        """Load rotor from a binary (.npz) file created with Rotor.save.
 
         Parameters
         ----------
@@ -1311,8 +2719,58 @@ class Rotor(object):
         -------
         rotor : ross.rotor.Rotor
         """
-        with open(file_name, 'rb') as f:
-            return pickle.load(f)
+        arrays, metadata = load_npz(file_name)
+        if metadata.get('format') != 'ross.Rotor':
+            raise ValueError(f'{file_name} is not a rotor file.')
+
+        materials = [
+            Material(name=mat['name'], rho=rho, E=E, G_s=G_s,
+                     Poisson=Poisson, color=mat['color'])
+            for mat, (rho, E, G_s, Poisson)
+            in zip(metadata['materials'], arrays['materials'])
+        ]
+
+        shaft_elements = [
+            ShaftElement(L, i_d, o_d, materials[int(mat)], n=int(n),
+                         shear_effects=bool(shear), rotary_inertia=bool(rotary),
+                         gyroscopic=bool(gyroscopic))
+            for n, L, i_d, o_d, shear, rotary, gyroscopic, mat
+            in arrays['shaft']
+        ]
+
+        disk_elements = []
+        for class_name, (n, m, Id, Ip, width, i_d, o_d, mat) in zip(
+                metadata['disks'], arrays['disks']):
+            if class_name == 'DiskElement':
+                disk = DiskElement(int(n), materials[int(mat)], width, i_d, o_d)
+            else:
+                disk = LumpedDiskElement(int(n), m, Id, Ip)
+            disk_elements.append(disk)
+
+        names = ['kxx', 'kyy', 'kxy', 'kyx', 'cxx', 'cyy', 'cxy', 'cyx']
+        bearing_seal_elements = []
+        for i, brg in enumerate(metadata['bearings']):
+            table = arrays[f'bearing{i}']
+            if brg['w']:
+                coefficients = dict(zip(names, table))
+                w = arrays[f'bearing{i}_w']
+            else:
+                coefficients = dict(zip(names, table[:, 0]))
+                w = None
+
+            kwargs = dict(brg['kwargs'])
+            prefix = f'bearing{i}_'
+            for name, array in arrays.items():
+                if name.startswith(prefix) and name != prefix + 'w':
+                    kwargs[name[len(prefix):]] = array
+
+            bearing_class = globals()[brg['class']]
+            bearing_seal_elements.append(
+                bearing_class(n=brg['n'], w=w, **coefficients, **kwargs)
+            )
+
+        return cls(shaft_elements, disk_elements, bearing_seal_elements,
+                   **metadata['config'])
 
 
 def rotor_example():
@@ -1362,48 +2820,166 @@ def MAC(u, v):
     return np.absolute((H(u) @ v)**2 / ((H(u) @ u)*(H(v) @ v)))
 
 
-def MAC_modes(U, V, n=None, plot=True):
-    """MAC for multiple vectors"""
-    # n is the number of modes to be evaluated
-    if n is None:
-        n = U.shape[1]
-    macs = np.zeros((n, n))
-    for u in enumerate(U.T[:n]):
-        for v in enumerate(V.T[:n]):
-            macs[u[0], v[0]] = MAC(u[1], v[1])
+def MAC_matrix(U, V=None, dofs=None):
+    """MAC between the columns of two arrays of mode shapes.
+
+    The MAC matrix is calculated with one normalized Gram matrix product,
+    |U^H V|^2 / (diag(U^H U) diag(V^H V)^T). Stacks of mode shapes (e.g.
+    Monte Carlo samples) with shape (..., dofs, modes) are broadcast.
+
+    Parameters
+    ----------
+    U : array
+        Mode shapes (columns).
+    V : array, optional
+        Mode shapes (columns). Default is U.
+    dofs : list, optional
+        Rows (dofs) used to calculate the MAC. Default is all rows.
+
+    Returns
+    -------
+    macs : array
+        MAC for each pair of columns with shape (..., U modes, V modes).
+
+    Examples
+    --------
+    >>> rotor = rotor_example()
+    >>> U = rotor.evectors[:rotor.ndof, :4]
+    >>> MAC_matrix(U).round(2)
+    array([[ 1.,  0.,  0.,  0.],
+           [ 0.,  1.,  0.,  0.],
+           [ 0.,  0.,  1.,  0.],
+           [ 0.,  0.,  0.,  1.]])
+    """
+    U = np.asarray(U)
+    V = U if V is None else np.asarray(V)
+    if dofs is not None:
+        U = U[..., dofs, :]
+        V = V[..., dofs, :]
+
+    gram = np.swapaxes(U.conj(), -1, -2) @ V
+    norm_u = np.sum(np.abs(U) ** 2, axis=-2)
+    norm_v = np.sum(np.abs(V) ** 2, axis=-2)
+
+    return np.abs(gram) ** 2 / (norm_u[..., :, np.newaxis]
+                                * norm_v[..., np.newaxis, :])
+
+
+def pair_modes(U, V, dofs=None, min_mac=0):
+    """Pair the modes of two models based on the MAC.
+
+    The pairs are the assignment that maximizes the sum of the MAC values
+    (Hungarian algorithm), so each mode is used only once.
+
+    Parameters
+    ----------
+    U, V : array
+        Mode shapes (columns) of each model.
+    dofs : list, optional
+        Rows (dofs) used to calculate the MAC. Default is all rows.
+    min_mac : float, optional
+        Pairs with a MAC below this value are not returned. Default is 0.
+
+    Returns
+    -------
+    index_u, index_v : array
+        Columns of U and V for each pair.
+    macs : array
+        MAC for each pair.
 
-    if not plot:
-        return macs
+    Examples
+    --------
+    >>> rotor = rotor_example()
+    >>> U = rotor.evectors[:rotor.ndof, :4]
+    >>> index_u, index_v, macs = pair_modes(U, U[:, [2, 0, 3, 1]])
+    >>> index_v
+    array([1, 3, 0, 2])
+    """
+    from scipy.optimize import linear_sum_assignment
+
+    macs = MAC_matrix(U, V, dofs=dofs)
+    index_u, index_v = linear_sum_assignment(-macs)
+    macs = macs[index_u, index_v]
+    paired = macs >= min_mac
+
+    return index_u[paired], index_v[paired], macs[paired]
+
+
+def plot_MAC(macs, ax=None):
+    """Plot a MAC matrix as 3d bars.
+
+    Parameters
+    ----------
+    macs : array
+        MAC matrix (see MAC_matrix).
+    ax : matplotlib axes, optional
+        3d axes in which the plot will be drawn.
+
+    Returns
+    -------
+    ax : matplotlib axes
+        Returns the axes object with the plot.
+    """
+    import matplotlib.pyplot as plt
+    from mpl_toolkits.mplot3d import Axes3D  # noqa: F401
+
+    set_style()
 
-    xpos, ypos = np.meshgrid(range(n), range(n))
+    if ax is None:
+        fig = plt.figure(figsize=(12, 8))
+        ax = fig.add_subplot(111, projection='3d')
+
+    n, m = macs.shape
+    xpos, ypos = np.meshgrid(range(n), range(m))
     xpos, ypos = 0.5 + xpos.flatten(), 0.5 + ypos.flatten()
     zpos = np.zeros_like(xpos)
     dx = 0.75 * np.ones_like(xpos)
     dy = 0.75 * np.ones_like(xpos)
     dz = macs.T.flatten()
 
-    fig = plt.figure(figsize=(12, 8))
-    #fig.suptitle('MAC - %s vs %s' % (U.name, V.name), fontsize=12)
-    ax = fig.add_subplot(111, projection='3d')
     ax.bar3d(xpos, ypos, zpos, dx, dy, dz,
              color=plt.cm.viridis(dz),
              alpha=0.7, zsort='max')
     ax.set_xticks(range(1, n + 1))
-    ax.set_yticks(range(1, n + 1))
+    ax.set_yticks(range(1, m + 1))
     ax.set_zlim(0, 1)
-    #ax.set_xlabel('%s  modes' % U.name)
-    #ax.set_ylabel('%s  modes' % V.name)
 
     sm = plt.cm.ScalarMappable(cmap=plt.cm.viridis,
                                norm=plt.Normalize(vmin=0, vmax=1))
     # fake up the array of the scalar mappable
     sm._A = []
-    cbar = fig.colorbar(sm, shrink=0.5, aspect=10)
+    cbar = ax.figure.colorbar(sm, ax=ax, shrink=0.5, aspect=10)
     cbar.set_label('MAC')
 
+    return ax
+
+
+def MAC_modes(U, V, n=None, plot=True):
+    """MAC for multiple vectors
+
+    The MAC matrix for the first n columns (see MAC_matrix), plotted with
+    plot_MAC if plot is True.
+    """
+    # n is the number of modes to be evaluated
+    if n is None:
+        n = U.shape[1]
+    macs = MAC_matrix(U[:, :n], V[:, :n])
+
+    if plot:
+        plot_MAC(macs)
+
     return macs
 
 
+def _kappa(u, v):
+    """Kappa for arrays of x and y complex amplitudes.
+
+    This is a vectorized version of Rotor.kappa using the
+    eigenvalues of the H matrix (see Rotor.H_kappa).
+    """
+    return _ellipse(u, v)[2]
+
+
 def whirl(kappa_mode):
     """Evaluates the whirl of a mode"""
     if all(kappa >= -1e-3 for kappa in kappa_mode):
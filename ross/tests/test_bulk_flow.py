@@ -0,0 +1,163 @@
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+from scipy.optimize import brentq
+from ross.bulk_flow import BulkFlowSeal
+from ross.cache import ResultsCache
+from ross.elements import IsotSealElement
+
+
+@pytest.fixture
+def seal_kwargs():
+    return dict(seal_diameter=0.1143, seal_length=0.0857,
+                inlet_clearance=0.2e-3, exit_clearance=0.2e-3,
+                p_supply=70e5, p_exit=35e5, reservoir_temperature=17.8,
+                molecular_weight=28.96, absolute_viscosity=1.8e-5,
+                cell_vol_to_area_ratio=1.6e-3, inlet_preswirl_ratio=0.5,
+                number_integr_steps=40)
+
+
+def test_symmetry(seal_kwargs):
+    seal = BulkFlowSeal(**seal_kwargs)
+    frequencies = [200, 1000]
+    forward = seal.coefficients([1000], frequencies)
+    backward = seal.coefficients([-1000], frequencies)
+    assert_allclose(forward['kxx'], backward['kxx'])
+    assert_allclose(forward['cxx'], backward['cxx'])
+    assert_allclose(forward['kxy'], -backward['kxy'])
+    assert_allclose(forward['cxy'], -backward['cxy'])
+    assert_allclose(forward['seal_leakage'], backward['seal_leakage'])
+    assert (forward['kxy'] > 0).all()
+    # honeycomb seals stiffen with the whirl frequency
+    assert forward['kxx'][0, 1] > forward['kxx'][0, 0]
+
+    # no circumferential flow without rotation and preswirl
+    still = seal.coefficients([0], frequencies)
+    assert_allclose(still['kxy'], 0, atol=1e-8 * abs(still['kxx']).max())
+    assert_allclose(still['cxy'], 0, atol=1e-8 * abs(still['cxx']).max())
+    assert (still['cxx'] > 0).all()
+
+
+def test_fanno_leakage(seal_kwargs):
+    # without rotation the friction factor is constant along a smooth seal
+    # and the leakage is given by the isothermal Fanno flow
+    # p1 ** 2 - p2 ** 2 = G ** 2 a ** 2 (f L / h + 2 ln(p1 / p2))
+    seal_kwargs.update(cell_vol_to_area_ratio=0, inlet_preswirl_ratio=0)
+    seal = BulkFlowSeal(**seal_kwargs)
+    a2, h, L = seal._a2, seal.inlet_clearance, seal.seal_length
+    xi = seal.entrance_loss_coefficient
+    ns, ms = seal.turbulence_coef_ns, seal.turbulence_coef_ms
+    nr, mr = seal.turbulence_coef_nr, seal.turbulence_coef_mr
+
+    def residual(m):
+        Re = 2 * m / seal.absolute_viscosity
+        f = ns * Re ** ms + nr * Re ** mr
+        G = m / h
+        p1 = (seal.p_supply + np.sqrt(seal.p_supply ** 2
+                                      - 2 * (1 + xi) * G ** 2 * a2)) / 2
+        return (p1 ** 2 - seal.p_exit ** 2
+                - G ** 2 * a2 * (f * L / h + 2 * np.log(p1 / seal.p_exit)))
+
+    m_max = seal.p_supply * h / np.sqrt(2 * (1 + xi) * a2)
+    m = brentq(residual, 1e-9, m_max * (1 - 1e-9), rtol=1e-12)
+    leakage = seal.coefficients([0])['seal_leakage']
+    assert_allclose(leakage, np.pi * seal.seal_diameter * m, rtol=1e-5)
+
+
+def test_short_seal_stiffness(seal_kwargs):
+    # for L / R -> 0 the circumferential flow vanishes and each angle is
+    # a channel with the local clearance, so the static stiffness at zero
+    # speed is K = -pi R int dp/dh dz (0.13 % apart for L / R = 0.05 and
+    # 6e-4 % for L / R = 0.0125)
+    seal_kwargs.update(seal_length=0.005, seal_diameter=0.8, p_exit=50e5,
+                       inlet_preswirl_ratio=0)
+    R, h = seal_kwargs['seal_diameter'] / 2, seal_kwargs['inlet_clearance']
+    integrals = []
+    for dh in [1e-3 * h, -1e-3 * h]:
+        seal = BulkFlowSeal(**dict(seal_kwargs, inlet_clearance=h + dh,
+                                   exit_clearance=h + dh))
+        z, P, W, m = seal._zeroth(np.zeros(1))
+        integrals.append(np.sum((P[1:, 0] + P[:-1, 0]) / 2 * np.diff(z)))
+    stiffness = -np.pi * R * (integrals[0] - integrals[1]) / (2e-3 * h)
+
+    kxx = BulkFlowSeal(**seal_kwargs).coefficients([0], [0])['kxx']
+    assert_allclose(kxx, stiffness, rtol=1e-4)
+
+
+def test_effective_cell_depth(seal_kwargs):
+    # cells store gas with the depth of IsotSealElement (volume / gamma)
+    coefficients = BulkFlowSeal(**seal_kwargs).coefficients([1000], [500])
+    seal_kwargs['cell_vol_to_area_ratio'] /= 0.69
+    effective = BulkFlowSeal(gamma=1, **seal_kwargs).coefficients([1000],
+                                                                 [500])
+    for name in ['kxx', 'kxy', 'cxx', 'cxy']:
+        assert_allclose(coefficients[name], effective[name])
+
+
+def test_integration_steps(seal_kwargs):
+    coarse = BulkFlowSeal(**seal_kwargs).coefficients([500, 1000])
+    seal_kwargs['number_integr_steps'] = 200
+    fine = BulkFlowSeal(**seal_kwargs).coefficients([500, 1000])
+    for name in ['kxx', 'kxy', 'cxx', 'cxy', 'seal_leakage']:
+        assert_allclose(coarse[name], fine[name], rtol=1e-4)
+
+
+def test_low_leakage(seal_kwargs):
+    # the swirl relaxes within a small fraction of a step
+    seal_kwargs['p_exit'] = 69.99e5
+    coarse = BulkFlowSeal(**seal_kwargs).coefficients([1000], [100, 1000])
+    seal_kwargs['number_integr_steps'] = 200
+    fine = BulkFlowSeal(**seal_kwargs).coefficients([1000], [100, 1000])
+    for name in ['kxx', 'kxy', 'cxx', 'cxy', 'seal_leakage']:
+        assert np.isfinite(coarse[name]).all()
+        assert_allclose(coarse[name], fine[name], rtol=1e-4)
+
+
+def test_choked_flow(seal_kwargs):
+    seal_kwargs['p_exit'] = 10e5
+    with pytest.raises(ValueError, match='choked'):
+        BulkFlowSeal(**seal_kwargs).coefficients([1000])
+
+
+def test_cached_coefficients(seal_kwargs, tmpdir):
+    seal = BulkFlowSeal(cache=ResultsCache(str(tmpdir)), **seal_kwargs)
+    coefficients0 = seal.coefficients([500, 1000])
+    assert seal.cache.misses == 2
+
+    # only the new operating point is solved
+    seal = BulkFlowSeal(cache=ResultsCache(str(tmpdir)), **seal_kwargs)
+    coefficients1 = seal.coefficients([1000, 1500])
+    assert seal.cache.hits == 1
+    assert_allclose(coefficients1['kxx'][0], coefficients0['kxx'][1])
+    assert len(seal.cache.entries()) == 3
+
+
+def test_seal_element(seal_kwargs):
+    seal = BulkFlowSeal(**seal_kwargs)
+    speeds = np.linspace(200, 1000, 5)
+    element = seal.seal_element(20, speeds, frequencies=[100, 500])
+    assert isinstance(element, IsotSealElement)
+    coefficients = seal.coefficients(speeds)
+    assert_allclose(element.kxx.coefficient, coefficients['kxx'][:, 0])
+    assert_allclose(element.kyx.coefficient, -coefficients['kxy'][:, 0])
+    assert_allclose(element.w_fd, [100, 500])
+    assert_allclose(element.seal_leakage, coefficients['seal_leakage'][-1])
+    assert_allclose(element.seal_diameter, 114.3)
+    assert_allclose(element.speed, 1000 * 30 / np.pi)
+
+    loaded = BulkFlowSeal.from_element(element)
+    assert_allclose(loaded.coefficients(speeds)['kxx'], coefficients['kxx'])
+
+
+def test_static_coefficients(seal_kwargs):
+    seal = BulkFlowSeal(**seal_kwargs)
+    element = seal.seal_element(20, np.linspace(0, 1000, 5))
+    static = seal.coefficients([0], [0, 1])
+    assert_allclose(element.kxx.coefficient[0], static['kxx'][0, 0],
+                    rtol=1e-4)
+    assert_allclose(element.cxx.coefficient[0], static['cxx'][0, 0],
+                    rtol=1e-4)
+    assert_allclose(static['cxx'][0, 0], static['cxx'][0, 1], rtol=1e-5)
+
+    with pytest.raises(ValueError, match='must not be negative'):
+        seal.coefficients([1000], [-100, 100])
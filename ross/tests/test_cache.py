@@ -0,0 +1,58 @@
+import os
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+from ross.cache import ResultsCache, content_hash
+from ross.elements import BearingElement
+from ross.rotor import rotor_example
+
+
+def test_content_hash():
+    assert content_hash(1, 'a', np.arange(3.)) == content_hash(1, 'a', np.arange(3.))
+    assert content_hash(np.arange(3.)) != content_hash(np.arange(4.))
+    assert content_hash([1, 2]) != content_hash((1, 2))
+
+
+def test_model_hash():
+    rotor0 = rotor_example()
+    rotor1 = rotor_example()
+    assert rotor0.model_hash() == rotor1.model_hash()
+
+    rotor1.bearing_seal_elements[0] = BearingElement(0, kxx=2e6, cxx=0)
+    assert rotor0.model_hash() != rotor1.model_hash()
+
+
+def test_cached_campbell(tmpdir):
+    speed = np.linspace(0, 400, 11)
+    rotor = rotor_example()
+    rotor.cache = ResultsCache(str(tmpdir))
+    camp0 = rotor.campbell(speed)
+    assert rotor.cache.misses == 1
+    assert len(rotor.cache.entries()) == 1
+
+    # new rotor instance with the same model
+    rotor = rotor_example()
+    rotor.cache = ResultsCache(str(tmpdir))
+    camp1 = rotor.campbell(speed)
+    assert rotor.cache.hits == 1
+    assert_allclose(camp0, camp1)
+    assert_allclose(camp0.wd, camp1.wd)
+
+    # different arguments
+    rotor.campbell(speed, frequencies=4)
+    assert rotor.cache.misses == 1
+
+
+def test_cache_eviction(tmpdir):
+    cache = ResultsCache(str(tmpdir), max_size=5000)
+    for i in range(4):
+        cache[str(i)] = np.zeros(200)
+        # make sure entries have different access times
+        os.utime(cache._file(str(i)), (i, i))
+
+    assert cache.size <= 5000
+    assert '3' in cache
+    assert '0' not in cache
+
+    with pytest.raises(KeyError):
+        cache['0']
@@ -309,3 +309,87 @@ def test_load_lumped_disk_from_xltrc():
     assert_allclose(disks[1].M(), disk1_M, rtol=1e-4)
 
 
+def test_xltrc_workbook(tmpdir):
+    from shutil import copy
+    from ross.data_io.read_xl import XLTRCWorkbook
+
+    file = str(tmpdir.join('xl_rotor.xls'))
+    copy(os.path.join(test_dir, 'data/xl_rotor.xls'), file)
+
+    workbook = XLTRCWorkbook(file, sidecar=True)
+    shaft = ShaftElement.load_from_xltrc(workbook)
+    disks = LumpedDiskElement.load_from_xltrc(workbook)
+    # sheets are cached and not converted again
+    shaft1 = ShaftElement.load_from_xltrc(workbook)
+    assert_allclose(shaft1[0].L, shaft[0].L)
+    assert_allclose(shaft1[0].E, 206842710000.0)
+    assert os.path.isfile(workbook.sidecar_file)
+
+    # sheets are read from the sidecar while the file is not changed
+    workbook = XLTRCWorkbook(file, sidecar=True)
+    assert set(workbook._sheets) == {'Model', 'More'}
+    shaft2 = ShaftElement.load_from_xltrc(workbook)
+    disks2 = LumpedDiskElement.load_from_xltrc(workbook)
+    assert workbook._excel is None
+    assert len(shaft2) == 93
+    assert_allclose([sh.o_d for sh in shaft2], [sh.o_d for sh in shaft])
+    assert_allclose(disks2[1].M(), disks[1].M())
+
+    os.utime(file, (0, 0))
+    assert XLTRCWorkbook(file, sidecar=True)._sheets == {}
+
+
+@pytest.mark.parametrize('suffix', ['.csv', '.npz'])
+def test_bearing_table(tmpdir, suffix):
+    from ross.data_io.bearing_table import (bearing_table, save_bearing_table,
+                                            load_bearing_table)
+    w = np.linspace(0, 300, 4)
+    tables = []
+    for name in ['de', 'nde']:
+        for load in [1e3, 2e3]:
+            bearing = BearingElement(0, kxx=load * (1e3 + w), cxx=1e3 + w,
+                                     kxy=-w, w=w)
+            tables.append(bearing_table(bearing, name, load=load, temperature=40))
+    tables.append(bearing_table(BearingElement(0, kxx=1e6, cxx=0),
+                                'seal', load=0, temperature=40))
+
+    file = str(tmpdir.join('bearings' + suffix))
+    save_bearing_table(file, tables)
+    table = load_bearing_table(file)
+    assert list(table) == ['bearing', 'load', 'temperature', 'w', 'kxx',
+                           'kyy', 'kxy', 'kyx', 'cxx', 'cyy', 'cxy', 'cyx']
+    assert len(table['w']) == 17
+
+    bearing = BearingElement.load_from_table(3, table, 'nde', load=2e3)
+    assert bearing.n == 3
+    assert_allclose(bearing.w, w)
+    assert_allclose(bearing.kxx.coefficient, 2e3 * (1e3 + w))
+    assert_allclose(bearing.kyy.coefficient, 2e3 * (1e3 + w))
+    assert_allclose(bearing.kxy.coefficient, -w)
+    assert_allclose(bearing.K(150), [[2e3 * 1150, -150], [0, 2e3 * 1150]])
+
+    seal = BearingElement.load_from_table(0, file, 'seal')
+    assert seal.kxx.w is None
+    assert_allclose(seal.K(100), [[1e6, 0], [0, 1e6]])
+
+    with pytest.raises(ValueError):
+        BearingElement.load_from_table(0, table, 'de')
+    with pytest.raises(ValueError):
+        BearingElement.load_from_table(0, table, 'tilting pad')
+
+
+def test_bearing_table_staggered_speeds(tmpdir):
+    from ross.data_io.bearing_table import (bearing_table, save_bearing_table,
+                                            load_bearing_table, select_bearing)
+    tables = [bearing_table(BearingElement(0, kxx=load, cxx=0, w=w), 'de',
+                            load=load)
+              for load, w in [(1e3, [0, 100, 200, 300]),
+                              (2e3, [50, 150, 250, 350])]]
+    file = str(tmpdir.join('bearings.npz'))
+    save_bearing_table(file, tables)
+    table = load_bearing_table(file)
+
+    with pytest.raises(ValueError, match='More than one load'):
+        select_bearing(table, 'de')
+    assert_allclose(select_bearing(table, 'de', load=2e3)['w'],
+                    [50, 150, 250, 350])
@@ -0,0 +1,61 @@
+import os
+import shutil
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+from ross.data_io.fleet import (ModelStore, import_fleet, load_machine,
+                                validate_rotor)
+from ross.rotor import rotor_example
+
+test_dir = os.path.dirname(__file__)
+
+manifest = """
+rotor: xl_rotor.xls
+bearings:
+  - n: 8
+    file: xl_bearing.xls
+  - n: {n}
+    file: xl_bearing.xls
+config:
+  n_eigen: 8
+"""
+
+
+@pytest.fixture
+def fleet(tmpdir):
+    for file in ['xl_rotor.xls', 'xl_bearing.xls']:
+        shutil.copy(os.path.join(test_dir, 'data', file), str(tmpdir))
+    tmpdir.join('machine0.yaml').write(manifest.format(n=49))
+    # bearing outside the shaft
+    tmpdir.join('machine1.yaml').write(manifest.format(n=500))
+    tmpdir.join('machine2.yaml').write('rotor: missing.xls\n')
+
+    return tmpdir
+
+
+def test_import_fleet(fleet):
+    store = ModelStore(str(fleet.join('store')))
+    problems = import_fleet(str(fleet), store, max_workers=2)
+    assert sorted(problems) == ['machine1', 'machine2']
+    assert 'FileNotFoundError' in problems['machine2'][0]
+
+    assert store.names() == ['machine0']
+    name, rotor = load_machine(str(fleet.join('machine0.yaml')))
+    assert name == 'machine0'
+    assert validate_rotor(rotor) == []
+    stored = store['machine0']
+    assert len(stored.shaft_elements) == 93
+    assert_allclose(stored.wn, rotor.wn)
+
+    with pytest.raises(KeyError):
+        store['machine1']
+
+
+def test_validate_rotor():
+    rotor = rotor_example()
+    rotor.shaft_elements[1].L = -1
+    rotor.disk_elements[0].m = np.nan
+    problems = validate_rotor(rotor)
+    assert problems == ['shaft element 1: non positive length',
+                        'disk element 0: negative or non finite '
+                        'mass or inertia']
@@ -0,0 +1,74 @@
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+from ross.cache import ResultsCache
+from ross.fluid_film import FluidFilmBearing, TiltingPadBearing
+from ross.materials import Oil
+
+
+@pytest.fixture
+def oil():
+    return Oil(t_a=40, rho_a=856.8, mu_a=0.0256, t_b=100, mu_b=0.0042)
+
+
+def test_raimondi_boyd(oil):
+    # L/D = 1 and Sommerfeld number 0.121 -> eccentricity 0.6
+    # and attitude angle 50.58 deg (Raimondi and Boyd, 1958)
+    speed = 300
+    sommerfeld = 0.121
+    pressure = (0.05 / 100e-6) ** 2 * oil.mu(40) * speed / (2 * np.pi) / sommerfeld
+    bearing = FluidFilmBearing(0.1, 0.1, 100e-6, oil, load=pressure * 0.1 ** 2)
+    coefficients = bearing.coefficients(speed)
+    assert_allclose(coefficients['eccentricity'], 0.6, atol=0.01)
+    assert_allclose(np.degrees(coefficients['attitude_angle']), 50.58, atol=2)
+
+
+def test_stiffness_finite_differences(oil):
+    bearing = FluidFilmBearing(0.1, 0.05, 100e-6, oil, load=2000)
+    position, tilts, pads = bearing.equilibrium(300)
+    Q, K, C = pads[0]
+
+    dx = 1e-9
+    forces = []
+    for step in np.eye(2) * dx:
+        (Qp, _, _), = bearing._pads(300, position + step, tilts)
+        (Qm, _, _), = bearing._pads(300, position - step, tilts)
+        forces.append(-(Qp - Qm) / (2 * dx))
+    assert_allclose(np.array(forces).T, K, rtol=1e-3, atol=1e-3 * abs(K).max())
+
+
+def test_tilting_pad(oil):
+    bearing = TiltingPadBearing(0.1, 0.05, 100e-6, oil, load=2000,
+                                preload=0.3)
+    for speed in [100, 300, 600]:
+        coefficients = bearing.coefficients(speed)
+        assert abs(coefficients['x']) < 1e-9
+        assert abs(coefficients['kxy']) < 1e-6 * coefficients['kxx']
+        assert abs(coefficients['cxy']) < 1e-6 * coefficients['cxx']
+        assert_allclose(coefficients['kxx'], coefficients['kyy'], rtol=1e-6)
+
+    # the pads only transmit radial forces
+    position, tilts, pads = bearing.equilibrium(300)
+    for film, (Q, K, C) in zip(bearing._films, pads):
+        assert_allclose(Q[2], 0, atol=1e-6)
+        tangential = -np.sin(film.pivot) * Q[0] + np.cos(film.pivot) * Q[1]
+        assert_allclose(tangential, 0, atol=1e-6)
+
+
+def test_cached_coefficients(oil, tmpdir):
+    speeds = [200, 300, 400, 500]
+    bearing = FluidFilmBearing(0.1, 0.05, 100e-6, oil, load=2000,
+                               cache=ResultsCache(str(tmpdir)))
+    element0 = bearing.bearing_element(0, speeds)
+    assert bearing.cache.misses == 4
+
+    bearing = FluidFilmBearing(0.1, 0.05, 100e-6, oil, load=2000,
+                               cache=ResultsCache(str(tmpdir)))
+    element1 = bearing.bearing_element(0, speeds)
+    assert bearing.cache.hits == 4
+    assert_allclose(element0.kxx.coefficient, element1.kxx.coefficient)
+
+    bearing = FluidFilmBearing(0.1, 0.05, 100e-6, oil, load=3000,
+                               cache=ResultsCache(str(tmpdir)))
+    bearing.coefficients(300)
+    assert bearing.cache.hits == 0
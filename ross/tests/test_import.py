@@ -0,0 +1,34 @@
+import os
+import sys
+import json
+import subprocess
+
+# modules that should only be imported when plotting or reading files
+lazy_modules = ['matplotlib', 'mpl_toolkits', 'cycler', 'pandas', 'yaml',
+                'scipy.signal', 'scipy.io', 'scipy.interpolate']
+
+code = """
+import sys, time, json
+t0 = time.perf_counter()
+import ross
+t = time.perf_counter() - t0
+print(json.dumps({'time': t, 'modules': list(sys.modules)}))
+"""
+
+
+def test_import_time():
+    # a new interpreter is needed, since other tests import these modules
+    root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [root] + [p for p in [env.get('PYTHONPATH')] if p])
+    out = subprocess.run([sys.executable, '-c', code], env=env, check=True,
+                         stdout=subprocess.PIPE, universal_newlines=True)
+    result = json.loads(out.stdout.splitlines()[-1])
+
+    loaded = [m for m in result['modules']
+              if any(m == lazy or m.startswith(lazy + '.')
+                     for lazy in lazy_modules)]
+    assert loaded == [], f'{loaded} imported with ross'
+    # about 0.3 s with numpy and scipy, so only large regressions fail
+    assert result['time'] < 5, f"import ross took {result['time']:.2f} s"
@@ -0,0 +1,183 @@
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+
+from ross.rotor import rotor_example
+from ross.results import (Results, ForcedResponseResults, CampbellResults,
+                          TimeResponseResults)
+
+
+@pytest.fixture
+def response():
+    rotor = rotor_example()
+    return rotor.unbalance_response(2, 1e-4, 0, np.linspace(0, 1000, 11))
+
+
+def test_sel(response):
+    assert response.dims == ('dof', 'frequency')
+
+    x3 = response.sel(node=3, dof='x')
+    assert x3.dims == ('frequency',)
+    assert_allclose(x3, response[12])
+    assert np.shares_memory(x3, response)
+    assert_allclose(x3.frequency_range, response.frequency_range)
+
+    # labels between start and stop
+    y = response.sel(dof='y', frequency=slice(200, 500))
+    assert y.shape == (7, 4)
+    assert np.shares_memory(y, response)
+    assert_allclose(y, np.asarray(response)[1::4, 2:6])
+    assert_allclose(y.frequency_range, [200, 300, 400, 500])
+
+    node = response.sel(node=2)
+    assert node.shape == (4, 11)
+    assert_allclose(response.sel(dof=(2, 'beta'), frequency=300),
+                    response[11, 3])
+
+    # lists are copied
+    selected = response.sel(dof=[0, 12, 13], frequency=[100, 700])
+    assert_allclose(selected, np.asarray(response)[[0, 12, 13]][:, [1, 7]])
+    assert_allclose(selected.frequency_range, [100, 700])
+
+    assert_allclose(response.sel(frequency=430, method='nearest'),
+                    response[:, 4])
+    with pytest.raises(KeyError):
+        response.sel(frequency=430)
+    with pytest.raises(ValueError):
+        response.sel(mode=0)
+
+
+def test_indexing(response, tmpdir):
+    row = response[12]
+    assert row.dims == ('frequency',)
+    assert_allclose(row.sel(frequency=100), response[12, 1])
+
+    part = response[:, 2:5]
+    assert part.dims == ('dof', 'frequency')
+    assert_allclose(part.frequency_range, [200, 300, 400])
+    assert_allclose(part.sel(frequency=300), response.sel(frequency=300))
+    file = str(tmpdir.join('part.npz'))
+    part.save(file)
+    assert_allclose(Results.load(file).frequency_range, [200, 300, 400])
+
+    parts = [response[:, :5], response[:, 5:]]
+    concatenated = Results.concatenate(parts, 'frequency')
+    assert_allclose(concatenated, response)
+    assert_allclose(concatenated.frequency_range, response.frequency_range)
+
+    selected = response[..., response.frequency_range > 700]
+    assert_allclose(selected.frequency_range, [800, 900, 1000])
+
+    # unknown axes are not labelled
+    reshaped = response.reshape(-1)
+    assert reshaped.dims == ('dim_0',)
+    assert not hasattr(reshaped, 'frequency_range')
+
+
+def test_sel_dof_slice(response):
+    # dof slices are inclusive labels, as for the other axes
+    assert_allclose(response.sel(dof=slice(4, 8)), response[4:9])
+    t = np.linspace(0, 1, 5)
+    results = TimeResponseResults(np.arange(15.).reshape(5, 3),
+                                  {'t': t, 'dofs': np.array([4, 5, 13])})
+    assert_allclose(results.sel(dof=slice(5, 13)).dofs, [5, 13])
+
+
+def test_sel_dof_coordinate():
+    t = np.linspace(0, 1, 5)
+    results = TimeResponseResults(np.arange(15.).reshape(5, 3),
+                                  {'t': t, 'dofs': np.array([4, 5, 13])})
+    assert_allclose(results.sel(node=1, dof='y'), [1, 4, 7, 10, 13])
+    assert_allclose(results.sel(dof='y', time=0.5), [7, 8])
+    assert_allclose(results.sel(dof='y', time=0.5).dofs, [5, 13])
+
+
+def test_time_response_plot_labels():
+    import matplotlib.pyplot as plt
+
+    t = np.linspace(0, 1, 5)
+    results = TimeResponseResults(np.zeros((5, 4)), {'t': t})
+    labels = []
+    for dof in range(4):
+        ax = results.plot(dof, ax=plt.figure().gca())
+        labels.append(ax.get_title().split()[-1])
+    plt.close('all')
+    assert labels == ['$x$', '$y$', r'$\alpha$', r'$\beta$']
+
+
+def test_concatenate_save_load(response, tmpdir):
+    rotor = rotor_example()
+    speeds = np.split(np.linspace(0, 1000, 11)[1:], 2)
+    parts = [rotor.unbalance_response(2, 1e-4, 0, speed) for speed in speeds]
+    parts.insert(0, response.sel(frequency=[0]))
+    concatenated = Results.concatenate(parts, 'frequency')
+    assert type(concatenated) is ForcedResponseResults
+    assert_allclose(concatenated, response)
+    assert_allclose(concatenated.frequency_range, response.frequency_range)
+
+    with pytest.raises(ValueError):
+        Results.concatenate(parts, 'dof')
+
+    file = str(tmpdir.join('response.npz'))
+    selected = response.sel(dof='x')
+    selected.save(file)
+    loaded = Results.load(file, mmap_mode='r')
+    assert loaded.dims == ('dof', 'frequency')
+    assert loaded.dtype == response.dtype
+    assert_allclose(loaded, selected)
+    # selections of a memory-mapped file are views of the map
+    assert not loaded.sel(frequency=slice(100, 300)).flags.writeable
+
+
+def test_campbell_sel():
+    rotor = rotor_example()
+    camp = rotor.campbell(np.linspace(0, 400, 3), frequencies=4)
+    assert camp.dims == ('speed', 'mode', 'quantity')
+    assert type(camp) is CampbellResults
+    assert_allclose(camp.sel(quantity='wd'), camp[:, :, 0])
+    assert_allclose(camp.wd, camp[:, :, 0])
+    assert np.shares_memory(camp.wd, camp)
+    assert_allclose(camp.sel(speed=200, mode=1, quantity='log_dec'),
+                    camp[1, 1, 1])
+    assert_allclose(camp.sel(speed=200).log_dec, camp.log_dec[1])
+
+
+def test_mode_shape_deflection():
+    rotor = rotor_example()
+    modes = rotor.mode_shapes()
+    x, y = modes.deflection(rotor.nodes_pos)
+    assert x.shape == (len(rotor.nodes), modes.shape[1])
+    assert_allclose(x, modes[0::4])
+    assert_allclose(y, modes[1::4])
+
+    # hermite interpolation at the middle of the second element
+    Le = rotor.nodes_pos[2] - rotor.nodes_pos[1]
+    z = rotor.nodes_pos[1] + Le / 2
+    ev = np.asarray(modes[4:12, 3])
+    x, y = modes.deflection(z, 3)
+    assert_allclose(x, (ev[0] + ev[4]) / 2 + Le / 8 * (ev[3] - ev[7]))
+    assert_allclose(y, (ev[1] + ev[5]) / 2 - Le / 8 * (ev[2] - ev[6]))
+
+    x, y = modes.deflection(np.full((2, 3), z), [3, 5])
+    assert x.shape == (2, 3, 2)
+    assert_allclose(x[..., 0], modes.deflection(z, 3)[0])
+
+
+def test_mode_shapes_modes():
+    rotor = rotor_example()
+    modes = rotor.mode_shapes()
+    assert modes.shape == (rotor.ndof, len(rotor.wd))
+    for mode in range(len(rotor.wd)):
+        assert_allclose(modes.kappa(mode), rotor.kappa_mode(mode), atol=1e-6)
+
+    selected = rotor.mode_shapes(modes=[1, 4])
+    assert_allclose(selected.modes, [1, 4])
+    assert_allclose(selected, modes[:, [1, 4]])
+    assert_allclose(selected.log_dec, rotor.log_dec[[1, 4]])
+    assert_allclose(selected.sel(mode=4), modes[:, 4])
+    # modes are selected by label, as in sel
+    assert_allclose(selected.kappa(4), modes.kappa(4))
+    assert_allclose(selected.deflection(rotor.nodes_pos, 4)[0],
+                    modes.deflection(rotor.nodes_pos, 4)[0])
+    with pytest.raises(KeyError):
+        selected.kappa(0)
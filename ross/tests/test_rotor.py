@@ -4,7 +4,9 @@ from ross.elements import *
 from ross.rotor import *
 from ross.rotor import MAC_modes
 from ross.materials import steel
+from ross.results import FrequencyResponseResults, ForcedResponseResults
 import numpy as np
+import scipy.linalg as la
 from numpy.testing import assert_almost_equal, assert_allclose
 
 test_dir = os.path.dirname(__file__)
@@ -313,6 +315,31 @@ def test_evects_sorted_rotor3(rotor3):
     assert_allclose(mac2.diagonal(), np.ones_like(mac1.diagonal()))
 
 
+def test_MAC_matrix_pair_modes(rotor3):
+    from ross.rotor import MAC, MAC_matrix, pair_modes
+    U = rotor3.evectors[:rotor3.ndof, :6]
+    V = rotor3._eigen(500)[1][:rotor3.ndof, :6]
+
+    macs = MAC_matrix(U, V)
+    assert_allclose(macs, [[MAC(u, v) for v in V.T] for u in U.T])
+    assert_allclose(MAC_modes(U, V, n=4, plot=False), macs[:4, :4])
+
+    dofs = np.arange(0, rotor3.ndof, 4)
+    assert_allclose(MAC_matrix(U, dofs=dofs),
+                    MAC_matrix(U[dofs], U[dofs]))
+    # stacks of mode shapes are broadcast
+    assert MAC_matrix(np.stack([U, V]), U).shape == (2, 6, 6)
+
+    order = [3, 0, 5, 1, 4, 2]
+    index_u, index_v, pair_macs = pair_modes(U, U[:, order])
+    assert_allclose(np.array(order)[index_v], index_u)
+    assert_allclose(pair_macs, 1)
+
+    index_u, index_v, pair_macs = pair_modes(U[:, :2], U[:, 2:],
+                                             min_mac=0.5)
+    assert len(index_u) == len(index_v) == len(pair_macs) == 0
+
+
 @pytest.mark.skip(reason='Different evector order when not sorted')
 def test_evects_not_sorted_rotor3(rotor3):
     evects = np.array([[ -1.153e-03 +2.437e-20j,  -1.153e-03 -2.437e-20j,  -2.681e-18 +6.093e-17j,  -2.681e-18 -6.093e-17j],
@@ -384,6 +411,20 @@ def test_evects_not_sorted_rotor3(rotor3):
     assert_allclose(mac1.diagonal(), np.ones_like(mac1.diagonal()))
 
 
+def test_left_evects_rotor3(rotor3):
+    for sparse in [True, False]:
+        evals, evects, left_evects = rotor3._eigen(sparse=sparse, left=True)
+        assert_allclose(left_evects.conj().T @ evects, np.eye(len(evals)),
+                        atol=1e-6)
+
+    # transfer matrix with left eigenvectors instead of la.inv(psi)
+    w = 100.
+    evals, psi = la.eig(rotor3.A(w))
+    H = (rotor3.lti.C @ psi @ np.diag(1 / (1j * w - evals))
+         @ la.inv(psi) @ rotor3.lti.B)
+    assert_allclose(rotor3.transfer_matrix(w), H, atol=1e-12)
+
+
 def test_kappa_rotor3(rotor3):
     assert_allclose(rotor3.kappa(0, 0)['Frequency'], 82.653037, rtol=1e-3)
     assert_allclose(rotor3.kappa(0, 0)['Major axes'], 0.001454062985920231, rtol=1e-3)
@@ -471,6 +512,84 @@ def test_campbell(rotor4):
     assert_allclose(camp, camp_desired)
 
 
+def test_critical_speeds(rotor4):
+    critical_speeds = rotor4.critical_speeds(harmonics=[1, 2], frequencies=4)
+    assert critical_speeds.shape == (2, 4)
+
+    for harmonic, speeds in zip([1, 2], critical_speeds):
+        for mode, w in enumerate(speeds):
+            rotor4.w = w
+            assert_allclose(rotor4.wd[mode], harmonic * w, rtol=1e-6)
+
+    # the iteration of the 5th mode jumps to the critical speed of the 6th
+    rotor = rotor_example()
+    critical_speeds = rotor.critical_speeds(harmonics=(0.5,))[0]
+    assert np.isnan(critical_speeds[4])
+    assert_allclose(critical_speeds[5], 1816.4, rtol=1e-5)
+
+
+@pytest.fixture
+def rotor6():
+    #  Rotor with damped bearings and speed dependent cross coupling
+    shaft_elem = [ShaftElement(0.25, 0, 0.05, steel) for _ in range(6)]
+
+    disk0 = DiskElement(2, steel, 0.07, 0.05, 0.28)
+    disk1 = DiskElement(4, steel, 0.07, 0.05, 0.35)
+
+    w = np.linspace(0, 1000, 11)
+    kxx = 1e6 * np.ones_like(w)
+    kyy = 0.8e6 * np.ones_like(w)
+    cxx = 200 * np.ones_like(w)
+    bearing0 = BearingElement(0, kxx=kxx, kyy=kyy, cxx=cxx,
+                              kxy=2000 * w, kyx=-2000 * w, w=w)
+    bearing1 = BearingElement(6, kxx=kxx, kyy=kyy, cxx=cxx,
+                              kxy=2000 * w, kyx=-2000 * w, w=w)
+
+    return Rotor(shaft_elem, [disk0, disk1], [bearing0, bearing1])
+
+
+def test_stability_threshold(rotor6):
+    threshold = rotor6.stability_threshold((0, 1000))
+    assert_allclose(threshold, 47.237934, rtol=1e-5)
+
+    rotor6.w = threshold
+    forward = rotor6.whirl_direction() != 'Backward'
+    assert_allclose(min(rotor6.log_dec[forward]), 0, atol=1e-6)
+
+    assert rotor6.stability_threshold((0, 40)) is None
+
+
+def test_eigen_sensitivity():
+    def damped_rotor(kxx=1e6, cxy=0, m=0, o_d=0.05):
+        shaft_elem = [ShaftElement(0.25, 0, o_d if i == 1 else 0.05, steel)
+                      for i in range(6)]
+        disk0 = DiskElement(2, steel, 0.07, 0.05, 0.28)
+        disk0.m += m
+        disk1 = DiskElement(4, steel, 0.07, 0.05, 0.35)
+        bearing0 = BearingElement(0, kxx=kxx, kyy=0.8e6, cxx=200, cxy=cxy)
+        bearing1 = BearingElement(6, kxx=1e6, kyy=0.8e6, cxx=200)
+        return Rotor(shaft_elem, [disk0, disk1], [bearing0, bearing1],
+                     w=200, sparse=False)
+
+    rotor = damped_rotor()
+    bearing = rotor.bearing_seal_elements[0]
+    params = [(bearing, 'kxx'), (bearing, 'cxy'),
+              (rotor.disk_elements[0], 'm'), (rotor.shaft_elements[1], 'o_d')]
+    sens = rotor.eigen_sensitivity(params, frequencies=4)
+
+    # compare with finite differences rebuilding the rotor
+    steps = [('kxx', 1e6, 1e2), ('cxy', 0, 1e-2), ('m', 0, 1e-5), ('o_d', 0.05, 1e-7)]
+    for i, (arg, value, h) in enumerate(steps):
+        rotor_p = damped_rotor(**{arg: value + h})
+        rotor_m = damped_rotor(**{arg: value - h})
+        for attr in ['wn', 'wd', 'log_dec']:
+            fd = (getattr(rotor_p, attr)[:4] - getattr(rotor_m, attr)[:4]) / (2 * h)
+            assert_allclose(sens[attr][i], fd, rtol=1e-3)
+
+    with pytest.raises(ValueError):
+        rotor.eigen_sensitivity([(bearing, 'mxx')])
+
+
 @pytest.mark.skip(reason='Needs investigation. It fails depending on system.')
 def test_freq_response(rotor4):
     magdb_exp = np.array([[[-120.        , -120.86944548, -115.66348242, -125.09053613],
@@ -582,6 +701,82 @@ def test_freq_response_w_force(rotor4):
     assert_allclose(mag[:4, :4], mag_exp_2_unb)
 
 
+def test_freq_response_derived(rotor4, tmpdir):
+    omega = np.linspace(0., 450., 4)
+    freq_resp = rotor4.freq_response(frequency_range=omega)
+    assert 'magnitude' not in freq_resp._new_attributes
+    assert 'magnitude' not in freq_resp.__dict__
+    assert_allclose(freq_resp.magnitude, abs(np.asarray(freq_resp)))
+    assert_allclose(freq_resp.phase, np.angle(np.asarray(freq_resp)))
+
+    # values for a slice
+    response = freq_resp[4, 4]
+    assert response.magnitude.shape == (4,)
+    assert_allclose(response.magnitude_db,
+                    20 * np.log10(abs(np.asarray(freq_resp)[4, 4])))
+
+    # optional cache for each slice
+    response.cache_derived = True
+    assert response.magnitude is response.magnitude
+    assert response[1:].cache_derived
+    assert response[1:].magnitude.shape == (3,)
+    assert freq_resp.magnitude is not freq_resp.magnitude
+
+    file = str(tmpdir.join('freq_resp.npz'))
+    freq_resp.save(file)
+    loaded = FrequencyResponseResults.load(file)
+    assert 'magnitude' not in loaded._new_attributes
+    assert_allclose(loaded.magnitude, freq_resp.magnitude)
+
+
+def test_unbalance_response_moment_harmonic(rotor4):
+    speed = np.array([100., 400.])
+    node, magnitude, phase = [2, 3, 3], [1e-4, 2e-4, 1e-4], [0, 1, 2]
+    moment, moment_phase = [1e-5, 0, 0], [0.3, 0, 0]
+
+    F = rotor4._unbalance_force(node, magnitude, phase, speed,
+                                moment, moment_phase)
+    # x, y, alpha, beta for node 2 and x, y for node 3
+    assert np.count_nonzero(F.any(axis=1)) == 6
+
+    for harmonic in [1, 2]:
+        response = rotor4.unbalance_response(
+            node, magnitude, phase, frequency_range=speed, moment=moment,
+            moment_phase=moment_phase, harmonic=harmonic)
+        for i, w in enumerate(speed):
+            wf = harmonic * w
+            Z = (rotor4.K(w) + 1j * wf * (rotor4.C(w) + w * rotor4.G())
+                 - wf ** 2 * rotor4.M())
+            assert_allclose(response[:, i], la.solve(Z, F[:, i]),
+                            rtol=1e-7, atol=1e-15)
+
+
+def test_unbalance_analysis():
+    shaft = [ShaftElement(0.25, 0, 0.05, steel) for _ in range(6)]
+    disks = [DiskElement(n, steel, 0.07, 0.05, 0.28) for n in [2, 4]]
+    bearings = [BearingElement(n, kxx=1e6, cxx=1e3) for n in [0, 6]]
+    rotor = Rotor(shaft, disks, bearings)
+
+    speed = np.linspace(0, 1000, 201)
+    load_cases = [(2, 1e-4, 0), ([2, 4], [1e-4, 1e-4], [0, np.pi])]
+    probes = [(2, 0), (4, np.pi / 4)]
+    results = rotor.unbalance_analysis(load_cases, speed, probes,
+                                       operating_range=(400, 600))
+    assert results.shape == (2, 2, 201)
+
+    response = rotor.unbalance_response([2, 4], [1e-4, 1e-4], [0, np.pi],
+                                        frequency_range=speed)
+    probe = (response[16] + response[17]) * np.sqrt(2) / 2
+    assert_allclose(results[1, 1], probe, rtol=1e-8, atol=1e-18)
+
+    assert_allclose(results.critical_speeds[0, 0], [96.849872, 320.944617])
+    assert_allclose(results.separation_margin[0, 0], [75.787532, 19.763846])
+    # both critical speeds are below the operating range
+    af = results.amplification_factor[0, 0]
+    assert_allclose(results.required_separation_margin[0, 0],
+                    np.minimum(16, 17 * (1 - 1 / (af - 1.5))))
+
+
 @pytest.fixture()
 def rotor5():
     rotor_file = os.path.join(test_dir, 'data/xl_rotor.xls')
@@ -617,6 +812,36 @@ def test_save_load(rotor5):
                     rotor_5.bearing_seal_elements[0].kxx.interpolated(0))
 
 
+def test_save_load_npz(rotor6, tmpdir):
+    file = str(tmpdir.join('rotor6.npz'))
+    rotor6.w = 300.
+    rotor6.save(file)
+    rotor_6 = Rotor.load(file)
+
+    assert rotor_6.w == 300.
+    assert [type(disk) for disk in rotor_6.disk_elements] == [DiskElement] * 2
+    assert_allclose(rotor6.evalues, rotor_6.evalues)
+    assert_allclose(rotor6.bearing_seal_elements[0].kxy.interpolated(550),
+                    rotor_6.bearing_seal_elements[0].kxy.interpolated(550))
+
+    with np.load(file, allow_pickle=False) as npz:
+        assert npz['shaft'].shape == (6, 8)
+        assert_allclose(npz['bearing0_w'], np.linspace(0, 1000, 11))
+
+
+def test_save_load_freq_response(rotor4, tmpdir):
+    file = str(tmpdir.join('freq_resp.npz'))
+    freq_resp = rotor4.freq_response(np.linspace(0, 500, 11))
+    freq_resp.save(file)
+
+    freq_resp_mmap = FrequencyResponseResults.load(file, mmap_mode='r')
+    assert type(freq_resp_mmap) is FrequencyResponseResults
+    # read-only map of the file, not a copy
+    assert not freq_resp_mmap.flags.writeable
+    assert_allclose(freq_resp_mmap[4, 5], freq_resp[4, 5])
+    assert_allclose(freq_resp_mmap.frequency_range, freq_resp.frequency_range)
+
+
 def test_plot_ucs(rotor5):
     x_data_exp = np.array([1000000., 1832980.710832, 3359818.286284,
                            6158482.11066, 11288378.916847])
@@ -627,3 +852,197 @@ def test_plot_ucs(rotor5):
     x_data, y_data = l0.get_data()
     assert_allclose(x_data[:5], x_data_exp)
     assert_allclose(y_data[:5], y_data_exp)
+
+
+def test_ucs(rotor5):
+    ucs = rotor5.ucs()
+    assert ucs.shape == (4, 20)
+    assert_allclose(ucs.stiffness_range[:5], [1000000., 1832980.710832,
+                                              3359818.286284, 6158482.11066,
+                                              11288378.916847])
+    assert_allclose(ucs[0, :5], [89.619235, 120.896554, 162.592464,
+                                 217.425534, 287.645964])
+
+
+def test_time_response(rotor3):
+    t = np.linspace(0, 1, 101)
+    F = np.zeros((len(t), rotor3.ndof))
+    F[:, 4 * 3] = 10
+
+    response = rotor3.time_response(F, t)
+    assert response.shape == (len(t), rotor3.ndof)
+    assert_allclose(response.t, t)
+    assert_allclose(response, response.xout[:, :rotor3.ndof])
+
+
+def test_time_response_chunks(rotor3):
+    import scipy.signal as signal
+
+    t = np.linspace(0, 1, 101)
+    F = np.zeros((len(t), rotor3.ndof))
+    F[:, 4 * 3] = 10 * np.sin(30 * t)
+    response = rotor3.time_response(F, t)
+    dofs = [4 * 3, 4 * 3 + 1, 4 * 5]
+
+    chunks = list(rotor3.time_response_chunks(F, t, dofs=dofs, chunk_size=7))
+    assert len(chunks) == 15
+    assert_allclose(np.concatenate([chunk.t for chunk in chunks]), t)
+    y = np.concatenate(chunks)
+    assert_allclose(y, response[:, dofs], atol=1e-8 * abs(response).max())
+
+    # force given as a function of time
+    def force(times):
+        return F[np.searchsorted(t, times)]
+    chunks = rotor3.time_response_chunks(force, t, dofs=dofs, chunk_size=30)
+    assert_allclose(np.concatenate(list(chunks)), y)
+
+    # decimation with filter state kept between chunks
+    chunks = list(rotor3.time_response_chunks(F, t, dofs=dofs, chunk_size=7,
+                                              decimate=3))
+    assert_allclose(np.concatenate([chunk.t for chunk in chunks]), t[::3])
+    expected = signal.decimate(np.asarray(y), 3, zero_phase=False, axis=0)
+    assert_allclose(np.concatenate(chunks), expected,
+                    atol=1e-8 * abs(expected).max())
+
+
+def test_transient_response():
+    shaft = [ShaftElement(0.25, 0, 0.05, steel) for _ in range(6)]
+    disks = [DiskElement(n, steel, 0.07, 0.05, 0.28) for n in [2, 4]]
+    w = np.linspace(0, 1000, 5)
+    bearings = [BearingElement(n, kxx=1e6 * (1 + w / 1000), kyy=2e6 * (1 + w / 1000),
+                               cxx=1e3 * np.ones(5), cyy=1.5e3 * np.ones(5), w=w)
+                for n in [0, 6]]
+    rotor = Rotor(shaft, disks, bearings, w=300)
+
+    # constant speed compared with the lti system
+    t = np.linspace(0, 0.1, 2001)
+    F = np.zeros((len(t), rotor.ndof))
+    F[:, 8] = 100 * np.sin(300 * t)
+    expected = rotor.time_response(F, t)[:, [8, 9]]
+    response = rotor.transient_response(t, 300, F=F, dofs=[8, 9])
+    assert response.factorizations == 1
+    assert_allclose(response, expected, atol=1e-3 * abs(expected).max())
+
+    # run-up: the factorization is reused while the matrices change little
+    t = np.linspace(0, 0.5, 5001)
+    run_up = [rotor.transient_response(t, 2000 * t, unbalance=(2, 1e-4, 0),
+                                       dofs=[8, 9], tol=tol) for tol in [0, 1e-3]]
+    assert run_up[0].factorizations == len(t) - 1
+    assert run_up[1].factorizations < len(t) / 10
+    assert_allclose(run_up[1], run_up[0], atol=1e-4 * abs(run_up[0]).max())
+    assert_allclose(run_up[1].speed, 2000 * t)
+
+
+def test_waterfall():
+    shaft = [ShaftElement(0.25, 0, 0.05, steel) for _ in range(6)]
+    disks = [DiskElement(n, steel, 0.07, 0.05, 0.28) for n in [2, 4]]
+    bearings = [BearingElement(n, kxx=1e6, cxx=1e3) for n in [0, 6]]
+    rotor = Rotor(shaft, disks, bearings)
+
+    t = np.linspace(0, 2, 8001)
+    speed_profile = (t, 250 + 50 * t)
+    probes = [(2, 0), (2, np.pi / 2)]
+    transient = rotor.waterfall(speed_profile, probes, (2, 1e-4, 0),
+                                window_size=1024)
+    harmonic = rotor.waterfall(speed_profile, probes, (2, 1e-4, 0),
+                               method='harmonic', window_size=1024)
+    assert transient.shape == harmonic.shape == (14, 2, 513)
+    assert_allclose(transient.speed_range, 250 + 50 * transient.t)
+
+    # slow run-up is close to the steady state response
+    assert_allclose(transient.order(1), harmonic.order(1),
+                    atol=0.05 * abs(harmonic.order(1)).max())
+    assert_allclose(harmonic[:, :, 1:].max(axis=-1), abs(harmonic.order(1)))
+    # the first windows have the free vibration from the start at rest
+    assert_allclose(transient[4:].max(axis=-1), abs(transient.order(1)[4:]),
+                    rtol=0.2)
+
+
+def test_forced_response_peaks():
+    # single degree of freedom, amplification factor ~ 1 / (2 * zeta)
+    wn, zeta = 100., 0.02
+    w = np.linspace(0, 200, 31)
+    response = ForcedResponseResults(
+        (1 / (wn ** 2 - w ** 2 + 2j * zeta * wn * w))[np.newaxis],
+        new_attributes={'frequency_range': w})
+
+    peaks = response.peaks(operating_range=(120, 150))
+    assert_allclose(peaks['frequency'], [[wn * np.sqrt(1 - 2 * zeta ** 2)]],
+                    rtol=5e-3)
+    assert_allclose(peaks['amplification_factor'], [[24.98]], rtol=2e-2)
+    assert_allclose(peaks['separation_margin'], [[100 * (120 - 99.74) / 120]],
+                    rtol=1e-3)
+    assert_allclose(peaks['required_separation_margin'], [[16.]])
+
+    # grid values only
+    peaks = response.peaks(method='linear')
+    assert_allclose(peaks['frequency'], [[wn]])
+
+
+def test_adaptive_frequency_range(monkeypatch):
+    shaft = [ShaftElement(0.25, 0, 0.05, steel) for _ in range(6)]
+    disks = [DiskElement(n, steel, 0.07, 0.05, 0.28) for n in [2, 4]]
+    bearings = [BearingElement(n, kxx=1e6, cxx=100) for n in [0, 6]]
+    rotor = Rotor(shaft, disks, bearings)
+
+    # eigenvalue solutions, compared with the forced response solutions
+    solves = []
+    eigen = rotor._eigen_speed_derivative
+    monkeypatch.setattr(rotor, '_eigen_speed_derivative',
+                        lambda w: solves.append(w) or eigen(w))
+    frequency_range = rotor.adaptive_frequency_range(0, 1000, rtol=0.01)
+    assert frequency_range[0] == 0 and frequency_range[-1] == 1000
+    assert len(frequency_range) < 200
+    print(f'{len(solves)} eigenvalue solutions, '
+          f'{len(frequency_range)} frequencies')
+    assert len(solves) < len(frequency_range) / 4
+
+    # modes far above the range are not refined
+    solves.clear()
+    rotor.adaptive_frequency_range(0, 100)
+    assert len(solves) < 10
+
+    dense = np.linspace(0, 1000, 1001)
+    response = abs(rotor.unbalance_response(2, 1e-4, 0, dense)[8])
+    response_adaptive = abs(rotor.unbalance_response(
+        2, 1e-4, 0, frequency_range)[8])
+    error = abs(np.interp(dense, frequency_range, response_adaptive) - response)
+    assert error.max() / response.max() < 0.02
+
+
+def test_orbit():
+    shaft = [ShaftElement(0.25, 0, 0.05, steel) for _ in range(6)]
+    disks = [DiskElement(n, steel, 0.07, 0.05, 0.28) for n in [2, 4]]
+    bearings = [BearingElement(n, kxx=1e6, kyy=2e6, cxx=1e3, cyy=1e3)
+                for n in [0, 6]]
+    rotor = Rotor(shaft, disks, bearings)
+
+    speed = np.linspace(50, 1000, 20)
+    orbits = rotor.orbit(2, 1e-4, 0, frequency_range=speed, nodes=[2, 3])
+    assert orbits.shape == (2, 20, 2, 37)
+
+    # sampled orbit extents
+    r = np.hypot(orbits[:, :, 0], orbits[:, :, 1])
+    assert_allclose(r.max(axis=-1), orbits.major_axis, rtol=1e-2)
+    assert np.all(r.min(axis=-1) >= orbits.minor_axis * (1 - 1e-2))
+
+    # ellipse axes from the eigenvalues of H (see Rotor.kappa)
+    for i, j in [(0, 3), (1, 10), (1, 19)]:
+        u, v = orbits.u[i, j], orbits.v[i, j]
+        T = np.array([[abs(u) * np.cos(np.angle(u)), -abs(u) * np.sin(np.angle(u))],
+                      [abs(v) * np.cos(np.angle(v)), -abs(v) * np.sin(np.angle(v))]])
+        lam = np.linalg.eigvalsh(T @ T.T)
+        assert_allclose(orbits.minor_axis[i, j], np.sqrt(max(lam[0], 0)),
+                        atol=1e-12 * np.sqrt(lam[1]))
+        assert_allclose(orbits.major_axis[i, j], np.sqrt(lam[1]))
+
+    # whirl direction from the area swept by the sampled orbits
+    x, y = orbits[:, :, 0], orbits[:, :, 1]
+    area = np.sum(x[..., :-1] * y[..., 1:] - x[..., 1:] * y[..., :-1], axis=-1)
+    assert_allclose(area / 2, np.pi * orbits.major_axis ** 2 * orbits.kappa,
+                    rtol=1e-2)
+    assert np.any(orbits.kappa < 0) and np.any(orbits.kappa > 0)
+
+    # probe readings
+    assert_allclose(orbits.probe(np.pi / 2), orbits.v)
+    assert orbits.probe([0, np.pi / 4]).shape == (2, 20, 2)